@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name,too-few-public-methods
+"""Add the table for the checkpoints of processes and move the checkpoints out of the node attributes."""
+
+# pylint: disable=no-name-in-module,import-error
+from django.db import migrations, models
+import django.db.models.deletion
+from aiida.backends.djsite.db.migrations import upgrade_schema_version
+
+REVISION = '1.0.46'
+DOWN_REVISION = '1.0.45'
+
+forward_sql = [
+    """
+    INSERT INTO db_dbcheckpoint (dbnode_id, checkpoint)
+    SELECT id, attributes ->> 'checkpoints' FROM db_dbnode
+    WHERE attributes ? 'checkpoints'
+    ORDER BY id;
+    """,
+    """
+    INSERT INTO db_dbcheckpoint (dbnode_id, checkpoint)
+    SELECT db_dbnode.id, delta.value
+    FROM db_dbnode, jsonb_array_elements_text(db_dbnode.attributes -> 'checkpoint_deltas') WITH ORDINALITY AS delta
+    WHERE db_dbnode.attributes ? 'checkpoints' AND db_dbnode.attributes ? 'checkpoint_deltas'
+    ORDER BY db_dbnode.id, delta.ordinality;
+    """,
+    """
+    UPDATE db_dbnode SET attributes = attributes - 'checkpoints' - 'checkpoint_deltas'
+    WHERE attributes ?| array['checkpoints', 'checkpoint_deltas'];
+    """,
+]
+
+reverse_sql = [
+    """
+    UPDATE db_dbnode SET attributes = db_dbnode.attributes || checkpoint.attributes
+    FROM (
+        SELECT dbnode_id, jsonb_build_object('checkpoints', checkpoints[1]) || CASE
+            WHEN cardinality(checkpoints) > 1 THEN jsonb_build_object('checkpoint_deltas', checkpoints[2:])
+            ELSE '{}'::jsonb
+        END AS attributes
+        FROM (
+            SELECT dbnode_id, array_agg(checkpoint ORDER BY id) AS checkpoints FROM db_dbcheckpoint GROUP BY dbnode_id
+        ) AS checkpoints
+    ) AS checkpoint
+    WHERE db_dbnode.id = checkpoint.dbnode_id;
+    """,
+]
+
+
+class Migration(migrations.Migration):
+    """Add the table for the checkpoints of processes and move the checkpoints out of the node attributes."""
+    dependencies = [
+        ('db', '0045_dbnode_extras_hash_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DbCheckpoint',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('checkpoint', models.TextField()),
+                (
+                    'dbnode',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='dbcheckpoints', to='db.DbNode'
+                    )
+                ),
+            ],
+        ),
+        migrations.RunSQL(sql='\n'.join(forward_sql), reverse_sql='\n'.join(reverse_sql)),
+        upgrade_schema_version(REVISION, DOWN_REVISION),
+    ]
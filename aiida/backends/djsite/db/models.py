@@ -364,6 +364,15 @@ class DbLog(m.Model):
         return 'DbLog: {} for node {}: {}'.format(self.levelname, self.dbnode.id, self.message)
 
 
+class DbCheckpoint(m.Model):
+    """Class to store the checkpoints of processes, outside of the attributes of their node."""
+    dbnode = m.ForeignKey(DbNode, related_name='dbcheckpoints', on_delete=m.CASCADE)
+    checkpoint = m.TextField()
+
+    def __str__(self):
+        return 'DbCheckpoint for node {}'.format(self.dbnode_id)
+
+
 @contextlib.contextmanager
 def suppress_auto_now(list_of_models_fields):
     """
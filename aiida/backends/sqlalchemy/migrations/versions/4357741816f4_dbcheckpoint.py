@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=invalid-name,no-member
+"""Add the table for the checkpoints of processes and move the checkpoints out of the node attributes.
+
+Revision ID: 4357741816f4
+Revises: 126074a07c81
+Create Date: 2020-07-06 10:12:47.382954
+
+"""
+# pylint: disable=no-name-in-module,import-error,invalid-name,no-member
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import text
+
+forward_sql = [
+    """
+    INSERT INTO db_dbcheckpoint (dbnode_id, checkpoint)
+    SELECT id, attributes ->> 'checkpoints' FROM db_dbnode
+    WHERE attributes ? 'checkpoints'
+    ORDER BY id;
+    """,
+    """
+    INSERT INTO db_dbcheckpoint (dbnode_id, checkpoint)
+    SELECT db_dbnode.id, delta.value
+    FROM db_dbnode, jsonb_array_elements_text(db_dbnode.attributes -> 'checkpoint_deltas') WITH ORDINALITY AS delta
+    WHERE db_dbnode.attributes ? 'checkpoints' AND db_dbnode.attributes ? 'checkpoint_deltas'
+    ORDER BY db_dbnode.id, delta.ordinality;
+    """,
+    """
+    UPDATE db_dbnode SET attributes = attributes - 'checkpoints' - 'checkpoint_deltas'
+    WHERE attributes ?| array['checkpoints', 'checkpoint_deltas'];
+    """,
+]
+
+reverse_sql = [
+    """
+    UPDATE db_dbnode SET attributes = db_dbnode.attributes || checkpoint.attributes
+    FROM (
+        SELECT dbnode_id, jsonb_build_object('checkpoints', checkpoints[1]) || CASE
+            WHEN cardinality(checkpoints) > 1 THEN jsonb_build_object('checkpoint_deltas', checkpoints[2:])
+            ELSE '{}'::jsonb
+        END AS attributes
+        FROM (
+            SELECT dbnode_id, array_agg(checkpoint ORDER BY id) AS checkpoints FROM db_dbcheckpoint GROUP BY dbnode_id
+        ) AS checkpoints
+    ) AS checkpoint
+    WHERE db_dbnode.id = checkpoint.dbnode_id;
+    """,
+]
+
+# revision identifiers, used by Alembic.
+revision = '4357741816f4'
+down_revision = '126074a07c81'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Migrations for the upgrade."""
+    op.create_table(
+        'db_dbcheckpoint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dbnode_id', sa.Integer(), nullable=False),
+        sa.Column('checkpoint', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['dbnode_id'], ['db_dbnode.id'],
+                                name='db_dbcheckpoint_dbnode_id_fkey',
+                                ondelete='CASCADE',
+                                initially='DEFERRED',
+                                deferrable=True),
+        sa.PrimaryKeyConstraint('id', name='db_dbcheckpoint_pkey'),
+    )
+    op.create_index('ix_db_dbcheckpoint_dbnode_id', 'db_dbcheckpoint', ['dbnode_id'])
+
+    conn = op.get_bind()
+    statement = text('\n'.join(forward_sql))
+    conn.execute(statement)
+
+
+def downgrade():
+    """Migrations for the downgrade."""
+    conn = op.get_bind()
+    statement = text('\n'.join(reverse_sql))
+    conn.execute(statement)
+
+    op.drop_index('ix_db_dbcheckpoint_dbnode_id', table_name='db_dbcheckpoint')
+    op.drop_table('db_dbcheckpoint')
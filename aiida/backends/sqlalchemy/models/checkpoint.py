@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=import-error,no-name-in-module
+"""Module to manage the checkpoints of processes for the SQLA backend."""
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.schema import Column
+from sqlalchemy.types import Integer, Text
+
+from aiida.backends.sqlalchemy.models.base import Base
+
+
+class DbCheckpoint(Base):
+    """Class to store the checkpoints of processes, outside of the attributes of their node."""
+    __tablename__ = 'db_dbcheckpoint'
+
+    id = Column(Integer, primary_key=True)  # pylint: disable=invalid-name
+    dbnode_id = Column(
+        Integer,
+        ForeignKey('db_dbnode.id', deferrable=True, initially='DEFERRED', ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+    checkpoint = Column(Text(), nullable=False)
+
+    def __init__(self, dbnode_id, checkpoint):
+        """Setup initial value for the class attributes."""
+        self.dbnode_id = dbnode_id
+        self.checkpoint = checkpoint
+
+    def __str__(self):
+        return 'DbCheckpoint for node {}'.format(self.dbnode_id)
@@ -10,7 +10,7 @@
 # pylint: disable=import-error,no-name-in-module
 """Module to manage nodes for the SQLA backend."""
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import relationship, backref
 from sqlalchemy.schema import Column
 from sqlalchemy.types import Integer, String, DateTime, Text
@@ -28,6 +28,10 @@ class DbNode(Base):
     """Class to store nodes using SQLA backend."""
 
     __tablename__ = 'db_dbnode'
+    __table_args__ = (
+        # Index on the hash of the node, which is used to look up nodes with the same hash when caching is enabled
+        Index('ix_db_dbnode_extras_aiida_hash', text("(extras #>> '{_aiida_hash}')")),
+    )
 
     id = Column(Integer, primary_key=True)  # pylint: disable=invalid-name
     uuid = Column(UUID(as_uuid=True), default=get_new_uuid, unique=True)
@@ -45,7 +45,12 @@ def create_scoped_session_factory(engine, **kwargs):
 
 
 def delete_nodes_and_connections(pks):
-    """Backend-agnostic function to delete Nodes and connections"""
+    """Backend-agnostic function to delete Nodes and connections
+
+    The entity cache is cleared as well, such that the deleted nodes can no longer be loaded from it.
+    """
+    from aiida.manage.manager import get_manager
+
     if configuration.PROFILE.database_backend == BACKEND_DJANGO:
         from aiida.backends.djsite.utils import delete_nodes_and_connections_django as delete_nodes_backend
     elif configuration.PROFILE.database_backend == BACKEND_SQLA:
@@ -54,3 +59,7 @@ def delete_nodes_and_connections(pks):
         raise Exception('unknown backend {}'.format(configuration.PROFILE.database_backend))
 
     delete_nodes_backend(pks)
+
+    cache = get_manager().get_entity_cache()
+    if cache is not None:
+        cache.invalidate()
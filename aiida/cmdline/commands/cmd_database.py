@@ -76,6 +76,33 @@ def database_migrate(force):
             echo.echo_success('migration completed')
 
 
+@verdi_database.command('pack-repository')
+@click.option(
+    '--clean',
+    is_flag=True,
+    help='Also delete objects that are no longer referenced by any node, for example after deleting nodes. Objects '
+    'that were written less than an hour ago are kept, since they may belong to a node that is being stored.'
+)
+@decorators.with_dbenv()
+def database_pack_repository(clean):
+    """Pack the repository object store.
+
+    Moves all loose objects of the content-addressable object store of the repository into pack files, which greatly
+    reduces the number of files on disk.
+    """
+    from aiida.common.objectstore import get_object_store
+
+    store = get_object_store(create=False)
+
+    if store is None:
+        echo.echo_critical('the profile does not have a repository object store')
+
+    if clean:
+        echo.echo_success('deleted {} unreferenced objects'.format(store.delete_unreferenced_objects()))
+
+    echo.echo_success('packed {} loose objects'.format(store.pack_loose_objects()))
+
+
 @verdi_database.group('integrity')
 def verdi_database_integrity():
     """Check the integrity of the database and fix potential issues."""
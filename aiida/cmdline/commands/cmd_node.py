@@ -331,13 +331,40 @@ def node_delete(nodes, dry_run, verbose, force, **kwargs):
     default=None,
     help='Only include nodes that are class or sub class of the class identified by this entry point.'
 )
+@click.option(
+    '-p',
+    '--processes',
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help='Number of processes to use to compute the hashes.'
+)
+@click.option(
+    '-b',
+    '--batch-size',
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help='Number of nodes whose hashes are computed and stored at a time.'
+)
+@click.option(
+    '-r',
+    '--resume',
+    is_flag=True,
+    default=False,
+    help='Resume an interrupted rehash from the last node that was processed. Use the same node selection as before.'
+)
 @options.FORCE()
 @with_dbenv()
-def rehash(nodes, entry_point, force):
+def rehash(nodes, entry_point, processes, batch_size, resume, force):
     """Recompute the hash for nodes in the database.
 
     The set of nodes that will be rehashed can be filtered by their identifier and/or based on their class.
+
+    The nodes are rehashed in batches, in order of their pk, and the last processed pk is stored in the database after
+    each batch. If the command is interrupted, it can be resumed from that point with the `--resume` flag.
     """
+    from aiida.manage.database.rehash import get_rehash_checkpoint, rehash_nodes
     from aiida.orm import Data, ProcessNode, QueryBuilder
 
     if not force:
@@ -358,21 +385,30 @@ def rehash(nodes, entry_point, force):
     if entry_point is None:
         entry_point = (Data, ProcessNode)
 
-    if nodes:
-        to_hash = [(node,) for node in nodes if isinstance(node, entry_point)]
-        num_nodes = len(to_hash)
-    else:
-        builder = QueryBuilder()
-        builder.append(entry_point, tag='node')
-        to_hash = builder.all()
-        num_nodes = builder.count()
+    pks = [node.pk for node in nodes] if nodes else None
+    checkpoint = get_rehash_checkpoint() if resume else None
+
+    if resume and checkpoint is None:
+        echo.echo_info('no checkpoint of a previous rehash found, starting from the beginning')
+
+    filters = []
+
+    if pks is not None:
+        filters.append({'in': pks})
+
+    if checkpoint is not None:
+        filters.append({'>': checkpoint})
+
+    builder = QueryBuilder()
+    builder.append(entry_point, filters={'id': {'and': filters}} if filters else None)
+    num_nodes = builder.count()
 
-    if not to_hash:
+    if not num_nodes:
         echo.echo_critical('no matching nodes found')
 
-    with click.progressbar(to_hash, label='Rehashing Nodes:') as iter_hash:
-        for node, in iter_hash:
-            node.rehash()
+    with click.progressbar(length=num_nodes, label='Rehashing Nodes:') as progress:
+        for num_rehashed in rehash_nodes(entry_point, pks, processes=processes, batch_size=batch_size, resume=resume):
+            progress.update(num_rehashed)
 
     echo.echo_success('{} nodes re-hashed.'.format(num_nodes))
 
@@ -23,6 +23,7 @@ from functools import singledispatch
 from itertools import chain
 from operator import itemgetter
 
+import numpy
 import pytz
 
 from aiida.common.constants import AIIDA_FLOAT_PRECISION
@@ -83,6 +84,9 @@ BLAKE2B_OPTIONS = {
     'inner_size': 64,  # ... but still use 64 as the inner size
 }
 
+# Size in bytes of the chunks in which file contents are fed to the hash function, which bounds the memory usage
+HASH_CHUNK_SIZE = 2**20
+
 
 def make_hash(object_to_hash, **kwargs):
     """
@@ -134,6 +138,19 @@ def _single_digest(obj_type, obj_bytes=b''):
     return blake2b(obj_bytes, person=obj_type.encode('ascii'), node_depth=0, **BLAKE2B_OPTIONS).digest()
 
 
+def _single_digest_from_filelike(obj_type, handle, chunk_size=HASH_CHUNK_SIZE):
+    """Return the digest of the content of a binary file-like object, which is read in chunks of a fixed size.
+
+    The digest is identical to that of `_single_digest` for the entire content, but the memory usage is bounded.
+    """
+    hasher = blake2b(person=obj_type.encode('ascii'), node_depth=0, **BLAKE2B_OPTIONS)
+
+    for chunk in iter(lambda: handle.read(chunk_size), b''):
+        hasher.update(chunk)
+
+    return hasher.digest()
+
+
 _END_DIGEST = _single_digest(')')
 
 
@@ -256,6 +273,25 @@ def _(val, **kwargs):
     return [_single_digest('uuid', val.bytes)]
 
 
+@_make_hash.register(numpy.ndarray)
+def _(array, **kwargs):
+    """Hash a numpy array through its dtype, shape and the raw bytes of its data buffer.
+
+    The buffer is passed to the hash function directly, so no copy is made unless the array is not C-contiguous. Arrays
+    with an object dtype do not have a meaningful buffer and are hashed as nested lists instead.
+    """
+    if array.dtype.hasobject:
+        return [_single_digest('ndarray(')] + _make_hash(array.tolist(), **kwargs) + [_END_DIGEST]
+
+    array = numpy.ascontiguousarray(array)
+    header = '{}|{}'.format(array.dtype.str, array.shape).encode('utf-8')
+
+    # Dtypes such as `datetime64` cannot be exported as a buffer, so the data is viewed as bytes instead
+    data = memoryview(array.reshape(-1).view(numpy.uint8))
+
+    return [_single_digest('ndarray', header), _single_digest('ndarray_data', data)]
+
+
 @_make_hash.register(Folder)
 def _(folder, **kwargs):
     """
@@ -274,7 +310,7 @@ def _(folder, **kwargs):
             if isfile:
                 yield _single_digest('fname', name.encode('utf-8'))
                 with subfolder.open(name, mode='rb') as fhandle:
-                    yield _single_digest('fcontent', fhandle.read())
+                    yield _single_digest_from_filelike('fcontent', fhandle)
             else:
                 yield _single_digest('dir(', name.encode('utf-8'))
                 for digest in folder_digests(subfolder.get_subfolder(name)):
@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Content-addressable object store used as an alternative backend for the file repository of nodes.
+
+Each object is identified by the SHA-256 hash of its content, so identical files are stored only once. New objects are
+first written as individual "loose" files, sharded on the first two characters of their hash key. Loose objects can
+then be concatenated into a small number of pack files, which reduces the number of inodes by orders of magnitude.
+The location of packed objects, as well as the manifests that map the object keys of each node to hash keys, are kept
+in a single SQLite index file. Since the locking of SQLite is unreliable on network file systems, the index of the
+object store of a profile is kept on the local disk, in the configuration folder, instead of next to the objects.
+"""
+import codecs
+import contextlib
+import hashlib
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+__all__ = ('ObjectStore', 'get_object_store')
+
+CHUNK_SIZE = 2**16
+
+# Loose objects that were written less than this number of seconds ago are never deleted as unreferenced objects, since
+# the manifest that references them may not yet have been stored
+CLEAN_GRACE_PERIOD = 3600
+
+# Pack files are closed for further writing once they exceed this size in bytes, after which a new pack is started
+PACK_SIZE_TARGET = 4 * 2**30
+
+
+class PackedObjectReader(io.RawIOBase):
+    """Read-only file-like object that gives access to an object that is contained within a pack file."""
+
+    def __init__(self, filepath, offset, length):
+        super().__init__()
+        self._handle = open(filepath, 'rb')
+        self._offset = offset
+        self._length = length
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._length + offset
+        else:
+            raise ValueError('invalid value for `whence`: {}'.format(whence))
+
+        if position < 0:
+            raise ValueError('negative seek position {}'.format(position))
+
+        self._position = position
+        return self._position
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._length - self._position)
+
+        if size <= 0:
+            return 0
+
+        self._handle.seek(self._offset + self._position)
+        data = self._handle.read(size)
+        buffer[:len(data)] = data
+        self._position += len(data)
+
+        return len(data)
+
+    def close(self):
+        self._handle.close()
+        super().close()
+
+
+class ObjectStore:
+    """Content-addressable store of file objects with per-node manifests.
+
+    The store is safe for concurrent use by multiple processes on the machine that holds its index: loose objects are
+    written atomically by moving them into place and all modifications of the index, including the appending to pack
+    files, happen within an exclusive SQLite transaction.
+    """
+
+    def __init__(self, basepath, index_dirpath=None):
+        """Construct a new instance, creating the directory structure of the object store if it does not yet exist.
+
+        :param basepath: absolute path of the folder that contains the object store
+        :param index_dirpath: absolute path of the folder that contains the index, named after the UUID of the object
+            store, by default the folder of the object store itself
+        """
+        self._basepath = basepath
+        self._loose_path = os.path.join(basepath, 'loose')
+        self._packs_path = os.path.join(basepath, 'packs')
+        self._sandbox_path = os.path.join(basepath, 'sandbox')
+        self._local = threading.local()
+
+        for path in [self._loose_path, self._packs_path, self._sandbox_path]:
+            os.makedirs(path, exist_ok=True)
+
+        self._uuid = self._get_or_create_uuid()
+        self._index_path = os.path.join(index_dirpath or basepath, '{}.sqlite'.format(self._uuid))
+        os.makedirs(os.path.dirname(self._index_path), exist_ok=True)
+
+        # Object stores used to keep their index in the folder of the object store itself
+        legacy_index_path = os.path.join(basepath, 'index.sqlite')
+
+        if os.path.isfile(legacy_index_path) and not os.path.isfile(self._index_path):
+            descriptor, temppath = tempfile.mkstemp(dir=os.path.dirname(self._index_path))
+            os.close(descriptor)
+            shutil.copyfile(legacy_index_path, temppath)
+            os.replace(temppath, self._index_path)
+
+        with self._transaction() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS packed_object '
+                '(hashkey TEXT PRIMARY KEY, pack_id INTEGER NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS manifest '
+                '(uuid TEXT NOT NULL, key TEXT NOT NULL, hashkey TEXT, PRIMARY KEY (uuid, key))'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_manifest_hashkey ON manifest (hashkey)')
+
+    @property
+    def basepath(self):
+        """Return the absolute path of the folder that contains the object store."""
+        return self._basepath
+
+    @property
+    def uuid(self):
+        """Return the UUID of the object store, which is generated when the object store is created."""
+        return self._uuid
+
+    def _get_or_create_uuid(self):
+        """Return the UUID of the object store, generating it if the object store does not yet have one.
+
+        A new object store, for example after the repository has been removed, gets a new UUID and therefore a new
+        index, such that the index never refers to objects that no longer exist.
+        """
+        from uuid import uuid4
+
+        filepath = os.path.join(self._basepath, 'uuid')
+
+        if not os.path.isfile(filepath):
+            descriptor, temppath = tempfile.mkstemp(dir=self._sandbox_path)
+
+            try:
+                with os.fdopen(descriptor, 'w') as handle:
+                    handle.write(uuid4().hex)
+
+                # Linking fails if another process created the file first, in which case its UUID is used
+                with contextlib.suppress(FileExistsError):
+                    os.link(temppath, filepath)
+            finally:
+                os.remove(temppath)
+
+        with open(filepath) as handle:
+            return handle.read().strip()
+
+    def _get_connection(self):
+        """Return the connection to the index of the current thread, which is opened on first use."""
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.connection = sqlite3.connect(self._index_path, timeout=60, isolation_level=None)
+            self._local.pid = os.getpid()
+
+        return self._local.connection
+
+    @contextlib.contextmanager
+    def _transaction(self, exclusive=False):
+        """Context manager that yields a connection to the index in a transaction that is committed upon exiting.
+
+        :param exclusive: if True, the write lock on the index is acquired immediately, which serializes all
+            concurrent writers
+        """
+        connection = self._get_connection()
+        connection.execute('BEGIN IMMEDIATE' if exclusive else 'BEGIN')
+        try:
+            yield connection
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+
+    def _get_loose_path(self, hashkey):
+        return os.path.join(self._loose_path, hashkey[:2], hashkey[2:])
+
+    def _get_pack_path(self, pack_id):
+        return os.path.join(self._packs_path, '{}.pack'.format(pack_id))
+
+    def _get_packed_location(self, hashkey):
+        """Return the tuple `(pack_id, offset, length)` of a packed object or `None` if the object is not packed."""
+        return self._get_connection().execute(
+            'SELECT pack_id, offset, length FROM packed_object WHERE hashkey = ?', (hashkey,)
+        ).fetchone()
+
+    def has_object(self, hashkey):
+        """Return whether the object with the given hash key exists in the store.
+
+        :param hashkey: the hash key of the object
+        """
+        return os.path.isfile(self._get_loose_path(hashkey)) or self._get_packed_location(hashkey) is not None
+
+    def add_object(self, handle, encoding=None):
+        """Add the content of a file-like object to the store.
+
+        The content is streamed in chunks to a temporary file while the hash is computed, so memory usage is bounded.
+        The temporary file is then moved into place as a loose object, even if an identical object already exists. This
+        costs no additional I/O and refreshes the modification time of the loose object, such that it is not deleted by
+        `delete_unreferenced_objects` before the manifest that references it has been stored. Any duplicate of a packed
+        object is removed when the loose objects are packed.
+
+        :param handle: file-like object whose content to store
+        :param encoding: the encoding with which to store the content of a file-like object in text mode, or None if
+            the file-like object is in binary mode
+        :return: the hash key of the object
+        """
+        hasher = hashlib.sha256()
+        encoder = codecs.getincrementalencoder(encoding)() if encoding is not None else None
+        descriptor, temppath = tempfile.mkstemp(dir=self._sandbox_path)
+
+        try:
+            with os.fdopen(descriptor, 'wb') as target:
+                for chunk in iter(lambda: handle.read(CHUNK_SIZE), handle.read(0)):
+                    if encoder is not None:
+                        chunk = encoder.encode(chunk)
+                    hasher.update(chunk)
+                    target.write(chunk)
+
+                if encoder is not None:
+                    chunk = encoder.encode('', final=True)
+                    hasher.update(chunk)
+                    target.write(chunk)
+
+            hashkey = hasher.hexdigest()
+            filepath = self._get_loose_path(hashkey)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            os.replace(temppath, filepath)
+        finally:
+            if os.path.exists(temppath):
+                os.remove(temppath)
+
+        return hashkey
+
+    def add_object_from_file(self, filepath):
+        """Add the content of the file at the given path to the store.
+
+        :param filepath: absolute path of the file to store
+        :return: the hash key of the object
+        """
+        with open(filepath, 'rb') as handle:
+            return self.add_object(handle)
+
+    def open_object(self, hashkey):
+        """Return a binary file handle to the object with the given hash key.
+
+        :param hashkey: the hash key of the object
+        :return: a readable binary file-like object
+        :raises IOError: if the object does not exist
+        """
+        location = self._get_packed_location(hashkey)
+
+        if location is not None:
+            pack_id, offset, length = location
+            return io.BufferedReader(PackedObjectReader(self._get_pack_path(pack_id), offset, length))
+
+        try:
+            return open(self._get_loose_path(hashkey), 'rb')
+        except FileNotFoundError:
+            raise IOError('object with hash key {} does not exist'.format(hashkey))
+
+    def pack_loose_objects(self):
+        """Move all loose objects into pack files and remove the corresponding loose files.
+
+        :return: the number of objects that were packed
+        """
+        packed = []
+
+        with self._transaction(exclusive=True) as connection:
+            pack_id = connection.execute('SELECT MAX(pack_id) FROM packed_object').fetchone()[0] or 0
+
+            for shard in sorted(os.listdir(self._loose_path)):
+                for filename in sorted(os.listdir(os.path.join(self._loose_path, shard))):
+                    hashkey = shard + filename
+                    exists = connection.execute('SELECT 1 FROM packed_object WHERE hashkey = ?', (hashkey,)).fetchone()
+
+                    if not exists:
+                        pack_path = self._get_pack_path(pack_id)
+
+                        if os.path.exists(pack_path) and os.path.getsize(pack_path) > PACK_SIZE_TARGET:
+                            pack_id += 1
+                            pack_path = self._get_pack_path(pack_id)
+
+                        with open(pack_path, 'ab') as pack, open(self._get_loose_path(hashkey), 'rb') as handle:
+                            offset = pack.seek(0, io.SEEK_END)
+                            shutil.copyfileobj(handle, pack, CHUNK_SIZE)
+                            length = pack.tell() - offset
+                            pack.flush()
+                            os.fsync(pack.fileno())
+
+                        connection.execute(
+                            'INSERT INTO packed_object (hashkey, pack_id, offset, length) VALUES (?, ?, ?, ?)',
+                            (hashkey, pack_id, offset, length)
+                        )
+
+                    packed.append(hashkey)
+
+        # Only remove the loose objects once the transaction that records their location in the packs is committed
+        for hashkey in packed:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._get_loose_path(hashkey))
+
+        return len(packed)
+
+    def set_manifest(self, uuid, manifest):
+        """Set the manifest of the node with the given UUID, replacing any existing manifest.
+
+        :param uuid: the UUID of the node
+        :param manifest: dictionary mapping object keys onto hash keys, where directories are mapped onto `None`
+        """
+        self.set_manifests({uuid: manifest})
+
+    def set_manifests(self, manifests):
+        """Set the manifests of multiple nodes in a single transaction, replacing any existing manifests.
+
+        :param manifests: dictionary mapping node UUIDs onto their manifest, see `set_manifest`
+        """
+        with self._transaction(exclusive=True) as connection:
+            connection.executemany('DELETE FROM manifest WHERE uuid = ?', [(str(uuid),) for uuid in manifests])
+            connection.executemany(
+                'INSERT INTO manifest (uuid, key, hashkey) VALUES (?, ?, ?)',
+                [(str(uuid), key, hashkey) for uuid, manifest in manifests.items() for key, hashkey in manifest.items()]
+            )
+
+    def update_manifest(self, uuid, manifest):
+        """Add or replace entries in the manifest of the node with the given UUID.
+
+        :param uuid: the UUID of the node
+        :param manifest: dictionary mapping object keys onto hash keys, where directories are mapped onto `None`
+        """
+        with self._transaction(exclusive=True) as connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO manifest (uuid, key, hashkey) VALUES (?, ?, ?)',
+                [(str(uuid), key, hashkey) for key, hashkey in manifest.items()]
+            )
+
+    def delete_manifest_entries(self, uuid, keys):
+        """Delete entries from the manifest of the node with the given UUID.
+
+        :param uuid: the UUID of the node
+        :param keys: iterable of object keys to remove from the manifest
+        """
+        with self._transaction(exclusive=True) as connection:
+            connection.executemany(
+                'DELETE FROM manifest WHERE uuid = ? AND key = ?', [(str(uuid), key) for key in keys]
+            )
+
+    def get_manifest(self, uuid):
+        """Return the manifest of the node with the given UUID.
+
+        :param uuid: the UUID of the node
+        :return: dictionary mapping object keys onto hash keys, where directories are mapped onto `None`, or `None` if
+            no manifest exists for the given UUID
+        """
+        rows = self._get_connection().execute(
+            'SELECT key, hashkey FROM manifest WHERE uuid = ?', (str(uuid),)
+        ).fetchall()
+
+        if not rows:
+            return None
+
+        return dict(rows)
+
+    def delete_manifest(self, uuid):
+        """Delete the manifest of the node with the given UUID.
+
+        The objects referenced by the manifest are not deleted, since they may be shared with other nodes. Use the
+        `delete_unreferenced_objects` method to remove those.
+
+        :param uuid: the UUID of the node
+        """
+        with self._transaction(exclusive=True) as connection:
+            connection.execute('DELETE FROM manifest WHERE uuid = ?', (str(uuid),))
+
+    def delete_unreferenced_objects(self, grace_period=CLEAN_GRACE_PERIOD):
+        """Delete all loose objects that are not referenced by any manifest and forget unreferenced packed objects.
+
+        Loose objects that were written recently may belong to a node that is being stored, whose manifest is only set
+        once all its objects have been added, so they are not deleted. Neither are packed objects for which such a loose
+        object exists.
+
+        .. note:: the space occupied by unreferenced packed objects in the pack files is not reclaimed.
+
+        :param grace_period: the minimum age in seconds of an unreferenced loose object for it to be deleted
+        :return: the number of objects that were deleted
+        """
+        count = 0
+        threshold = time.time() - grace_period
+
+        with self._transaction(exclusive=True) as connection:
+            referenced = {row[0] for row in connection.execute('SELECT DISTINCT hashkey FROM manifest')}
+
+            for shard in os.listdir(self._loose_path):
+                for filename in os.listdir(os.path.join(self._loose_path, shard)):
+                    filepath = os.path.join(self._loose_path, shard, filename)
+                    if shard + filename not in referenced and os.path.getmtime(filepath) < threshold:
+                        os.remove(filepath)
+                        count += 1
+
+            for (hashkey,) in connection.execute('SELECT hashkey FROM packed_object').fetchall():
+                if hashkey not in referenced and not os.path.isfile(self._get_loose_path(hashkey)):
+                    connection.execute('DELETE FROM packed_object WHERE hashkey = ?', (hashkey,))
+                    count += 1
+
+        return count
+
+
+OBJECT_STORES = {}
+
+
+def get_object_store(create=True):
+    """Return the object store of the currently loaded profile.
+
+    :param create: if False, `None` is returned instead of creating the object store if it does not yet exist
+    :return: an `ObjectStore` instance or `None`
+    """
+    from aiida.manage.configuration import get_profile, settings
+
+    basepath = os.path.join(get_profile().repository_path, 'objectstore')
+
+    if basepath not in OBJECT_STORES:
+        if not create and not os.path.isdir(basepath):
+            return None
+        OBJECT_STORES[basepath] = ObjectStore(basepath, settings.OBJECTSTORE_INDEX_DIR)
+
+    return OBJECT_STORES[basepath]
@@ -17,12 +17,14 @@ import os
 
 from aiida.common import AIIDA_LOGGER, exceptions
 from aiida.common.datastructures import CalcJobState
+from aiida.common.escaping import escape_for_bash
 from aiida.common.folders import SandboxFolder
 from aiida.common.links import LinkType
 from aiida.orm import FolderData, Node
 from aiida.orm.utils.log import get_dblogger_extra
 from aiida.plugins import DataFactory
 from aiida.schedulers.datastructures import JobState
+from aiida.schedulers.scheduler import Scheduler
 
 REMOTE_WORK_DIRECTORY_LOST_FOUND = 'lost+found'
 
@@ -39,7 +41,7 @@ def upload_calculation(node, transport, calc_info, folder, inputs=None, dry_run=
     """
     # pylint: disable=too-many-locals,too-many-branches,too-many-statements
     from logging import LoggerAdapter
-    from tempfile import NamedTemporaryFile
+    from aiida.manage.configuration import get_config_option
     from aiida.orm import load_node, Code, RemoteData
 
     # If the calculation already has a `remote_folder`, simply return. The upload was apparently already completed
@@ -51,6 +53,7 @@ def upload_calculation(node, transport, calc_info, folder, inputs=None, dry_run=
         return calc_info
 
     computer = node.computer
+    archive_format = get_config_option('transport.upload.archive')
 
     codes_info = calc_info.codes_info
     input_codes = [load_node(_.code_uuid, sub_classes=(Code,)) for _ in codes_info]
@@ -137,73 +140,29 @@ def upload_calculation(node, transport, calc_info, folder, inputs=None, dry_run=
         workdir = transport.getcwd()
         node.set_remote_workdir(workdir)
 
-    # I first create the code files, so that the code can put
-    # default files to be overwritten by the plugin itself.
-    # Still, beware! The code file itself could be overwritten...
-    # But I checked for this earlier.
-    for code in input_codes:
-        if code.is_local():
-            # Note: this will possibly overwrite files
-            for filename in code.list_object_names():
-                # Note, once #2579 is implemented, use the `node.open` method instead of the named temporary file in
-                # combination with the new `Transport.put_object_from_filelike`
-                # Since the content of the node could potentially be binary, we read the raw bytes and pass them on
-                with NamedTemporaryFile(mode='wb+') as handle:
-                    handle.write(code.get_object_content(filename, mode='rb'))
-                    handle.flush()
-                    transport.put(handle.name, filename)
-            transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
-
-    # In a dry_run, the working directory is the raw input folder, which will already contain these resources
-    if not dry_run:
-        for filename in folder.get_content_list():
-            logger.debug('[submission of calculation {}] copying file/folder {}...'.format(node.pk, filename))
-            transport.put(folder.get_abs_path(filename), filename)
-
     # local_copy_list is a list of tuples, each with (uuid, dest_rel_path)
     # NOTE: validation of these lists are done inside calculation.presubmit()
     local_copy_list = calc_info.local_copy_list or []
     remote_copy_list = calc_info.remote_copy_list or []
     remote_symlink_list = calc_info.remote_symlink_list or []
 
-    for uuid, filename, target in local_copy_list:
-        logger.debug('[submission of calculation {}] copying local file/folder to {}'.format(node.uuid, target))
-
-        def find_data_node(inputs, uuid):
-            """Find and return the node with the given UUID from a nested mapping of input nodes.
-
-            :param inputs: (nested) mapping of nodes
-            :param uuid: UUID of the node to find
-            :return: instance of `Node` or `None` if not found
-            """
-            from collections.abc import Mapping
-            data_node = None
-
-            for input_node in inputs.values():
-                if isinstance(input_node, Mapping):
-                    data_node = find_data_node(input_node, uuid)
-                elif isinstance(input_node, Node) and input_node.uuid == uuid:
-                    data_node = input_node
-                if data_node is not None:
-                    break
-
-            return data_node
+    local_copy_objects = []
 
+    for uuid, filename, target in local_copy_list:
         try:
             data_node = load_node(uuid=uuid)
         except exceptions.NotExistent:
-            data_node = find_data_node(inputs, uuid)
+            data_node = _find_data_node(inputs, uuid)
 
         if data_node is None:
             logger.warning('failed to load Node<{}> specified in the `local_copy_list`'.format(uuid))
         else:
-            # Note, once #2579 is implemented, use the `node.open` method instead of the named temporary file in
-            # combination with the new `Transport.put_object_from_filelike`
-            # Since the content of the node could potentially be binary, we read the raw bytes and pass them on
-            with NamedTemporaryFile(mode='wb+') as handle:
-                handle.write(data_node.get_object_content(filename, mode='rb'))
-                handle.flush()
-                transport.put(handle.name, target)
+            local_copy_objects.append((data_node, filename, target))
+
+    if dry_run or archive_format == 'none' or not _upload_files_as_archive(
+        transport, folder, input_codes, local_copy_objects, archive_format
+    ):
+        _upload_files(node, transport, folder, input_codes, local_copy_objects, dry_run, logger)
 
     if dry_run:
         if remote_copy_list:
@@ -296,6 +255,158 @@ def upload_calculation(node, transport, calc_info, folder, inputs=None, dry_run=
         remotedata.store()
 
 
+def _find_data_node(inputs, uuid):
+    """Find and return the node with the given UUID from a nested mapping of input nodes.
+
+    :param inputs: (nested) mapping of nodes
+    :param uuid: UUID of the node to find
+    :return: instance of `Node` or `None` if not found
+    """
+    from collections.abc import Mapping
+    data_node = None
+
+    for input_node in inputs.values():
+        if isinstance(input_node, Mapping):
+            data_node = _find_data_node(input_node, uuid)
+        elif isinstance(input_node, Node) and input_node.uuid == uuid:
+            data_node = input_node
+        if data_node is not None:
+            break
+
+    return data_node
+
+
+def _upload_files(node, transport, folder, input_codes, local_copy_objects, dry_run, logger):
+    """Copy the files of local codes, the sandbox folder and the local copy list to the working directory one by one.
+
+    :param node: the `CalcJobNode`
+    :param transport: an already opened transport whose current working directory is the remote working directory
+    :param folder: temporary local file system folder containing the inputs written by `CalcJob.prepare_for_submission`
+    :param input_codes: list of the codes of the calculation
+    :param local_copy_objects: list of tuples of the node, the relative path of the file in its repository and the
+        relative path of the target in the working directory
+    :param dry_run: if True, the sandbox folder is not copied since it is the working directory itself
+    :param logger: the logger to use
+    """
+    # pylint: disable=too-many-arguments
+    from tempfile import NamedTemporaryFile
+
+    # I first create the code files, so that the code can put
+    # default files to be overwritten by the plugin itself.
+    # Still, beware! The code file itself could be overwritten...
+    # But I checked for this earlier.
+    for code in input_codes:
+        if code.is_local():
+            # Note: this will possibly overwrite files
+            for filename in code.list_object_names():
+                # Note, once #2579 is implemented, use the `node.open` method instead of the named temporary file in
+                # combination with the new `Transport.put_object_from_filelike`
+                # Since the content of the node could potentially be binary, we read the raw bytes and pass them on
+                with NamedTemporaryFile(mode='wb+') as handle:
+                    handle.write(code.get_object_content(filename, mode='rb'))
+                    handle.flush()
+                    transport.put(handle.name, filename)
+            transport.chmod(code.get_local_executable(), 0o755)  # rwxr-xr-x
+
+    # In a dry_run, the working directory is the raw input folder, which will already contain these resources
+    if not dry_run:
+        for filename in folder.get_content_list():
+            logger.debug('[submission of calculation {}] copying file/folder {}...'.format(node.pk, filename))
+            transport.put(folder.get_abs_path(filename), filename)
+
+    for data_node, filename, target in local_copy_objects:
+        logger.debug('[submission of calculation {}] copying local file/folder to {}'.format(node.uuid, target))
+        # Note, once #2579 is implemented, use the `node.open` method instead of the named temporary file in
+        # combination with the new `Transport.put_object_from_filelike`
+        # Since the content of the node could potentially be binary, we read the raw bytes and pass them on
+        with NamedTemporaryFile(mode='wb+') as handle:
+            handle.write(data_node.get_object_content(filename, mode='rb'))
+            handle.flush()
+            transport.put(handle.name, target)
+
+
+def _upload_files_as_archive(transport, folder, input_codes, local_copy_objects, archive_format):
+    """Copy the files of local codes, the sandbox folder and the local copy list to the working directory in one go.
+
+    The files are packed in a single archive, in the same order in which they would be copied one by one such that
+    later files overwrite earlier ones, which is streamed to a single `tar` command that unpacks it on the remote.
+
+    :param transport: an already opened transport whose current working directory is the remote working directory
+    :param folder: temporary local file system folder containing the inputs written by `CalcJob.prepare_for_submission`
+    :param input_codes: list of the codes of the calculation
+    :param local_copy_objects: list of tuples of the node, the relative path of the file in its repository and the
+        relative path of the target in the working directory
+    :param archive_format: either `tar` or `gzip`
+    :return: True if the files were copied, False if the archive could not be streamed to or unpacked on the remote, or
+        if some target lies outside of the working directory
+    """
+    import tarfile
+    import tempfile
+    import paramiko
+
+    for _, _, target in local_copy_objects:
+        target = os.path.normpath(target)
+        if os.path.isabs(target) or target == os.pardir or target.startswith(os.pardir + os.sep):
+            return False
+
+    compression = 'z' if archive_format == 'gzip' else ''
+
+    with tempfile.TemporaryFile() as handle:
+        with tarfile.open(
+            fileobj=handle, mode='w:gz' if archive_format == 'gzip' else 'w', dereference=True
+        ) as archive:
+            for code in input_codes:
+                if code.is_local():
+                    executable = code.get_local_executable()
+                    for filename in code.list_object_names():
+                        content = code.get_object_content(filename, mode='rb')
+                        _add_content_to_archive(archive, filename, content, 0o755 if filename == executable else 0o644)
+
+            for filename in folder.get_content_list():
+                archive.add(folder.get_abs_path(filename), filename)
+
+            for data_node, filename, target in local_copy_objects:
+                _add_content_to_archive(archive, target, data_node.get_object_content(filename, mode='rb'))
+
+        handle.seek(0)
+
+        try:
+            retval, _, stderr = transport.exec_command_wait('tar -x{}f -'.format(compression), stdin=handle)
+        except (OSError, paramiko.SSHException) as exception:
+            # The remote command closes the channel while the archive is still being written to it if it fails early,
+            # for example because `tar` is not available
+            retval, stderr = None, str(exception)
+
+    if retval != 0:
+        execlogger.warning(
+            'could not unpack the archive of the input files on the remote, copying the files one by one: {}'.format(
+                stderr.strip()
+            )
+        )
+        return False
+
+    return True
+
+
+def _add_content_to_archive(archive, name, content, mode=0o644):
+    """Add a file with the given content to an archive.
+
+    :param archive: a :class:`tarfile.TarFile` opened for writing
+    :param name: the name of the file in the archive
+    :param content: the content of the file as bytes
+    :param mode: the permissions of the file
+    """
+    import io
+    import tarfile
+    import time
+
+    tarinfo = tarfile.TarInfo(name)
+    tarinfo.size = len(content)
+    tarinfo.mode = mode
+    tarinfo.mtime = time.time()
+    archive.addfile(tarinfo, io.BytesIO(content))
+
+
 def submit_calculation(calculation, transport):
     """Submit a previously uploaded `CalcJob` to the scheduler.
 
@@ -324,6 +435,52 @@ def submit_calculation(calculation, transport):
     return job_id
 
 
+def submit_calculations(calculations, transport):
+    """Submit previously uploaded `CalcJobs` that share a computer and user to the scheduler with a single command.
+
+    :param calculations: a list of CalcJobNode instances to submit.
+    :param transport: an already opened transport to use to submit the calculations.
+    :return: list with for each calculation either its job id or the exception that was raised while submitting it
+    """
+    results = {}
+    submissions = []
+
+    # As in `submit_calculation`, calculations with a job id have already been submitted and should not be resubmitted
+    for calculation in calculations:
+        job_id = calculation.get_job_id()
+        if job_id is not None:
+            results[calculation.pk] = job_id
+        else:
+            submissions.append(calculation)
+
+    if submissions:
+        scheduler = submissions[0].computer.get_scheduler()
+        scheduler.set_transport(transport)
+        scripts = [
+            (calculation.get_remote_workdir(), calculation.get_option('submit_script_filename'))
+            for calculation in submissions
+        ]
+
+        # Schedulers that customize the submission of a single script may rely on more than its submit command, so they
+        # are not submitted in a batch but one after the other
+        if len(scripts) > 1 and type(scheduler).submit_from_script is Scheduler.submit_from_script:
+            job_ids = scheduler.submit_from_scripts(scripts)
+        else:
+            job_ids = []
+            for workdir, submit_script_filename in scripts:
+                try:
+                    job_ids.append(scheduler.submit_from_script(workdir, submit_script_filename))
+                except Exception as exception:  # pylint: disable=broad-except
+                    job_ids.append(exception)
+
+        for calculation, job_id in zip(submissions, job_ids):
+            if not isinstance(job_id, Exception):
+                calculation.set_job_id(job_id)
+            results[calculation.pk] = job_id
+
+    return [results[calculation.pk] for calculation in calculations]
+
+
 def retrieve_calculation(calculation, transport, retrieved_temporary_folder):
     """Retrieve all the files of a completed job calculation using the given transport.
 
@@ -526,7 +683,7 @@ def _retrieve_singlefiles(job, transport, folder, retrieve_file_list, logger_ext
         fil.store()
 
 
-def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
+def retrieve_files_from_list(calculation, transport, folder, retrieve_list, archive_format=None):
     """
     Retrieve all the files in the retrieve_list from the remote into the
     local folder instance through the transport. The entries in the retrieve_list
@@ -546,10 +703,47 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
     treated as the work directory of the folder and the depth integer determines
     upto what level of the original remotepath nesting the files will be copied.
 
+    Unless the archive format is `none`, all the files are first packed in a single archive on the remote, which is
+    then retrieved and unpacked locally, instead of retrieving each file separately. If the archive cannot be created,
+    for example because `tar` is not available on the remote, the files are retrieved one by one.
+
     :param transport: the Transport instance
     :param folder: an absolute path to a folder to copy files in
     :param retrieve_list: the list of files to retrieve
+    :param archive_format: one of `none`, `tar` or `gzip`, by default the `transport.retrieve.archive` option is used
     """
+    from aiida.manage.configuration import get_config_option
+
+    if archive_format is None:
+        archive_format = get_config_option('transport.retrieve.archive')
+
+    # Resolving the retrieve list and retrieving the files one by one inspect many remote paths without modifying them
+    with transport.metadata_cache():
+        remote_local_names = _get_remote_local_names(transport, folder, retrieve_list)
+
+        if archive_format != 'none' and remote_local_names:
+            if _retrieve_files_as_archive(calculation, transport, folder, remote_local_names, archive_format):
+                return
+
+        for rem, loc in remote_local_names:
+            transport.logger.debug(
+                "[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem)
+            )
+            transport.get(rem, os.path.join(folder, loc), ignore_nonexisting=True)
+
+
+def _get_remote_local_names(transport, folder, retrieve_list):
+    """Resolve the entries of a retrieve list into the remote paths and the local paths they should be copied to.
+
+    Folders in `folder` that are needed by entries with a depth larger than one are created.
+
+    :param transport: the Transport instance
+    :param folder: an absolute path to a folder to copy files in
+    :param retrieve_list: the list of files to retrieve, see `retrieve_files_from_list`
+    :return: list of tuples of the remote path and the path relative to `folder`
+    """
+    remote_local_names = []
+
     for item in retrieve_list:
         if isinstance(item, list):
             tmp_rname, tmp_lname, depth = item
@@ -561,6 +755,7 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
                     to_append = rem.split(os.path.sep)[-depth:] if depth > 0 else []
                     local_names.append(os.path.sep.join([tmp_lname] + to_append))
             else:
+                remote_names = [tmp_rname]
                 to_append = tmp_rname.split(os.path.sep)[-depth:] if depth > 0 else []
                 local_names = [os.path.sep.join([tmp_lname] + to_append)]
             if depth > 1:  # create directories in the folder, if needed
@@ -576,8 +771,179 @@ def retrieve_files_from_list(calculation, transport, folder, retrieve_list):
                 remote_names = [item]
                 local_names = [os.path.split(item)[1]]
 
-        for rem, loc in zip(remote_names, local_names):
-            transport.logger.debug(
-                "[retrieval of calc {}] Trying to retrieve remote item '{}'".format(calculation.pk, rem)
+        remote_local_names.extend(zip(remote_names, local_names))
+
+    return remote_local_names
+
+
+def _retrieve_files_as_archive(calculation, transport, folder, remote_local_names, archive_format):
+    """Retrieve files by packing them in a single archive on the remote, which is then retrieved and unpacked locally.
+
+    This requires only a few round trips with the remote, independent of the number of files. Remote files that do not
+    exist are ignored, as they are when the files are retrieved one by one.
+
+    :param transport: an already opened transport whose current working directory is the remote working directory
+    :param folder: an absolute path to a folder to copy files in
+    :param remote_local_names: list of tuples of the remote path and the path relative to `folder` of each file
+    :param archive_format: either `tar` or `gzip`
+    :return: True if the files were retrieved, False if the archive could not be created on the remote or unpacked
+    """
+    # pylint: disable=too-many-locals
+    import tarfile
+    import tempfile
+    import uuid
+
+    cwd = transport.getcwd()
+
+    if cwd is None:
+        return False
+
+    # Absolute remote paths are archived relative to the root, such that they can be found back in the archive
+    remote_paths = [os.path.normpath(os.path.join(cwd, rem)) for rem, _ in remote_local_names]
+
+    if any('\n' in path for path in remote_paths):
+        return False
+
+    extension = 'tar.gz' if archive_format == 'gzip' else 'tar'
+    compression = 'z' if archive_format == 'gzip' else ''
+    remote_archive = os.path.join(cwd, '.aiida_retrieve_{}.{}'.format(uuid.uuid4().hex, extension))
+    command = 'tar -c{}hf {} -C / -T -'.format(compression, escape_for_bash(remote_archive))
+    stdin = ''.join('{}\n'.format(path.lstrip(os.sep)) for path in remote_paths)
+
+    transport.logger.debug(
+        '[retrieval of calc {}] Packing {} remote items in archive {}'.format(
+            calculation.pk, len(remote_paths), remote_archive
+        )
+    )
+
+    try:
+        retval, _, stderr = transport.exec_command_wait(command, stdin=stdin)
+
+        # `tar` exits with a non-zero status if some of the files do not exist, but still archives all the others. Any
+        # other error, for example a full disk, may leave a truncated archive behind.
+        if retval != 0 and not (_is_partial_archive(retval, stderr) and transport.isfile(remote_archive)):
+            execlogger.warning(
+                '[retrieval of calc {}] could not create an archive on the remote, retrieving the files one by one: '
+                '{}'.format(calculation.pk, stderr.strip()),
+                extra=get_dblogger_extra(calculation)
             )
-            transport.get(rem, os.path.join(folder, loc), ignore_nonexisting=True)
+            return False
+
+        # The archive is unpacked inside the target folder, such that the items can be moved instead of copied
+        with tempfile.TemporaryDirectory(dir=folder) as dirpath:
+            local_archive = os.path.join(dirpath, 'archive.{}'.format(extension))
+            unpacked = os.path.join(dirpath, 'unpacked')
+
+            try:
+                transport.getfile(remote_archive, local_archive)
+
+                with tarfile.open(local_archive, 'r:*') as archive:
+                    members = [member for member in archive.getmembers() if _is_safe_archive_member(member)]
+                    archive.extractall(unpacked, members=members)
+            except (tarfile.TarError, EOFError) as exception:
+                execlogger.warning(
+                    '[retrieval of calc {}] could not unpack the archive retrieved from the remote, retrieving the '
+                    'files one by one: {}'.format(calculation.pk, exception),
+                    extra=get_dblogger_extra(calculation)
+                )
+                return False
+
+            os.remove(local_archive)
+
+            for index, (remote_path, (_, loc)) in enumerate(zip(remote_paths, remote_local_names)):
+                source = os.path.join(unpacked, remote_path.lstrip(os.sep))
+
+                destination = os.path.join(folder, loc)
+
+                if not os.path.exists(source):
+                    continue
+
+                # Like `Transport.get`, items that are retrieved onto an existing folder are put inside of it
+                if os.path.isdir(destination):
+                    destination = os.path.join(destination, os.path.basename(remote_path))
+
+                # Items that overlap with one that is still to be retrieved have to stay in place and are copied
+                copy = any(_paths_overlap(remote_path, other) for other in remote_paths[index + 1:])
+                _move_retrieved_item(source, destination, copy=copy)
+
+    finally:
+        try:
+            transport.remove(remote_archive)
+        except (IOError, OSError):
+            pass
+
+    return True
+
+
+def _is_partial_archive(retval, stderr):
+    """Return whether a `tar` command that created an archive only failed because some of the files do not exist.
+
+    :param retval: the exit status of the command
+    :param stderr: the standard error of the command
+    """
+    if retval == 1:
+        return True
+
+    messages = ('No such file or directory', 'Exiting with failure status due to previous errors')
+    lines = [line for line in stderr.splitlines() if line.strip()]
+
+    return bool(lines) and all(any(message in line for message in messages) for line in lines)
+
+
+def _is_safe_archive_member(member):
+    """Return whether a member of a retrieved archive is a file, hard link or directory that unpacks inside the target.
+
+    :param member: a :class:`tarfile.TarInfo`
+    """
+    if member.isfile() or member.isdir():
+        names = [member.name]
+    elif member.islnk():
+        names = [member.name, member.linkname]
+    else:
+        return False
+
+    for name in names:
+        name = os.path.normpath(name)
+        if os.path.isabs(name) or name == os.pardir or name.startswith(os.pardir + os.sep):
+            return False
+
+    return True
+
+
+def _paths_overlap(path, other):
+    """Return whether the two normalized absolute paths are the same or one of them contains the other."""
+    if path == other:
+        return True
+
+    return other.startswith(path.rstrip(os.sep) + os.sep) or path.startswith(other.rstrip(os.sep) + os.sep)
+
+
+def _move_retrieved_item(source, destination, copy=False):
+    """Move an unpacked file or folder to its destination, merging folders and overwriting files that already exist.
+
+    :param source: absolute path of the unpacked file or folder
+    :param destination: absolute path of the destination, on the same file system as the source
+    :param copy: copy the item instead of moving it, such that the source is left in place
+    """
+    import shutil
+
+    parent = os.path.dirname(destination)
+
+    if parent and not os.path.isdir(parent):
+        os.makedirs(parent)
+
+    if os.path.isdir(source):
+        if not copy and not os.path.exists(destination):
+            os.replace(source, destination)
+            return
+
+        if not os.path.isdir(destination):
+            os.makedirs(destination)
+
+        for name in os.listdir(source):
+            _move_retrieved_item(os.path.join(source, name), os.path.join(destination, name), copy=copy)
+    else:
+        if copy:
+            shutil.copyfile(source, destination)
+        else:
+            os.replace(source, destination)
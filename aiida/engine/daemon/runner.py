@@ -14,6 +14,7 @@ import signal
 from aiida.common.log import configure_logging
 from aiida.engine.daemon.client import get_daemon_client
 from aiida.manage.manager import get_manager
+from aiida.orm.utils.entity_cache import EntityCache
 
 LOGGER = logging.getLogger(__name__)
 
@@ -27,6 +28,11 @@ def start_daemon():
         manager = get_manager()
         runner = manager.create_daemon_runner()
         manager.set_runner(runner)
+
+        # The cache only serves the thread that creates it, which is the thread that runs the event loop of the runner
+        entity_cache_size = manager.get_config().get_option('daemon.entity_cache_size', manager.get_profile().name)
+        if entity_cache_size > 0:
+            manager.set_entity_cache(EntityCache(entity_cache_size))
     except Exception:
         LOGGER.exception('daemon runner failed to start')
         raise
@@ -10,9 +10,11 @@
 # pylint: disable=global-statement
 """Definition of AiiDA's process persister and the necessary object loaders."""
 
+import collections
 import importlib
 import logging
 import traceback
+import weakref
 
 import plumpy
 
@@ -61,8 +63,28 @@ def get_object_loader():
     return OBJECT_LOADER
 
 
+CheckpointState = collections.namedtuple('CheckpointState', ['context', 'deltas', 'deltas_size', 'size'])
+
+
 class AiiDAPersister(plumpy.Persister):
-    """Persister to take saved process instance states and persisting them to the database."""
+    """Persister to take saved process instance states and persisting them to the database.
+
+    The context of a `WorkChain` can grow large, for example when it accumulates the results of many sub processes, so
+    rewriting the complete checkpoint at every step leads to a total amount of data written that grows quadratically
+    with the number of steps. Therefore, after a complete checkpoint of a work chain, the following checkpoints are
+    stored as deltas that contain only the keys of the context that changed. The deltas are compacted into a new
+    complete checkpoint after `COMPACTION_INTERVAL` deltas, or as soon as their combined size exceeds that of the last
+    complete checkpoint.
+
+    The encoded context of the last checkpoint is kept in memory for each process instance to compute the next delta.
+    A process instance that is loaded from a checkpoint, for example by another daemon worker, therefore always starts
+    with a complete checkpoint.
+    """
+
+    COMPACTION_INTERVAL = 20
+
+    def __init__(self):
+        self._checkpoint_states = weakref.WeakKeyDictionary()
 
     def save_checkpoint(self, process, tag=None):
         """Persist a Process instance.
@@ -85,7 +107,7 @@ class AiiDAPersister(plumpy.Persister):
             )
 
         try:
-            process.node.set_checkpoint(serialize.serialize(bundle))
+            self._store_checkpoint(process, bundle)
         except Exception:
             raise plumpy.PersistenceError(
                 "Failed to store a checkpoint for '{}': {}".format(process, traceback.format_exc())
@@ -93,6 +115,45 @@ class AiiDAPersister(plumpy.Persister):
 
         return bundle
 
+    def _store_checkpoint(self, process, bundle):
+        """Store the checkpoint bundle of a process, as a delta for work chains if possible.
+
+        :param process: :class:`aiida.engine.Process`
+        :param bundle: the checkpoint bundle of the process
+        """
+        from aiida.engine.processes.workchains.workchain import WorkChain
+
+        context_key = WorkChain._CONTEXT  # pylint: disable=protected-access
+
+        if not isinstance(process, WorkChain) or not isinstance(bundle.get(context_key, None), dict):
+            process.node.set_checkpoint(serialize.serialize_checkpoint(bundle))
+            return
+
+        try:
+            context = serialize.encode_checkpoint_context(bundle[context_key])
+        except ValueError:
+            # For example a context with keys that are not strings, which can only be stored as a complete checkpoint
+            context = None
+
+        state = self._checkpoint_states.pop(process, None)
+
+        if state is None or state.deltas >= self.COMPACTION_INTERVAL or state.deltas_size > state.size:
+            state = None
+
+        if context is None or state is None:
+            checkpoint = serialize.serialize_checkpoint(bundle)
+            process.node.set_checkpoint(checkpoint)
+            if context is not None:
+                self._checkpoint_states[process] = CheckpointState(context, 0, 0, len(checkpoint))
+            return
+
+        delta = serialize.get_checkpoint_context_delta(state.context, context)
+        delta = serialize.serialize_checkpoint_delta(bundle, context_key, delta)
+        process.node.add_checkpoint_delta(delta)
+        self._checkpoint_states[process] = state._replace(
+            context=context, deltas=state.deltas + 1, deltas_size=state.deltas_size + len(delta)
+        )
+
     def load_checkpoint(self, pid, tag=None):
         """Load a process from a persisted checkpoint by its process id.
 
@@ -121,7 +182,7 @@ class AiiDAPersister(plumpy.Persister):
             raise plumpy.PersistenceError('Calculation<{}> does not have a saved checkpoint'.format(calculation.pk))
 
         try:
-            bundle = serialize.deserialize(checkpoint)
+            bundle = serialize.deserialize_checkpoint(checkpoint, calculation.checkpoint_deltas)
         except Exception:
             raise plumpy.PersistenceError(
                 'Failed to load the checkpoint for process<{}>: {}'.format(pid, traceback.format_exc())
@@ -148,10 +209,10 @@ class AiiDAPersister(plumpy.Persister):
         :param pid: the process id of the :class:`plumpy.Process`
         :param tag: optional checkpoint identifier to allow retrieving a specific sub checkpoint
         """
-        from aiida.orm import load_node
+        from aiida.manage.manager import get_manager
 
-        calc = load_node(pid)
-        calc.delete_checkpoint()
+        # Deleting the rows of the checkpoint directly avoids having to load the node
+        get_manager().get_backend().checkpoint_manager.delete(pid)
 
     def delete_process_checkpoints(self, pid):
         """Delete all persisted checkpoints related to the given process id.
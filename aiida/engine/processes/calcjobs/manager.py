@@ -8,43 +8,212 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """Module containing utilities and classes relating to job calculations running on systems that require transport."""
+import collections
 import contextlib
 import logging
+import os
+import socket
 import time
 
 from tornado import concurrent, gen
 
 from aiida.common import lang
+from aiida.schedulers.datastructures import JobInfo, JobState
 
-__all__ = ('JobsList', 'JobManager')
+__all__ = ('JobsList', 'JobManager', 'JobSubmitter', 'SharedJobStates')
+
+
+class SharedJobStates:
+    """The job states of a computer, as last retrieved from its scheduler, shared between runners through the database.
+
+    The states are stored in the settings table, together with the jobs that were covered by the scheduler query, the
+    time and duration of the query and a lease of the runner that performed it. As long as the lease is valid, the
+    other runners use the stored states instead of polling the scheduler themselves, such that the scheduler of a
+    computer is polled by a single daemon worker, independent of the number of workers. When the poller no longer polls,
+    for example because it has no more active jobs on the computer, its lease expires and another runner takes over.
+    """
+
+    KEY_TEMPLATE = 'job_states|{}'
+    DESCRIPTION = 'The job states of a computer as last retrieved from its scheduler, shared between daemon workers'
+    LEASE_INTERVALS = 3
+    RETRY_INTERVAL = 1.
+
+    def __init__(self, computer_uuid):
+        """Construct an instance for the computer with the given UUID.
+
+        :param computer_uuid: the UUID of the computer
+        """
+        self._key = self.KEY_TEMPLATE.format(computer_uuid)
+        self._poller = '{}:{}'.format(socket.gethostname(), os.getpid())
+
+    @staticmethod
+    def _connect():
+        """Return a new connection to the database, whose statements are committed independently of the session."""
+        from aiida.manage.manager import get_manager
+        return get_manager().get_backend().get_session().get_bind().connect()
+
+    def get(self):
+        """Return the shared job states, or None if they have never been stored.
+
+        The states are read through a separate connection, such that the changes committed by other runners are seen
+        regardless of the state of the session.
+
+        :return: dictionary with the keys `last_updated`, `poll_duration`, `poller`, `lease_expiry`, `authinfo_ids`,
+            `queried_jobs` and `jobs`, where the latter maps job ids onto serialized `JobInfo` instances
+        """
+        from sqlalchemy import text
+
+        with self._connect() as connection:
+            row = connection.execute(text('SELECT val FROM db_dbsetting WHERE key = :key'), key=self._key).first()
+
+        return row[0] if row is not None else None
+
+    def _write(self, insert_value, update_value, now):
+        """Write the shared job states, unless another runner holds a lease that has not yet expired.
+
+        The check of the lease and the write are a single statement, such that two runners can never both take it.
+
+        :param insert_value: the complete value to store if the states have never been stored
+        :param update_value: the keys of the stored value to update
+        :param now: the current time, with which the lease expiry of the stored states is compared
+        :return: True if the states were written, False if another runner holds the lease
+        """
+        from sqlalchemy import text
+        from aiida.common import json
+
+        statement = text(
+            'INSERT INTO db_dbsetting (key, val, description, time) '
+            'VALUES (:key, CAST(:insert_value AS JSONB), :description, NOW()) '
+            'ON CONFLICT (key) DO UPDATE SET val = db_dbsetting.val || CAST(:update_value AS JSONB), time = NOW() '
+            "WHERE db_dbsetting.val->>'poller' = :poller "
+            "OR CAST(db_dbsetting.val->>'lease_expiry' AS FLOAT) < :now "
+            'RETURNING id'
+        )
+
+        with self._connect() as connection:
+            with connection.begin():
+                result = connection.execute(
+                    statement,
+                    key=self._key,
+                    insert_value=json.dumps(insert_value),
+                    update_value=json.dumps(update_value),
+                    description=self.DESCRIPTION,
+                    poller=self._poller,
+                    now=now
+                )
+                return result.first() is not None
+
+    def acquire_lease(self, interval):
+        """Take the lease on polling the scheduler, if it is not held by another runner or has expired.
+
+        :param interval: the interval between scheduler polls of the computer
+        :return: True if this runner now holds the lease, False otherwise
+        """
+        now = time.time()
+        lease = {'poller': self._poller, 'lease_expiry': now + self.LEASE_INTERVALS * interval}
+        value = dict(lease, last_updated=0., poll_duration=0., authinfo_ids=[], queried_jobs=[], jobs={})
+        return self._write(value, lease, now)
+
+    def set(self, jobs, authinfo_ids, queried_jobs, last_updated, poll_duration, interval):
+        # pylint: disable=too-many-arguments
+        """Store the job states that were just retrieved from the scheduler and renew the lease of this runner.
+
+        :param jobs: mapping of job ids onto :py:class:`~aiida.schedulers.datastructures.JobInfo` instances
+        :param authinfo_ids: ids of the authinfos all of whose jobs were queried, by querying the jobs of their user
+        :param queried_jobs: ids of the jobs that were queried explicitly
+        :param last_updated: the time at which the scheduler query finished
+        :param poll_duration: the time in seconds it took to query the scheduler
+        :param interval: the interval between scheduler polls of the computer
+        :return: True if the states were stored, False if another runner has taken the lease in the meantime
+        """
+        value = {
+            'last_updated': last_updated,
+            'poll_duration': poll_duration,
+            'poller': self._poller,
+            'lease_expiry': last_updated + self.LEASE_INTERVALS * interval + poll_duration,
+            'authinfo_ids': list(authinfo_ids),
+            'queried_jobs': list(queried_jobs),
+            'jobs': {job_id: job_info.get_dict() for job_id, job_info in jobs.items()},
+        }
+        return self._write(value, value, time.time())
+
+    def is_leased_by_other(self, states):
+        """Return whether the given shared states are leased by another runner whose lease has not yet expired.
+
+        :param states: shared job states as returned by `get`
+        """
+        return states['poller'] != self._poller and states['lease_expiry'] > time.time()
+
+    @staticmethod
+    def covers(states, job_id, authinfo_id):
+        """Return whether the scheduler query of the given shared states covered a job.
+
+        :param states: shared job states as returned by `get`
+        :param job_id: the job id
+        :param authinfo_id: the id of the authinfo with which the job was launched
+        """
+        return job_id in states['jobs'] or job_id in states['queried_jobs'] or authinfo_id in states['authinfo_ids']
+
+    @staticmethod
+    def get_job_infos(states):
+        """Return the job infos of the given shared states.
+
+        :param states: shared job states as returned by `get`
+        :return: mapping of job ids onto :py:class:`~aiida.schedulers.datastructures.JobInfo` instances
+        """
+        return {job_id: JobInfo.load_from_dict(data) for job_id, data in states['jobs'].items()}
 
 
 class JobsList:
-    """Manager of calculation jobs submitted with a specific ``AuthInfo``, i.e. computer configured for a specific user.
+    """Manager of calculation jobs submitted to a specific ``Computer``, through one or multiple ``AuthInfo`` instances.
 
     This container of active calculation jobs is used to update their status periodically in batches, ensuring that
     even when a lot of jobs are running, the scheduler update command is not triggered for each job individually.
 
-    In addition, the :py:class:`~aiida.orm.computers.Computer` for which the :py:class:`~aiida.orm.authinfos.AuthInfo`
-    is configured, can define a minimum polling interval. This class will guarantee that the time between update calls
-    to the scheduler is larger or equal to that minimum interval.
-
-    Note that since each instance operates on a specific authinfo, the guarantees of batching scheduler update calls
-    and the limiting of number of calls per unit time, through the minimum polling interval, is only applicable for jobs
-    launched with that particular authinfo. If multiple authinfo instances with the same computer, have active jobs
-    these limitations are not respected between them, since there is no communication between ``JobsList`` instances.
+    In addition, the :py:class:`~aiida.orm.computers.Computer` can define a minimum polling interval. This class will
+    guarantee that the time between update calls to the scheduler is larger or equal to that minimum interval.
+
+    Jobs that were launched with different authinfos of the same computer, i.e. by different users, are updated with a
+    single call to the scheduler, whose results are distributed over all of them, such that the batching of scheduler
+    update calls and the minimum polling interval hold for the computer as a whole. The scheduler is queried through the
+    transport of one of the authinfos that have jobs with pending update requests, preferably the one the instance was
+    constructed with. As long as all the pending jobs belong to a single authinfo, the jobs of its user are queried if
+    the scheduler supports it, otherwise the jobs are queried explicitly by their identifier.
+
+    Between the updates, the interval is adapted to the state of the jobs. If a maximum backoff factor is configured,
+    it is increased as long as the states of the jobs do not change and reset to the minimum as soon as any do. It is
+    shortened to poll right after the first running job is expected to reach its requested wallclock time. Finally, it
+    is kept long enough that the time spent waiting for the scheduler to respond stays within a budget, defined as a
+    percentage of the interval. The interval never drops below the minimum of the computer, see
+    `get_effective_update_interval`.
+
+    If the job states are shared, the guarantees extend to all runners that share them, typically the daemon workers,
+    see :py:class:`~aiida.engine.processes.calcjobs.manager.SharedJobStates`. The runner that holds the lease then
+    queries all the active jobs of the computer in the database, including those of the other runners.
     See the :py:class:`~aiida.engine.processes.calcjobs.manager.JobManager` for example usage.
     """
 
-    def __init__(self, authinfo, transport_queue, last_updated=None):
+    # pylint: disable=too-many-instance-attributes
+
+    BACKOFF_FACTOR = 1.5
+    MAX_BACKOFF = 2
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self, authinfo, transport_queue, last_updated=None, shared=False, max_backoff=1, load_budget=0
+    ):
         """Construct an instance for the given authinfo and transport queue.
 
-        :param authinfo: The authinfo used to check the jobs list
+        :param authinfo: The authinfo used to check the jobs list, by default also for jobs of other authinfos
         :type authinfo: :class:`aiida.orm.AuthInfo`
         :param transport_queue: A transport queue
         :type: :class:`aiida.engine.transports.TransportQueue`
         :param last_updated: initialize the last updated timestamp
         :type: float
+        :param shared: if True, share the job states retrieved from the scheduler with other runners
+        :param max_backoff: the maximum factor by which the update interval is increased over the minimum interval,
+            which is capped at `MAX_BACKOFF` and disables the backoff with the default of 1
+        :param load_budget: the maximum percentage of the update interval that polling the scheduler may take, where
+            zero means no limit
         """
         lang.type_check(last_updated, float, allow_none=True)
 
@@ -53,10 +222,18 @@ class JobsList:
         self._loop = transport_queue.loop()
         self._logger = logging.getLogger(__name__)
 
+        self._authinfos = {authinfo.id: authinfo}
         self._jobs_cache = {}
         self._job_update_requests = {}  # Mapping: {job_id: Future}
+        self._job_authinfo_ids = {}  # Mapping: {job_id: authinfo id}
         self._last_updated = last_updated
         self._update_handle = None
+        self._shared_states = SharedJobStates(authinfo.computer.uuid) if shared else None
+        self._metrics = {'polls': 0, 'poll_latency': None, 'shared_hits': 0, 'shared_waits': 0, 'staleness': None}
+        self._max_backoff = min(max(max_backoff, 1), self.MAX_BACKOFF)
+        self._load_budget = load_budget
+        self._backoff = 1.
+        self._expected_end = None
 
     @property
     def logger(self):
@@ -74,6 +251,43 @@ class JobsList:
         """
         return self._authinfo.computer.get_minimum_job_poll_interval()
 
+    def get_effective_update_interval(self):
+        """Get the interval that is currently targeted between updates of the list.
+
+        This is the minimum interval multiplied by the current backoff factor, shortened such that the next update
+        happens when the first running job is expected to reach its requested wallclock time and lengthened to keep the
+        duration of the last scheduler poll within the load budget, but never smaller than the minimum interval.
+
+        :return: the effective interval
+        :rtype: float
+        """
+        minimum_interval = self.get_minimum_update_interval()
+        interval = minimum_interval * self._backoff
+
+        if self._expected_end is not None and self._last_updated is not None:
+            interval = min(interval, self._expected_end - self._last_updated)
+
+        if self._load_budget > 0 and self._metrics['poll_latency'] is not None:
+            interval = max(interval, self._metrics['poll_latency'] * 100. / self._load_budget)
+
+        return max(interval, minimum_interval)
+
+    def get_metrics(self):
+        """Return the metrics of the updates of the jobs list.
+
+        The metrics are a dictionary with the following keys:
+
+            * `polls`: the number of times the scheduler was polled by this instance
+            * `poll_latency`: the time in seconds the last poll of the scheduler took
+            * `shared_hits`: the number of updates that used job states shared by another runner
+            * `shared_waits`: the number of times an update waited for another runner to poll the scheduler
+            * `staleness`: the age in seconds of the shared job states when they were last used
+            * `update_interval`: the current effective interval between updates, see `get_effective_update_interval`
+
+        :return: dictionary of metrics
+        """
+        return dict(self._metrics, update_interval=self.get_effective_update_interval())
+
     @property
     def last_updated(self):
         """Get the timestamp of when the list was last updated as produced by `time.time()`
@@ -90,31 +304,137 @@ class JobsList:
         :return: a mapping of job ids to :py:class:`~aiida.schedulers.datastructures.JobInfo` instances
         :rtype: dict
         """
-        with self._transport_queue.request_transport(self._authinfo) as request:
+        share = self._shared_states is not None and self.get_effective_update_interval() > 0
+
+        if share:
+            try:
+                jobs_cache = yield self._get_jobs_from_shared_states()
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception('failed to read the shared job states, polling the scheduler instead')
+                jobs_cache = None
+
+            if jobs_cache is not None:
+                raise gen.Return(jobs_cache)
+
+        authinfo_ids = self._get_authinfo_ids_with_requests()
+        authinfo = self._authinfo if self._authinfo.id in authinfo_ids else self._authinfos[min(authinfo_ids)]
+
+        with self._transport_queue.request_transport(authinfo) as request:
             self.logger.info('waiting for transport')
             transport = yield request
 
-            scheduler = self._authinfo.computer.get_scheduler()
+            scheduler = authinfo.computer.get_scheduler()
             scheduler.set_transport(transport)
 
+            job_ids = self._get_jobs_with_scheduler()
+            user_ids = set()
+
+            if share:
+                # Include the jobs of the other runners that share the job states
+                for job_id, user_id in self._get_active_jobs_of_computer():
+                    user_ids.add(user_id)
+                    if job_id not in job_ids:
+                        job_ids.append(job_id)
+
+            # The jobs of other users can only be included by querying them explicitly
             kwargs = {'as_dict': True}
-            if scheduler.get_feature('can_query_by_user'):
+            if scheduler.get_feature('can_query_by_user') and len(authinfo_ids) == 1 and user_ids <= {authinfo.user.pk}:
                 kwargs['user'] = '$USER'
+                queried_authinfo_ids, queried_jobs = [authinfo.id], []
             else:
-                kwargs['jobs'] = self._get_jobs_with_scheduler()
+                kwargs['jobs'] = job_ids
+                queried_authinfo_ids, queried_jobs = [], job_ids
 
-            scheduler_response = scheduler.get_jobs(**kwargs)
+            start = time.time()
+            scheduler_response = yield self._transport_queue.run_in_executor(transport, scheduler.get_jobs, **kwargs)
 
             # Update the last update time and clear the jobs cache
             self._last_updated = time.time()
+            self._metrics['polls'] += 1
+            self._metrics['poll_latency'] = self._last_updated - start
             jobs_cache = {}
-            self.logger.info('AuthInfo<{}>: successfully retrieved status of active jobs'.format(self._authinfo.pk))
+            self.logger.info('AuthInfo<{}>: successfully retrieved status of active jobs'.format(authinfo.pk))
 
             for job_id, job_info in scheduler_response.items():
                 jobs_cache[job_id] = job_info
 
+            if share:
+                try:
+                    stored = self._shared_states.set(
+                        jobs_cache, queried_authinfo_ids, queried_jobs, self._last_updated,
+                        self._metrics['poll_latency'], self.get_effective_update_interval()
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    self.logger.exception('failed to store the shared job states')
+                else:
+                    if not stored:
+                        self.logger.info('not storing the job states, another runner has taken over the lease')
+
             raise gen.Return(jobs_cache)
 
+    @gen.coroutine
+    def _get_jobs_from_shared_states(self):
+        """Get the current jobs list from the job states shared by another runner, if they are recent enough.
+
+        As long as another runner holds the lease on the shared job states, this waits until that runner has polled the
+        scheduler again, if the current shared job states are outdated or do not cover all the jobs with pending update
+        requests. Otherwise, this runner takes the lease and polls the scheduler itself.
+
+        :return: a mapping of job ids to :py:class:`~aiida.schedulers.datastructures.JobInfo` instances, or None if this
+            runner should poll the scheduler itself
+        """
+        interval = self.get_effective_update_interval()
+
+        while True:
+            states = self._shared_states.get()
+
+            if states is None:
+                if self._shared_states.acquire_lease(interval):
+                    raise gen.Return(None)
+                self._metrics['shared_waits'] += 1
+                yield gen.sleep(min(interval, SharedJobStates.RETRY_INTERVAL))
+                continue
+
+            staleness = time.time() - states['last_updated']
+            covered = all(
+                self._shared_states.covers(states, job_id, self._job_authinfo_ids[job_id])
+                for job_id, request in self._job_update_requests.items()
+                if not request.done()
+            )
+
+            if staleness < interval and covered:
+                self._last_updated = states['last_updated']
+                self._metrics['shared_hits'] += 1
+                self._metrics['staleness'] = staleness
+                self.logger.info('using the job states retrieved by {}'.format(states['poller']))
+                raise gen.Return(self._shared_states.get_job_infos(states))
+
+            if not self._shared_states.is_leased_by_other(states) and self._shared_states.acquire_lease(interval):
+                raise gen.Return(None)
+
+            self._metrics['shared_waits'] += 1
+            yield gen.sleep(min(interval, SharedJobStates.RETRY_INTERVAL))
+
+    def _get_active_jobs_of_computer(self):
+        """Return the jobs of all calculation jobs of the computer that are active and have been submitted.
+
+        :return: list of tuples of the job id and the id of the user of the calculation job
+        """
+        from aiida.orm import CalcJobNode, QueryBuilder
+
+        filters = {
+            'dbcomputer_id': self._authinfo.computer.id,
+            'attributes.process_state': {
+                'in': ['created', 'waiting', 'running']
+            },
+            'attributes': {
+                'has_key': 'job_id'
+            },
+        }
+        builder = QueryBuilder().append(CalcJobNode, filters=filters, project=['attributes.job_id', 'user_id'])
+
+        return [(str(job_id), user_id) for job_id, user_id in builder.iterall() if job_id is not None]
+
     @gen.coroutine
     def _update_job_info(self):
         """Update all of the job information objects.
@@ -122,15 +442,20 @@ class JobsList:
         This will set the futures for all pending update requests where the corresponding job has a new status compared
         to the last update.
         """
+        # Requests that come in while the update is in progress may not be covered by it, so only resolve these
+        requests = dict(self._job_update_requests)
+
         try:
             if not self._update_requests_outstanding():
                 return
 
             # Update our cache of the job states
+            previous_jobs_cache = self._jobs_cache
             self._jobs_cache = yield self._get_jobs_from_scheduler()
+            self._adapt_update_interval(requests, previous_jobs_cache)
         except Exception as exception:
             # Set the exception on all the update futures
-            for future in self._job_update_requests.values():
+            for future in requests.values():
                 if not future.done():
                     future.set_exception(exception)
 
@@ -142,23 +467,34 @@ class JobsList:
 
             raise
         else:
-            for job_id, future in self._job_update_requests.items():
+            for job_id, future in requests.items():
                 if not future.done():
                     future.set_result(self._jobs_cache.get(job_id, None))
         finally:
-            self._job_update_requests = {}
+            self._job_update_requests = {
+                job_id: future for job_id, future in self._job_update_requests.items() if job_id not in requests
+            }
+            self._job_authinfo_ids = {job_id: self._job_authinfo_ids[job_id] for job_id in self._job_update_requests}
 
     @contextlib.contextmanager
-    def request_job_info_update(self, job_id):
+    def request_job_info_update(self, job_id, authinfo=None):
         """Request job info about a job when the job next changes state.
 
         If the job is not found in the jobs list at the update, the future will resolve to `None`.
 
         :param job_id: job identifier
+        :param authinfo: the authinfo with which the job was launched, by default the one of this instance. It should
+            be configured for the same computer.
         :return: future that will resolve to a `JobInfo` object when the job changes state
         """
+        if authinfo is None:
+            authinfo = self._authinfo
+
+        self._authinfos.setdefault(authinfo.id, authinfo)
+
         # Get or create the future
         request = self._job_update_requests.setdefault(job_id, concurrent.Future())
+        self._job_authinfo_ids.setdefault(job_id, authinfo.id)
         assert not request.done(), 'Expected pending job info future, found in done state.'
 
         try:
@@ -187,6 +523,40 @@ class JobsList:
         if self._update_handle is None:
             self._update_handle = self._loop.call_later(self._get_next_update_delay(), updating)
 
+    def _adapt_update_interval(self, job_ids, previous_jobs_cache):
+        """Adapt the update interval to the changes of the states of the given jobs in the last update.
+
+        The backoff is reset as soon as any job in the list changes state, including jobs that appear or disappear.
+
+        :param job_ids: the ids of the jobs for which the update was requested
+        :param previous_jobs_cache: the jobs cache before the last update
+        """
+        changed = any(
+            self._has_job_state_changed(previous_jobs_cache.get(job_id, None), self._jobs_cache.get(job_id, None))
+            for job_id in set(job_ids).union(previous_jobs_cache, self._jobs_cache)
+        )
+
+        if changed:
+            self._backoff = 1.
+        else:
+            self._backoff = min(self._backoff * self.BACKOFF_FACTOR, self._max_backoff)
+
+        self._expected_end = None
+
+        for job_id in job_ids:
+            job_info = self._jobs_cache.get(job_id, None)
+
+            if job_info is None or job_info.job_state != JobState.RUNNING:
+                continue
+
+            requested = job_info.get('requested_wallclock_time_seconds', None)
+            elapsed = job_info.get('wallclock_time_seconds', None)
+
+            if requested is not None and elapsed is not None:
+                expected_end = self._last_updated + max(requested - elapsed, 0)
+                if self._expected_end is None or expected_end < self._expected_end:
+                    self._expected_end = expected_end
+
     @staticmethod
     def _has_job_state_changed(old, new):
         """Return whether the states `old` and `new` are different.
@@ -207,8 +577,8 @@ class JobsList:
     def _get_next_update_delay(self):
         """Calculate when we are next allowed to poll the scheduler.
 
-        This delay is calculated as the minimum polling interval defined by the authentication info for this instance,
-        minus time elapsed since the last update.
+        This delay is calculated as the effective update interval, which is at least the minimum polling interval
+        defined by the computer of the authentication info for this instance, minus time elapsed since the last update.
 
         :return: delay (in seconds) after which the scheduler may be polled again
         :rtype: float
@@ -217,17 +587,28 @@ class JobsList:
             # Never updated, so do it straight away
             return 0.
 
-        # Make sure to actually 'get' the minimum interval here, in case the user changed since last time
-        minimum_interval = self.get_minimum_update_interval()
+        # Make sure to actually 'get' the interval here, in case the user changed the minimum since last time
+        interval = self.get_effective_update_interval()
         elapsed = time.time() - self.last_updated
 
-        delay = max(minimum_interval - elapsed, 0.)
+        delay = max(interval - elapsed, 0.)
 
         return delay
 
     def _update_requests_outstanding(self):
         return any(not request.done() for request in self._job_update_requests.values())
 
+    def _get_authinfo_ids_with_requests(self):
+        """Return the ids of the authinfos of the jobs that have outstanding update requests.
+
+        :return: set of authinfo ids
+        """
+        return {
+            self._job_authinfo_ids[job_id]
+            for job_id, request in self._job_update_requests.items()
+            if not request.done()
+        }
+
     def _get_jobs_with_scheduler(self):
         """Get all the jobs that are currently with scheduler.
 
@@ -237,35 +618,230 @@ class JobsList:
         return [str(job_id) for job_id, _ in self._job_update_requests.items()]
 
 
+def _submit_calculations(node_pks, transport):
+    """Submit the calculation jobs with the given pks, loading their nodes in the current thread.
+
+    This is only used to submit calculation jobs in a thread of the transport executor, since ORM instances cannot be
+    shared between threads. The database connections of the thread are closed once the jobs have been submitted, which
+    would detach the nodes loaded by the event loop if it were called there.
+
+    :param node_pks: the pks of the nodes of the calculation jobs
+    :param transport: an already opened transport
+    :return: list with for each calculation job either its job id or the exception raised while submitting it
+    """
+    from aiida.engine.daemon import execmanager
+    from aiida.engine.utils import close_thread_connections
+    from aiida.orm import load_node
+
+    try:
+        return execmanager.submit_calculations([load_node(pk) for pk in node_pks], transport)
+    finally:
+        close_thread_connections()
+
+
+class JobSubmitter:
+    """Submitter of calculation jobs that were launched with a specific ``AuthInfo`` to the scheduler of its computer.
+
+    The calculation jobs that are ready to be submitted within a short window of time are collected and submitted with
+    a single remote command, see :py:meth:`~aiida.schedulers.scheduler.Scheduler.submit_from_scripts`, instead of with
+    one command per job. As soon as the maximum number of jobs per batch is reached, the batch is submitted directly.
+    The jobs of schedulers that override :py:meth:`~aiida.schedulers.scheduler.Scheduler.submit_from_script` are still
+    collected, but submitted one after the other, see :py:func:`~aiida.engine.daemon.execmanager.submit_calculations`.
+    """
+
+    def __init__(self, authinfo, transport_queue, window=0., batch_size=1):
+        """Construct an instance for the given authinfo and transport queue.
+
+        :param authinfo: The authinfo used to submit the jobs
+        :type authinfo: :class:`aiida.orm.AuthInfo`
+        :param transport_queue: A transport queue
+        :type: :class:`aiida.engine.transports.TransportQueue`
+        :param window: the time in seconds during which jobs are collected before they are submitted
+        :param batch_size: the maximum number of jobs to submit with a single remote command
+        """
+        self._authinfo = authinfo
+        self._transport_queue = transport_queue
+        self._loop = transport_queue.loop()
+        self._window = window
+        self._batch_size = max(batch_size, 1)
+        self._submission_requests = collections.OrderedDict()
+        self._submit_handle = None
+
+    @property
+    def logger(self):
+        """Return the logger configured for this instance.
+
+        :return: the logger
+        """
+        return logging.getLogger(__name__)
+
+    @contextlib.contextmanager
+    def request_job_submission(self, node):
+        """Request the submission of a calculation job.
+
+        :param node: the node that represents the calculation job
+        :type node: :class:`aiida.orm.nodes.process.calculation.calcjob.CalcJobNode`
+        :return: future that will resolve to the job id
+        :rtype: :class:`tornado.concurrent.Future`
+        """
+        if node.pk not in self._submission_requests:
+            self._submission_requests[node.pk] = (node, concurrent.Future())
+
+        _, request = self._submission_requests[node.pk]
+
+        self._ensure_submitting()
+        yield request
+
+    def _get_pending_requests(self):
+        """Return the submission requests that are still pending.
+
+        :return: list of tuples of node pk, node and future
+        """
+        return [(pk, node, request) for pk, (node, request) in self._submission_requests.items() if not request.done()]
+
+    def _ensure_submitting(self):
+        """Ensure that the pending jobs will be submitted, directly if enough of them are pending to fill a batch."""
+        if len(self._get_pending_requests()) >= self._batch_size:
+            if self._submit_handle is not None:
+                self._loop.remove_timeout(self._submit_handle)
+            self._submit_handle = self._loop.call_later(0., self._submit_jobs)
+        elif self._submit_handle is None:
+            self._submit_handle = self._loop.call_later(self._window, self._submit_jobs)
+
+    @gen.coroutine
+    def _submit_jobs(self):
+        """Submit a batch of pending jobs and set the job ids or exceptions on their submission requests."""
+        from aiida.engine.daemon import execmanager
+
+        self._submit_handle = None
+        batch = self._get_pending_requests()[:self._batch_size]
+        self._submission_requests = collections.OrderedDict(
+            (pk, (node, request)) for pk, node, request in self._get_pending_requests()[self._batch_size:]
+        )
+
+        if self._submission_requests:
+            self._ensure_submitting()
+
+        if not batch:
+            return
+
+        try:
+            with self._transport_queue.request_transport(self._authinfo) as request:
+                transport = yield request
+
+                if self._transport_queue.executor is None:
+                    results = execmanager.submit_calculations([node for _, node, _ in batch], transport)
+                else:
+                    results = yield self._transport_queue.run_in_executor(
+                        transport, _submit_calculations, [pk for pk, _, _ in batch], transport
+                    )
+        except Exception as exception:  # pylint: disable=broad-except
+            for _, _, request in batch:
+                if not request.done():
+                    request.set_exception(exception)
+        else:
+            self.logger.info('AuthInfo<{}>: submitted a batch of {} jobs'.format(self._authinfo.pk, len(batch)))
+            for (_, _, request), result in zip(batch, results):
+                if request.done():
+                    continue
+                if isinstance(result, Exception):
+                    request.set_exception(result)
+                else:
+                    request.set_result(result)
+
+
 class JobManager:
     """A manager for :py:class:`~aiida.engine.processes.calcjobs.calcjob.CalcJob` submitted to ``Computer`` instances.
 
     When a calculation job is submitted to a :py:class:`~aiida.orm.computers.Computer`, it actually uses a specific
     :py:class:`~aiida.orm.authinfos.AuthInfo`, which is a computer configured for a :py:class:`~aiida.orm.users.User`.
     The ``JobManager`` maintains a mapping of :py:class:`~aiida.engine.processes.calcjobs.manager.JobsList` instances
-    for each authinfo that has active calculation jobs. These jobslist instances are then responsible for bundling
-    scheduler updates for all the jobs they maintain (i.e. that all share the same authinfo) and update their status.
+    for each computer that has active calculation jobs. These jobslist instances are then responsible for bundling
+    scheduler updates for all the jobs they maintain (i.e. that all share the same computer, even if they were launched
+    with different authinfos) and update their status.
 
     As long as a :py:class:`~aiida.engine.runners.Runner` will create a single ``JobManager`` instance and use that for
     its lifetime, the guarantees made by the ``JobsList`` about respecting the minimum polling interval of the scheduler
     will be maintained. Note, however, that since each ``Runner`` will create its own job manager, these guarantees
-    only hold per runner.
+    only hold per runner, unless the job states are shared between runners through the database.
     """
 
-    def __init__(self, transport_queue):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        transport_queue,
+        shared=False,
+        submit_batch_window=0.,
+        submit_batch_size=1,
+        poll_max_backoff=1,
+        poll_load_budget=0
+    ):
+        """Construct a new job manager.
+
+        :param transport_queue: A transport queue
+        :type: :class:`aiida.engine.transports.TransportQueue`
+        :param shared: if True, share the job states retrieved from schedulers with other runners through the database
+        :param submit_batch_window: the time in seconds during which jobs are collected to be submitted in one batch
+        :param submit_batch_size: the maximum number of jobs to submit in one batch
+        :param poll_max_backoff: the maximum factor by which the interval between scheduler polls is increased over the
+            minimum poll interval of a computer
+        :param poll_load_budget: the maximum percentage of the interval between scheduler polls that a poll may take
+        """
         self._transport_queue = transport_queue
+        self._shared = shared
+        self._submit_batch_window = submit_batch_window
+        self._submit_batch_size = submit_batch_size
+        self._poll_max_backoff = poll_max_backoff
+        self._poll_load_budget = poll_load_budget
         self._job_lists = {}
+        self._job_submitters = {}
+
+    @property
+    def transport_queue(self):
+        """Return the transport queue used by this job manager.
+
+        :return: the transport queue
+        :rtype: :class:`aiida.engine.transports.TransportQueue`
+        """
+        return self._transport_queue
 
     def get_jobs_list(self, authinfo):
-        """Get or create a new `JobLists` instance for the given authinfo.
+        """Get or create a new `JobLists` instance for the computer of the given authinfo.
 
         :param authinfo: the `AuthInfo`
         :return: a `JobsList` instance
         """
-        if authinfo.id not in self._job_lists:
-            self._job_lists[authinfo.id] = JobsList(authinfo, self._transport_queue)
+        computer_id = authinfo.computer.id
+
+        if computer_id not in self._job_lists:
+            self._job_lists[computer_id] = JobsList(
+                authinfo,
+                self._transport_queue,
+                shared=self._shared,
+                max_backoff=self._poll_max_backoff,
+                load_budget=self._poll_load_budget
+            )
+
+        return self._job_lists[computer_id]
 
-        return self._job_lists[authinfo.id]
+    def get_job_submitter(self, authinfo):
+        """Get or create a new `JobSubmitter` instance for the given authinfo.
+
+        :param authinfo: the `AuthInfo`
+        :return: a `JobSubmitter` instance
+        """
+        if authinfo.id not in self._job_submitters:
+            self._job_submitters[
+                authinfo.id
+            ] = JobSubmitter(authinfo, self._transport_queue, self._submit_batch_window, self._submit_batch_size)
+
+        return self._job_submitters[authinfo.id]
+
+    def get_metrics(self):
+        """Return the metrics of the jobs lists of all computers, see `JobsList.get_metrics`.
+
+        :return: dictionary mapping computer ids onto dictionaries of metrics
+        """
+        return {computer_id: jobs_list.get_metrics() for computer_id, jobs_list in self._job_lists.items()}
 
     @contextlib.contextmanager
     def request_job_info_update(self, authinfo, job_id):
@@ -276,7 +852,25 @@ class JobManager:
         :return: A tuple containing the `JobInfo` object and detailed job info. Both can be None.
         :rtype: :class:`tornado.concurrent.Future`
         """
-        with self.get_jobs_list(authinfo).request_job_info_update(job_id) as request:
+        with self.get_jobs_list(authinfo).request_job_info_update(job_id, authinfo) as request:
+            try:
+                yield request
+            finally:
+                if not request.done():
+                    request.cancel()
+
+    @contextlib.contextmanager
+    def request_job_submission(self, authinfo, node):
+        """Get a future that will resolve to the job id of a calculation job once it has been submitted.
+
+        This is a context manager so that if the user leaves the context the request is automatically cancelled.
+
+        :param authinfo: the `AuthInfo` with which the calculation job was launched
+        :param node: the node that represents the calculation job
+        :return: future that will resolve to the job id
+        :rtype: :class:`tornado.concurrent.Future`
+        """
+        with self.get_job_submitter(authinfo).request_job_submission(node) as request:
             try:
                 yield request
             finally:
@@ -41,6 +41,71 @@ class PreSubmitException(Exception):
     """Raise in the `do_upload` coroutine when an exception is raised in `CalcJob.presubmit`."""
 
 
+def _call_with_node(func, node_pk, transport, *args):
+    """Call a function with the node of the given pk and a transport, loading the node in the current thread.
+
+    This is used for functions that run in a thread of the transport executor, since ORM instances cannot be shared
+    between threads. The database connections of the thread are closed once the function returns.
+
+    :param func: the function to call, taking the node and the transport as the first two arguments
+    :param node_pk: the pk of the node to pass to the function
+    :param transport: the transport to pass to the function
+    :param args: additional positional arguments for the function
+    :return: the return value of the function
+    """
+    from aiida.engine.utils import close_thread_connections
+    from aiida.orm import load_node
+
+    try:
+        return func(load_node(node_pk), transport, *args)
+    finally:
+        close_thread_connections()
+
+
+@coroutine
+def _run_with_node(transport_queue, transport, func, node, *args):
+    """Call a function that performs blocking operations with a transport for a node, without blocking the event loop.
+
+    If the transport queue has an executor, the function is run in one of its threads, where the node is reloaded.
+
+    :param transport_queue: the TransportQueue from which the transport was requested
+    :param transport: the transport that is used by the function
+    :param func: the function to call, taking the node and the transport as the first two arguments
+    :param node: the node to pass to the function
+    :param args: additional positional arguments for the function
+    :return: the return value of the function
+    """
+    if transport_queue.executor is None:
+        raise Return(func(node, transport, *args))
+
+    result = yield transport_queue.run_in_executor(transport, _call_with_node, func, node.pk, transport, *args)
+    raise Return(result)
+
+
+def _retrieve_calculation(node, transport, retrieved_temporary_folder):
+    """Set the detailed job info of a job calculation and retrieve its files.
+
+    :param node: the node that represents the job calculation
+    :param transport: an already opened transport
+    :param retrieved_temporary_folder: the absolute path to a directory to store files for temporary retrieval
+    """
+    # Perform the job accounting and set it on the node if successful. If the scheduler does not implement this
+    # still set the attribute but set it to `None`. This way we can distinguish calculation jobs for which the
+    # accounting was called but could not be set.
+    scheduler = node.computer.get_scheduler()
+    scheduler.set_transport(transport)
+
+    try:
+        detailed_job_info = scheduler.get_detailed_job_info(node.get_job_id())
+    except FeatureNotAvailable:
+        logger.info('detailed job info not available for scheduler of CalcJob<{}>'.format(node.pk))
+        node.set_detailed_job_info(None)
+    else:
+        node.set_detailed_job_info(detailed_job_info)
+
+    return execmanager.retrieve_calculation(node, transport, retrieved_temporary_folder)
+
+
 @coroutine
 def task_upload_job(process, transport_queue, cancellable):
     """Transport task that will attempt to upload the files of a job calculation to the remote.
@@ -80,7 +145,9 @@ def task_upload_job(process, transport_queue, cancellable):
                 except Exception as exception:  # pylint: disable=broad-except
                     raise PreSubmitException('exception occurred in presubmit call') from exception
                 else:
-                    execmanager.upload_calculation(node, transport, calc_info, folder)
+                    yield _run_with_node(
+                        transport_queue, transport, execmanager.upload_calculation, node, calc_info, folder
+                    )
 
             raise Return
 
@@ -104,16 +171,17 @@ def task_upload_job(process, transport_queue, cancellable):
 
 
 @coroutine
-def task_submit_job(node, transport_queue, cancellable):
+def task_submit_job(node, job_manager, cancellable):
     """Transport task that will attempt to submit a job calculation.
 
-    The task will first request a transport from the queue. Once the transport is yielded, the relevant execmanager
-    function is called, wrapped in the exponential_backoff_retry coroutine, which, in case of a caught exception, will
-    retry after an interval that increases exponentially with the number of retries, for a maximum number of retries.
-    If all retries fail, the task will raise a TransportTaskException
+    The task will request the submission of the job from the job manager, which submits the jobs that are ready to be
+    submitted with the same authinfo in batches. The request is wrapped in the exponential_backoff_retry coroutine,
+    which, in case of a caught exception, will retry after an interval that increases exponentially with the number of
+    retries, for a maximum number of retries. If all retries fail, the task will raise a TransportTaskException
 
     :param node: the node that represents the job calculation
-    :param transport_queue: the TransportQueue from which to request a Transport
+    :param job_manager: The job manager
+    :type job_manager: :class:`aiida.engine.processes.calcjobs.manager.JobManager`
     :param cancellable: the cancelled flag that will be queried to determine whether the task was cancelled
     :type cancellable: :class:`aiida.engine.utils.InterruptableFuture`
     :raises: Return if the tasks was successfully completed
@@ -131,9 +199,9 @@ def task_submit_job(node, transport_queue, cancellable):
 
     @coroutine
     def do_submit():
-        with transport_queue.request_transport(authinfo) as request:
-            transport = yield cancellable.with_interrupt(request)
-            raise Return(execmanager.submit_calculation(node, transport))
+        with job_manager.request_job_submission(authinfo, node) as request:
+            result = yield cancellable.with_interrupt(request)
+            raise Return(result)
 
     try:
         logger.info('scheduled request to submit CalcJob<{}>'.format(node.pk))
@@ -242,22 +310,10 @@ def task_retrieve_job(node, transport_queue, retrieved_temporary_folder, cancell
     def do_retrieve():
         with transport_queue.request_transport(authinfo) as request:
             transport = yield cancellable.with_interrupt(request)
-
-            # Perform the job accounting and set it on the node if successful. If the scheduler does not implement this
-            # still set the attribute but set it to `None`. This way we can distinguish calculation jobs for which the
-            # accounting was called but could not be set.
-            scheduler = node.computer.get_scheduler()
-            scheduler.set_transport(transport)
-
-            try:
-                detailed_job_info = scheduler.get_detailed_job_info(node.get_job_id())
-            except FeatureNotAvailable:
-                logger.info('detailed job info not available for scheduler of CalcJob<{}>'.format(node.pk))
-                node.set_detailed_job_info(None)
-            else:
-                node.set_detailed_job_info(detailed_job_info)
-
-            raise Return(execmanager.retrieve_calculation(node, transport, retrieved_temporary_folder))
+            result = yield _run_with_node(
+                transport_queue, transport, _retrieve_calculation, node, retrieved_temporary_folder
+            )
+            raise Return(result)
 
     try:
         logger.info('scheduled request to retrieve CalcJob<{}>'.format(node.pk))
@@ -304,7 +360,8 @@ def task_kill_job(node, transport_queue, cancellable):
     def do_kill():
         with transport_queue.request_transport(authinfo) as request:
             transport = yield cancellable.with_interrupt(request)
-            raise Return(execmanager.kill_calculation(node, transport))
+            result = yield _run_with_node(transport_queue, transport, execmanager.kill_calculation, node)
+            raise Return(result)
 
     try:
         logger.info('scheduled request to kill CalcJob<{}>'.format(node.pk))
@@ -355,7 +412,7 @@ class Waiting(plumpy.Waiting):
 
             elif command == SUBMIT_COMMAND:
                 node.set_process_status(process_status)
-                yield self._launch_task(task_submit_job, node, transport_queue)
+                yield self._launch_task(task_submit_job, node, self.process.runner.job_manager)
                 raise Return(self.update())
 
             elif self.data == UPDATE_COMMAND:
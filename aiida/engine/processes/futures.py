@@ -9,20 +9,110 @@
 ###########################################################################
 # pylint: disable=cyclic-import
 """Futures that can poll or receive broadcasted messages while waiting for a task to be completed."""
-import tornado.gen
+import logging
 
 import plumpy
 import kiwipy
 
 __all__ = ('ProcessFuture',)
 
+LOGGER = logging.getLogger(__name__)
+
+
+class ProcessPoller:
+    """Poll the database for the termination of processes, with a single query per poll interval for all of them.
+
+    Polling is the fail-safe for when the broadcast of the termination of a process is missed. Instead of querying the
+    node of each awaited process separately, which for a work chain that awaits many sub processes is a steady load of
+    queries, the poller queries which of the awaited processes are terminated in one go.
+    """
+
+    def __init__(self, loop, poll_interval):
+        """Construct a new poller.
+
+        :param loop: the event loop on which to schedule the polls
+        :type loop: :class:`tornado.ioloop.IOLoop`
+        :param poll_interval: the interval in seconds between polls
+        """
+        self._loop = loop
+        self._poll_interval = poll_interval
+        self._callbacks = {}
+        self._scheduled = False
+
+    def add_callback(self, pk, callback):
+        """Add a callback to be called once the process with the given pk is terminated.
+
+        The first poll happens as soon as the event loop gets to it, such that callbacks that are added in the same
+        iteration of the event loop are checked with a single query.
+
+        :param pk: pk of the process
+        :param callback: function without arguments
+        """
+        self._callbacks.setdefault(pk, []).append(callback)
+
+        if not self._scheduled:
+            self._scheduled = True
+            self._loop.add_callback(self._poll)
+
+    def remove_callback(self, pk, callback):
+        """Remove a callback, where no error will be raised if it was already removed.
+
+        :param pk: pk of the process
+        :param callback: the callback as passed to `add_callback`
+        """
+        callbacks = self._callbacks.get(pk, [])
+
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+        if not callbacks:
+            self._callbacks.pop(pk, None)
+
+    @staticmethod
+    def _get_terminated(pks):
+        """Return which of the processes with the given pks are terminated.
+
+        :param pks: list of process pks
+        :return: set of the pks of the terminated processes
+        """
+        from aiida.orm import ProcessNode, QueryBuilder
+        from .process import ProcessState
+
+        states = [state.value for state in [ProcessState.FINISHED, ProcessState.KILLED, ProcessState.EXCEPTED]]
+        filters = {'id': {'in': pks}, 'attributes.process_state': {'in': states}}
+        builder = QueryBuilder().append(ProcessNode, filters=filters, project=['id'])
+
+        return {pk for pk, in builder.iterall()}
+
+    def _poll(self):
+        """Call the callbacks of the processes that are terminated and schedule the next poll if need be."""
+        self._scheduled = False
+
+        if not self._callbacks:
+            return
+
+        try:
+            terminated = self._get_terminated(list(self._callbacks))
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('failed to poll the state of the awaited processes')
+            terminated = set()
+
+        for pk in terminated:
+            LOGGER.info('Process<%d> confirmed to be terminated by backup polling mechanism', pk)
+            for callback in self._callbacks.pop(pk, []):
+                self._loop.add_callback(callback)
+
+        if self._callbacks and not self._scheduled:
+            self._scheduled = True
+            self._loop.call_later(self._poll_interval, self._poll)
+
 
 class ProcessFuture(plumpy.Future):
     """Future that waits for a process to complete using both polling and listening for broadcast events if possible."""
 
     _filtered = None
 
-    def __init__(self, pk, loop=None, poll_interval=None, communicator=None):
+    def __init__(self, pk, loop=None, poll_interval=None, communicator=None, poller=None):
         """Construct a future for a process node being finished.
 
         If a None poll_interval is supplied polling will not be used. If a communicator is supplied it will be used
@@ -32,7 +122,11 @@ class ProcessFuture(plumpy.Future):
         :param loop: An event loop
         :param poll_interval: optional polling interval, if None, polling is not activated.
         :param communicator: optional communicator, if None, will not subscribe to broadcasts.
+        :param poller: optional poller to share with other futures, by default a new one is created if polling is
+            activated
+        :type poller: :class:`ProcessPoller`
         """
+        # pylint: disable=too-many-arguments
         from aiida.orm import load_node
         from .process import ProcessState
 
@@ -44,7 +138,9 @@ class ProcessFuture(plumpy.Future):
         if node.is_terminated:
             self.set_result(node)
         else:
+            self._pk = pk
             self._communicator = communicator
+            self._poller = None
             self.add_done_callback(lambda _: self.cleanup())
 
             # Try setting up a filtered broadcast subscriber
@@ -56,7 +152,9 @@ class ProcessFuture(plumpy.Future):
 
             # Start polling
             if poll_interval is not None:
-                loop.add_callback(self._poll_process, node, poll_interval)
+                self._node = node
+                self._poller = poller if poller is not None else ProcessPoller(loop, poll_interval)
+                self._poller.add_callback(pk, self._on_terminated)
 
     def cleanup(self):
         """Clean up the future by removing broadcast subscribers from the communicator if it still exists."""
@@ -65,11 +163,11 @@ class ProcessFuture(plumpy.Future):
             self._communicator = None
             self._broadcast_identifier = None
 
-    @tornado.gen.coroutine
-    def _poll_process(self, node, poll_interval):
-        """Poll whether the process node has reached a terminal state."""
-        while not self.done() and not node.is_terminated:
-            yield tornado.gen.sleep(poll_interval)
+        if self._poller is not None:
+            self._poller.remove_callback(self._pk, self._on_terminated)
+            self._poller = None
 
+    def _on_terminated(self):
+        """Set the node as the result of the future, once the poller confirmed the process to be terminated."""
         if not self.done():
-            self.set_result(node)
+            self.set_result(self._node)
@@ -21,7 +21,6 @@ import plumpy
 import tornado.ioloop
 
 from aiida.common import exceptions
-from aiida.orm import load_node
 from aiida.plugins.utils import PluginVersionProvider
 
 from .processes import futures, ProcessState
@@ -45,7 +44,17 @@ class Runner:  # pylint: disable=too-many-public-methods
     _controller = None
     _closed = False
 
-    def __init__(self, poll_interval=0, loop=None, communicator=None, rmq_submit=False, persister=None):
+    def __init__(
+        self,
+        poll_interval=0,
+        loop=None,
+        communicator=None,
+        rmq_submit=False,
+        persister=None,
+        transport_options=None,
+        job_manager_options=None,
+        state_change_interval=0
+    ):
         """Construct a new runner.
 
         :param poll_interval: interval in seconds between polling for status of active sub processes
@@ -56,16 +65,25 @@ class Runner:  # pylint: disable=too-many-public-methods
         :param rmq_submit: if True, processes will be submitted to RabbitMQ, otherwise they will be scheduled here
         :param persister: the persister to use to persist processes
         :type persister: :class:`plumpy.Persister`
+        :param transport_options: optional keyword arguments for the :class:`aiida.engine.transports.TransportQueue`
+            that configure the pooling of transports
+        :param job_manager_options: optional keyword arguments for the
+            :class:`aiida.engine.processes.calcjobs.manager.JobManager`
+        :param state_change_interval: minimum time in seconds between two updates of the global setting that reflects
+            the last time a process of a given type changed state
         """
+        # pylint: disable=too-many-arguments
         assert not (rmq_submit and persister is None), \
             'Must supply a persister if you want to submit using communicator'
 
         self._loop = loop if loop is not None else tornado.ioloop.IOLoop()
         self._poll_interval = poll_interval
         self._rmq_submit = rmq_submit
-        self._transport = transports.TransportQueue(self._loop)
-        self._job_manager = manager.JobManager(self._transport)
+        self._transport = transports.TransportQueue(self._loop, **(transport_options or {}))
+        self._job_manager = manager.JobManager(self._transport, **(job_manager_options or {}))
         self._persister = persister
+        self._state_change_timestamps = utils.ProcessStateChangeTimestamps(self._loop, state_change_interval)
+        self._process_poller = futures.ProcessPoller(self._loop, poll_interval)
         self._plugin_version_provider = PluginVersionProvider()
 
         if communicator is not None:
@@ -117,6 +135,10 @@ class Runner:  # pylint: disable=too-many-public-methods
     def job_manager(self):
         return self._job_manager
 
+    @property
+    def state_change_timestamps(self):
+        return self._state_change_timestamps
+
     @property
     def controller(self):
         return self._controller
@@ -149,6 +171,8 @@ class Runner:  # pylint: disable=too-many-public-methods
     def close(self):
         """Close the runner by stopping the loop."""
         assert not self._closed
+        self._state_change_timestamps.flush()
+        self._transport.close()
         self.stop()
         self._closed = True
 
@@ -270,12 +294,12 @@ class Runner:  # pylint: disable=too-many-public-methods
 
         This method will add a broadcast subscriber that will listen for state changes of the target process to be
         terminated. As a fail-safe, a polling-mechanism is used to check the state of the process, should the broadcast
-        message be missed by the subscriber, in order to prevent the caller to wait indefinitely.
+        message be missed by the subscriber, in order to prevent the caller to wait indefinitely. The polling is shared
+        by all processes that are awaited by this runner, such that a single query is performed per poll interval.
 
         :param pk: pk of the process
         :param callback: function to be called upon process termination
         """
-        node = load_node(pk=pk)
         subscriber_identifier = str(uuid.uuid4())
         event = threading.Event()
 
@@ -293,14 +317,16 @@ class Runner:  # pylint: disable=too-many-public-methods
             finally:
                 event.set()
                 self._communicator.remove_broadcast_subscriber(subscriber_identifier)
+                self._process_poller.remove_callback(pk, wrapped_callback)
 
-        broadcast_filter = kiwipy.BroadcastFilter(functools.partial(inline_callback, event), sender=pk)
+        wrapped_callback = functools.partial(inline_callback, event)
+        broadcast_filter = kiwipy.BroadcastFilter(wrapped_callback, sender=pk)
         for state in [ProcessState.FINISHED, ProcessState.KILLED, ProcessState.EXCEPTED]:
             broadcast_filter.add_subject_filter('state_changed.*.{}'.format(state.value))
 
         LOGGER.info('adding subscriber for broadcasts of %d', pk)
         self._communicator.add_broadcast_subscriber(broadcast_filter, subscriber_identifier)
-        self._poll_process(node, functools.partial(inline_callback, event))
+        self._process_poller.add_callback(pk, wrapped_callback)
 
     def get_process_future(self, pk):
         """Return a future for a process.
@@ -309,17 +335,4 @@ class Runner:  # pylint: disable=too-many-public-methods
 
         :return: A future representing the completion of the process node
         """
-        return futures.ProcessFuture(pk, self._loop, self._poll_interval, self._communicator)
-
-    def _poll_process(self, node, callback):
-        """Check whether the process state of the node is terminated and call the callback or reschedule it.
-
-        :param node: the process node
-        :param callback: callback to be called when process is terminated
-        """
-        if node.is_terminated:
-            args = [node.__class__.__name__, node.pk]
-            LOGGER.info('%s<%d> confirmed to be terminated by backup polling mechanism', *args)
-            self._loop.add_callback(callback)
-        else:
-            self._loop.call_later(self._poll_interval, self._poll_process, node, callback)
+        return futures.ProcessFuture(pk, self._loop, self._poll_interval, self._communicator, self._process_poller)
@@ -9,10 +9,13 @@
 ###########################################################################
 """A transport queue to batch process multiple tasks that require a Transport."""
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import contextlib
 import logging
 import traceback
-from tornado import concurrent, gen, ioloop
+import weakref
+
+from tornado import concurrent, gen, ioloop, locks
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,10 +24,14 @@ class TransportRequest:
     """ Information kept about request for a transport object """
 
     # pylint: disable=too-few-public-methods
-    def __init__(self):
+    def __init__(self, authinfo=None):
         super().__init__()
+        self.authinfo = authinfo
         self.future = concurrent.Future()
         self.count = 0
+        self.open_callback_handle = None
+        self.close_callback_handle = None
+        self.keepalive_callback_handle = None
 
 
 class TransportQueue:
@@ -37,21 +44,268 @@ class TransportQueue:
     it will open the transport and give it to all the clients that asked for it
     up to that point.  This way opening of transports (a costly operation) can
     be minimised.
+
+    The open transports of each authinfo form a pool. A transport is shared by up to `max_channels` concurrent clients
+    before an additional transport is opened, as long as there are fewer than `max_connections` transports for that
+    authinfo. Once all the clients of a transport are done, it is kept open for `idle_timeout` seconds such that it
+    can be reused by following requests, during which a keep-alive is sent every `keepalive_interval` seconds.
+
+    Operations on a transport are blocking, so when `max_workers` is larger than zero, clients should perform them
+    through `run_in_executor`, which runs them in a bounded pool of threads such that the event loop is not blocked.
     """
     AuthInfoEntry = namedtuple('AuthInfoEntry', ['authinfo', 'transport', 'callbacks', 'callback_handle'])
 
-    def __init__(self, loop=None):
+    def __init__(
+        self, loop=None, max_connections=1, max_channels=None, idle_timeout=0, keepalive_interval=0, max_workers=0
+    ):
         """
         :param loop: The event loop to use, will use `tornado.ioloop.IOLoop.current()` if not supplied
         :type loop: :class:`tornado.ioloop.IOLoop`
+        :param max_connections: the maximum number of transports that are open at the same time for each authinfo
+        :param max_channels: the number of clients that share a transport before an additional one is opened, by
+            default a single transport is shared by all clients
+        :param idle_timeout: the time in seconds an unused transport is kept open for reuse, by default it is closed
+            as soon as it is no longer used
+        :param keepalive_interval: the interval in seconds at which a keep-alive is sent over unused open transports,
+            a value of zero disables the keep-alive
+        :param max_workers: the number of threads used to run blocking transport operations, by default they are run
+            directly on the event loop
         """
+        # pylint: disable=too-many-arguments
         self._loop = loop if loop is not None else ioloop.IOLoop.current()
         self._transport_requests = {}
+        self._max_connections = max(max_connections, 1)
+        self._max_channels = max_channels
+        self._idle_timeout = idle_timeout
+        self._keepalive_interval = keepalive_interval
+        self._metrics = {}
+        self._executor = ThreadPoolExecutor(max_workers) if max_workers > 0 else None
+        self._transport_locks = weakref.WeakKeyDictionary()
 
     def loop(self):
         """ Get the loop being used by this transport queue """
         return self._loop
 
+    @property
+    def executor(self):
+        """Return the executor that runs blocking transport operations, or None if they are run on the event loop.
+
+        :return: a :class:`concurrent.futures.ThreadPoolExecutor` or None
+        """
+        return self._executor
+
+    @gen.coroutine
+    def run_in_executor(self, transport, func, *args, **kwargs):
+        """
+        Call a function that performs blocking operations with a transport in a thread of the executor.
+
+        A transport can be shared by concurrent clients and is not thread-safe, so the calls for the same transport are
+        serialized by a lock. The lock is acquired on the event loop, such that calls that are waiting for a transport
+        do not occupy a thread of the executor. If there is no executor, the function is called directly.
+
+        :param transport: the transport that is used by the function
+        :param func: the function to call
+        :param args: positional arguments for the function
+        :param kwargs: keyword arguments for the function
+        :return: the return value of the function
+        """
+        if self._executor is None:
+            raise gen.Return(func(*args, **kwargs))
+
+        lock = self._transport_locks.setdefault(transport, locks.Lock())
+
+        with (yield lock.acquire()):
+            result = yield self._executor.submit(func, *args, **kwargs)
+
+        raise gen.Return(result)
+
+    def get_metrics(self, authinfo=None):
+        """
+        Return the metrics of the transport pool.
+
+        The metrics are a dictionary with the following keys:
+
+            * `requests`: the total number of transport requests
+            * `reused`: the number of requests that were served by a transport that was already open or being opened
+            * `opened`: the number of transports that have been opened
+            * `closed`: the number of transports that have been closed
+            * `failed`: the number of transports that failed to open or that were dropped by a failing keep-alive
+            * `open`: the number of transports that are currently open or being opened
+            * `active`: the number of requests that are currently holding a transport
+
+        :param authinfo: optional authinfo to return the metrics for, by default the metrics are summed over all
+        :return: dictionary of metrics
+        """
+        if authinfo is not None:
+            return dict(self._get_metrics(authinfo.id))
+
+        metrics = self._new_metrics()
+
+        for authinfo_metrics in self._metrics.values():
+            for key, value in authinfo_metrics.items():
+                metrics[key] += value
+
+        return metrics
+
+    @staticmethod
+    def _new_metrics():
+        return {'requests': 0, 'reused': 0, 'opened': 0, 'closed': 0, 'failed': 0, 'open': 0, 'active': 0}
+
+    def _get_metrics(self, authinfo_id):
+        return self._metrics.setdefault(authinfo_id, self._new_metrics())
+
+    def _select_request(self, authinfo_id):
+        """
+        Return the request of the transport that should be used by a new client, or None if a new one should be opened.
+
+        :param authinfo_id: the id of the authinfo
+        :return: a `TransportRequest` or None
+        """
+        requests = self._transport_requests.get(authinfo_id, [])
+
+        if not requests:
+            return None
+
+        transport_request = min(requests, key=lambda request: request.count)
+
+        if self._max_channels is None or transport_request.count < self._max_channels:
+            return transport_request
+
+        if len(requests) < self._max_connections:
+            return None
+
+        return transport_request
+
+    def _remove_request(self, authinfo_id, transport_request):
+        """
+        Remove a transport request from the pool.
+
+        :param authinfo_id: the id of the authinfo
+        :param transport_request: the `TransportRequest` to remove
+        """
+        requests = self._transport_requests.get(authinfo_id, [])
+
+        if transport_request in requests:
+            requests.remove(transport_request)
+            self._get_metrics(authinfo_id)['open'] -= 1
+
+        if not requests:
+            self._transport_requests.pop(authinfo_id, None)
+
+    def _cancel_idle_callbacks(self, transport_request):
+        """Cancel the scheduled close and keep-alive of a transport that is kept open while unused."""
+        if transport_request.close_callback_handle is not None:
+            self._loop.remove_timeout(transport_request.close_callback_handle)
+            transport_request.close_callback_handle = None
+
+        if transport_request.keepalive_callback_handle is not None:
+            self._loop.remove_timeout(transport_request.keepalive_callback_handle)
+            transport_request.keepalive_callback_handle = None
+
+    def _close_transport(self, transport_request):
+        """
+        Close the transport of a request and remove it from the pool.
+
+        :param transport_request: the `TransportRequest` whose transport to close
+        """
+        authinfo = transport_request.authinfo
+        self._cancel_idle_callbacks(transport_request)
+        self._remove_request(authinfo.id, transport_request)
+
+        transport = transport_request.future.result()
+
+        if transport.is_open:
+            _LOGGER.debug('Transport request closing transport for %s', authinfo)
+            transport.close()
+
+        self._get_metrics(authinfo.id)['closed'] += 1
+
+    def _keep_alive(self, transport_request):
+        """
+        Send a keep-alive over the transport of a request, removing it from the pool if that fails.
+
+        :param transport_request: the `TransportRequest` whose transport to keep alive
+        """
+        authinfo = transport_request.authinfo
+        transport_request.keepalive_callback_handle = None
+
+        try:
+            transport_request.future.result().keep_alive()
+        except Exception as exception:  # pylint: disable=broad-except
+            _LOGGER.warning('keep-alive failed for the transport of %s, closing it: %s', authinfo, exception)
+            self._get_metrics(authinfo.id)['failed'] += 1
+
+            try:
+                self._close_transport(transport_request)
+            except Exception:  # pylint: disable=broad-except
+                pass
+        else:
+            self._schedule_keep_alive(transport_request)
+
+    def _release_idle(self, transport_request):
+        """
+        Keep the transport of a request that is no longer used open for reuse, or close it if there is no idle timeout.
+
+        :param transport_request: the `TransportRequest` that is no longer used
+        """
+        if self._idle_timeout <= 0:
+            self._close_transport(transport_request)
+            return
+
+        transport_request.close_callback_handle = self._loop.call_later(
+            self._idle_timeout, self._close_transport, transport_request
+        )
+
+        self._schedule_keep_alive(transport_request)
+
+    def _schedule_keep_alive(self, transport_request):
+        """
+        Schedule the next keep-alive for the transport of a request that is kept open while unused, if enabled.
+
+        :param transport_request: the `TransportRequest` whose transport to keep alive
+        """
+        if self._keepalive_interval > 0:
+            transport_request.keepalive_callback_handle = self._loop.call_later(
+                self._keepalive_interval, self._keep_alive, transport_request
+            )
+
+    def _open_transport(self, transport_request, transport):
+        """
+        Actually open the transport of a request, if there are still clients that want it.
+
+        :param transport_request: the `TransportRequest` whose future to resolve with the transport
+        :param transport: the transport to open
+        """
+        authinfo = transport_request.authinfo
+        metrics = self._get_metrics(authinfo.id)
+        transport_request.open_callback_handle = None
+
+        if transport_request.count > 0:
+            # The user still wants the transport so open it
+            _LOGGER.debug('Transport request opening transport for %s', authinfo)
+            try:
+                transport.open()
+            except Exception as exception:  # pylint: disable=broad-except
+                _LOGGER.error('exception occurred while trying to open transport:\n %s', exception)
+                metrics['failed'] += 1
+                transport_request.future.set_exception(exception)
+
+                # Cleanup of the stale TransportRequest with the excepted transport future
+                self._remove_request(authinfo.id, transport_request)
+            else:
+                metrics['opened'] += 1
+                transport_request.future.set_result(transport)
+
+    def close(self):
+        """Close all the transports that are kept open while unused and shut down the executor."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+        for requests in list(self._transport_requests.values()):
+            for transport_request in list(requests):
+                if transport_request.count == 0 and transport_request.future.done():
+                    self._close_transport(transport_request)
+
     @contextlib.contextmanager
     def request_transport(self, authinfo):
         """
@@ -68,38 +322,28 @@ class TransportQueue:
         :param authinfo: The authinfo to be used to get transport
         :return: A future that can be yielded to give the transport
         """
-        open_callback_handle = None
-        transport_request = self._transport_requests.get(authinfo.id, None)
+        metrics = self._get_metrics(authinfo.id)
+        metrics['requests'] += 1
+        transport_request = self._select_request(authinfo.id)
 
         if transport_request is None:
-            # There is no existing request for this transport (i.e. on this authinfo)
-            transport_request = TransportRequest()
-            self._transport_requests[authinfo.id] = transport_request
-
-            transport = authinfo.get_transport()
-            safe_open_interval = transport.get_safe_open_interval()
-
-            def do_open():
-                """ Actually open the transport """
-                if transport_request.count > 0:
-                    # The user still wants the transport so open it
-                    _LOGGER.debug('Transport request opening transport for %s', authinfo)
-                    try:
-                        transport.open()
-                    except Exception as exception:  # pylint: disable=broad-except
-                        _LOGGER.error('exception occurred while trying to open transport:\n %s', exception)
-                        transport_request.future.set_exception(exception)
-
-                        # Cleanup of the stale TransportRequest with the excepted transport future
-                        self._transport_requests.pop(authinfo.id, None)
-                    else:
-                        transport_request.future.set_result(transport)
+            # There is no existing request for this transport (i.e. on this authinfo) that can be shared
+            transport_request = TransportRequest(authinfo)
+            self._transport_requests.setdefault(authinfo.id, []).append(transport_request)
+            metrics['open'] += 1
 
             # Save the handle so that we can cancel the callback if the user no longer wants it
-            open_callback_handle = self._loop.call_later(safe_open_interval, do_open)
+            transport = authinfo.get_transport()
+            transport_request.open_callback_handle = self._loop.call_later(
+                transport.get_safe_open_interval(), self._open_transport, transport_request, transport
+            )
+        else:
+            metrics['reused'] += 1
+            self._cancel_idle_callbacks(transport_request)
 
         try:
             transport_request.count += 1
+            metrics['active'] += 1
             yield transport_request.future
         except gen.Return:
             # Have to have this special case so tornado returns are propagated up to the loop
@@ -109,13 +353,16 @@ class TransportQueue:
             raise
         finally:
             transport_request.count -= 1
+            metrics['active'] -= 1
             assert transport_request.count >= 0, 'Transport request count dropped below 0!'
             # Check if there are no longer any users that want the transport
             if transport_request.count == 0:
                 if transport_request.future.done():
-                    _LOGGER.debug('Transport request closing transport for %s', authinfo)
-                    transport_request.future.result().close()
-                elif open_callback_handle is not None:
-                    self._loop.remove_timeout(open_callback_handle)
+                    if transport_request.future.exception() is None:
+                        self._release_idle(transport_request)
+                else:
+                    if transport_request.open_callback_handle is not None:
+                        self._loop.remove_timeout(transport_request.open_callback_handle)
+                        transport_request.open_callback_handle = None
 
-                self._transport_requests.pop(authinfo.id, None)
+                    self._remove_request(authinfo.id, transport_request)
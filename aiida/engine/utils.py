@@ -213,6 +213,24 @@ def is_process_scoped():
     return Process.current() is not None
 
 
+def close_thread_connections():
+    """Close the database connections of the current thread.
+
+    This is called at the end of each function that runs in a thread of the transport executor, where the nodes are
+    loaded in a database session of that thread. For the Django backend, the connection that Django opens for the
+    thread is closed as well, since it is otherwise leaked once the thread finishes.
+    """
+    from aiida.backends import BACKEND_DJANGO
+    from aiida.manage.manager import get_manager  # pylint: disable=cyclic-import
+
+    manager = get_manager()
+    manager.get_backend().get_session().close()
+
+    if manager.get_profile().database_backend == BACKEND_DJANGO:
+        from django.db import connection
+        connection.close()
+
+
 @contextlib.contextmanager
 def loop_scope(loop):
     """
@@ -230,17 +248,103 @@ def loop_scope(loop):
         current.make_current()
 
 
+class ProcessStateChangeTimestamps:
+    """Throttled writer of the global settings that reflect the last time a process of a given type changed state.
+
+    All processes of a runner share a single setting per process type, so writing it on every state change turns it
+    into a heavily contended row when many processes run concurrently. Instead, the setting of each process type is
+    written at most once per `interval` seconds. A state change within the interval since the last write is kept in
+    memory and written at the end of the interval by a callback on the event loop, such that the setting lags behind by
+    at most `interval` seconds.
+    """
+
+    def __init__(self, loop, interval=0):
+        """Construct a new instance.
+
+        :param loop: the event loop on which to schedule the delayed writes
+        :type loop: :class:`tornado.ioloop.IOLoop`
+        :param interval: the minimum time in seconds between two writes of the setting of a process type
+        """
+        self._loop = loop
+        self._interval = interval
+        self._last_written = {}
+        self._pending = {}
+        self._handles = {}
+
+    def set(self, process_type, timestamp):
+        """Set the last time a process of the given type changed state.
+
+        :param process_type: the process type, either 'calculation' or 'work'
+        :param timestamp: the time of the state change
+        :type timestamp: :class:`datetime.datetime`
+        """
+        now = self._loop.time()
+        last_written = self._last_written.get(process_type, None)
+
+        if last_written is None or now - last_written >= self._interval:
+            self._write(process_type, timestamp)
+            return
+
+        self._pending[process_type] = timestamp
+
+        if process_type not in self._handles:
+            self._handles[process_type] = self._loop.call_at(
+                last_written + self._interval, self._write_pending, process_type
+            )
+
+    def flush(self):
+        """Write the state changes that are pending, for example before closing the runner."""
+        for process_type in list(self._pending):
+            self._write_pending(process_type)
+
+    def _write_pending(self, process_type):
+        """Write the pending state change of the given process type, if any.
+
+        :param process_type: the process type
+        """
+        handle = self._handles.pop(process_type, None)
+
+        if handle is not None:
+            self._loop.remove_timeout(handle)
+
+        if process_type in self._pending:
+            self._write(process_type, self._pending.pop(process_type))
+
+    def _write(self, process_type, timestamp):
+        """Write the setting for the last state change of the given process type.
+
+        :param process_type: the process type
+        :param timestamp: the time of the state change
+        """
+        from aiida.common import timezone
+        from aiida.common.exceptions import UniquenessError
+        from aiida.manage.manager import get_manager  # pylint: disable=cyclic-import
+
+        key = PROCESS_STATE_CHANGE_KEY.format(process_type)
+        description = PROCESS_STATE_CHANGE_DESCRIPTION.format(process_type)
+        value = timezone.datetime_to_isoformat(timestamp)
+
+        self._last_written[process_type] = self._loop.time()
+
+        try:
+            manager = get_manager()
+            manager.get_backend_manager().get_settings_manager().set(key, value, description)
+        except UniquenessError as exception:
+            LOGGER.debug('could not update the {} setting because of a UniquenessError: {}'.format(key, exception))
+
+
 def set_process_state_change_timestamp(process):
     """
     Set the global setting that reflects the last time a process changed state, for the process type
     of the given process, to the current timestamp. The process type will be determined based on
     the class of the calculation node it has as its database container.
 
+    .. note:: the setting is written through the :class:`ProcessStateChangeTimestamps` of the runner of the process,
+        which throttles the writes, so it can lag behind the actual state change by up to the configured interval
+
     :param process: the Process instance that changed its state
     """
     from aiida.common import timezone
-    from aiida.common.exceptions import UniquenessError
-    from aiida.manage.manager import get_manager  # pylint: disable=cyclic-import
     from aiida.orm import ProcessNode, CalculationNode, WorkflowNode
 
     if isinstance(process.node, CalculationNode):
@@ -253,15 +357,7 @@ def set_process_state_change_timestamp(process):
     else:
         raise ValueError('unsupported calculation node type {}'.format(type(process.node)))
 
-    key = PROCESS_STATE_CHANGE_KEY.format(process_type)
-    description = PROCESS_STATE_CHANGE_DESCRIPTION.format(process_type)
-    value = timezone.datetime_to_isoformat(timezone.now())
-
-    try:
-        manager = get_manager()
-        manager.get_backend_manager().get_settings_manager().set(key, value, description)
-    except UniquenessError as exception:
-        process.logger.debug('could not update the {} setting because of a UniquenessError: {}'.format(key, exception))
+    process.runner.state_change_timestamps.set(process_type, timezone.now())
 
 
 def get_process_state_change_timestamp(process_type=None):
@@ -17,6 +17,8 @@ DEFAULT_DAEMON_WORKERS = 1
 DEFAULT_DAEMON_TIMEOUT = 20  # Default timeout in seconds for circus client calls
 DEFAULT_DAEMON_WORKER_PROCESS_SLOTS = 200
 VALID_LOG_LEVELS = ['CRITICAL', 'ERROR', 'WARNING', 'REPORT', 'INFO', 'DEBUG']
+VALID_REPOSITORY_BACKENDS = ['folder', 'objectstore']
+VALID_ARCHIVE_FORMATS = ['none', 'tar', 'gzip']
 
 Option = collections.namedtuple(
     'Option', ['name', 'key', 'valid_type', 'valid_values', 'default', 'description', 'global_only']
@@ -31,6 +33,62 @@ CONFIG_OPTIONS = {
         'description': 'The polling interval in seconds to be used by process runners',
         'global_only': False,
     },
+    'runner.job_poll.shared': {
+        'key': 'runner_job_poll_shared',
+        'valid_type': 'bool',
+        'valid_values': None,
+        'default': False,
+        'description': 'Whether runners share the job states they retrieve from schedulers through the database, such '
+        'that only a single daemon worker polls the scheduler of each computer',
+        'global_only': False,
+    },
+    'runner.job_poll.max_backoff': {
+        'key': 'runner_job_poll_max_backoff',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 1,
+        'description': 'The maximum factor, of at most 2, by which runners increase the interval between scheduler '
+        'polls of a computer over its minimum job poll interval, while the states of its jobs do not change. The '
+        'default of 1 disables the backoff',
+        'global_only': False,
+    },
+    'runner.job_poll.load_budget': {
+        'key': 'runner_job_poll_load_budget',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 10,
+        'description': 'The maximum percentage of the interval between scheduler polls of a computer that runners '
+        'allow a poll to take, such that slowly responding schedulers are polled less often. Set to 0 for no limit',
+        'global_only': False,
+    },
+    'runner.submit.batch_window': {
+        'key': 'runner_submit_batch_window',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 0,
+        'description': 'The time in seconds during which runners collect the calculation jobs that are ready to be '
+        'submitted with the same authinfo, to submit them to the scheduler with a single remote command. The default '
+        'of 0 only batches the jobs that are ready at the same time',
+        'global_only': False,
+    },
+    'runner.submit.batch_size': {
+        'key': 'runner_submit_batch_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 50,
+        'description': 'The maximum number of calculation jobs that runners submit to the scheduler with a single '
+        'remote command',
+        'global_only': False,
+    },
+    'runner.state_change.interval': {
+        'key': 'runner_state_change_interval',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 10,
+        'description': 'The minimum time in seconds between two updates by a runner of the global setting with the '
+        'last time a process changed state, as shown by `verdi process list`',
+        'global_only': False,
+    },
     'daemon.default_workers': {
         'key': 'daemon_default_workers',
         'valid_type': 'int',
@@ -55,6 +113,15 @@ CONFIG_OPTIONS = {
         'description': 'The maximum number of concurrent process tasks that each daemon worker can handle',
         'global_only': False,
     },
+    'daemon.entity_cache_size': {
+        'key': 'daemon_entity_cache_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 2000,
+        'description': 'The maximum number of stored data nodes, computers and authinfos that each daemon worker keeps '
+        'in memory, to avoid loading them from the database repeatedly. Set to 0 to disable the cache',
+        'global_only': False,
+    },
     'db.batch_size': {
         'key': 'db_batch_size',
         'valid_type': 'int',
@@ -65,6 +132,116 @@ CONFIG_OPTIONS = {
         '(1GB) when creating large numbers of database records in one go.',
         'global_only': False,
     },
+    'db.fetch_size': {
+        'key': 'db_fetch_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 1000,
+        'description': 'Maximum number of rows fetched per round trip from the server side cursor through which the '
+        'QueryBuilder streams the results of `iterall` and `iterdict`. The number of rows per round trip starts from '
+        'a single row and grows up to this value, which is capped at 1000.',
+        'global_only': False,
+    },
+    'db.query_cache_size': {
+        'key': 'db_query_cache_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 0,
+        'description': 'The maximum number of QueryBuilder results to cache, which are returned again until they '
+        'expire, even if the database changed in the meantime. Set to 0 to disable the cache',
+        'global_only': False,
+    },
+    'db.query_cache_ttl': {
+        'key': 'db_query_cache_ttl',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 10,
+        'description': 'The time in seconds after which a cached QueryBuilder result expires, which is the maximum '
+        'time for which a returned result may be out of date. Set to 0 to disable the cache',
+        'global_only': False,
+    },
+    'db.compiled_query_cache_size': {
+        'key': 'db_compiled_query_cache_size',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 256,
+        'description': 'The maximum number of queries built by the QueryBuilder that are kept in memory, to be reused '
+        'by structurally identical queries. Set to 0 to disable the cache',
+        'global_only': False,
+    },
+    'repository.backend': {
+        'key': 'repository_backend',
+        'valid_type': 'string',
+        'valid_values': VALID_REPOSITORY_BACKENDS,
+        'default': 'folder',
+        'description': 'Backend used to write the file repository of newly stored nodes: `folder` writes one sharded '
+        'directory per node, `objectstore` writes deduplicated objects to a content-addressable object store.',
+        'global_only': False,
+    },
+    'transport.pool.max_connections': {
+        'key': 'transport_pool_max_connections',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 1,
+        'description': 'The maximum number of transports that a runner keeps open at the same time for each computer '
+        'and user',
+        'global_only': False,
+    },
+    'transport.pool.max_channels': {
+        'key': 'transport_pool_max_channels',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 8,
+        'description': 'The number of concurrent tasks that share an open transport before an additional transport is '
+        'opened, as long as the maximum number of connections has not been reached',
+        'global_only': False,
+    },
+    'transport.pool.idle_timeout': {
+        'key': 'transport_pool_idle_timeout',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 60,
+        'description': 'The time in seconds that a runner keeps an unused transport open, such that it can be reused '
+        'without opening a new connection. Set to 0 to close transports as soon as they are unused',
+        'global_only': False,
+    },
+    'transport.pool.keepalive_interval': {
+        'key': 'transport_pool_keepalive_interval',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 15,
+        'description': 'The interval in seconds at which a keep-alive is sent over unused transports that are kept '
+        'open. Set to 0 to disable the keep-alive',
+        'global_only': False,
+    },
+    'transport.executor.max_workers': {
+        'key': 'transport_executor_max_workers',
+        'valid_type': 'int',
+        'valid_values': None,
+        'default': 0,
+        'description': 'The number of threads that a runner uses to perform blocking transport operations, such as '
+        'uploading and retrieving files, without blocking its event loop, where each thread holds its own database '
+        'connection. Set to 0, the default, to perform them on the event loop',
+        'global_only': False,
+    },
+    'transport.upload.archive': {
+        'key': 'transport_upload_archive',
+        'valid_type': 'string',
+        'valid_values': VALID_ARCHIVE_FORMATS,
+        'default': 'tar',
+        'description': 'Archive format in which the input files of a calculation are streamed to the remote to upload '
+        'them in one go, `gzip` compresses the archive. Set to `none` to upload the files one by one',
+        'global_only': False,
+    },
+    'transport.retrieve.archive': {
+        'key': 'transport_retrieve_archive',
+        'valid_type': 'string',
+        'valid_values': VALID_ARCHIVE_FORMATS,
+        'default': 'tar',
+        'description': 'Archive format in which the files of a calculation are packed on the remote to retrieve them '
+        'in one go, `gzip` compresses the archive. Set to `none` to retrieve the files one by one',
+        'global_only': False,
+    },
     'verdi.shell.auto_import': {
         'key': 'verdi_shell_auto_import',
         'valid_type': 'string',
@@ -23,10 +23,12 @@ DEFAULT_CONFIG_FILE_NAME = 'config.json'
 DEFAULT_CONFIG_INDENT_SIZE = 4
 DEFAULT_DAEMON_DIR_NAME = 'daemon'
 DEFAULT_DAEMON_LOG_DIR_NAME = 'log'
+DEFAULT_OBJECTSTORE_INDEX_DIR_NAME = 'objectstore'
 
 AIIDA_CONFIG_FOLDER = None
 DAEMON_DIR = None
 DAEMON_LOG_DIR = None
+OBJECTSTORE_INDEX_DIR = None
 
 
 def create_instance_directories():
@@ -80,6 +82,7 @@ def set_configuration_directory():
     global AIIDA_CONFIG_FOLDER
     global DAEMON_DIR
     global DAEMON_LOG_DIR
+    global OBJECTSTORE_INDEX_DIR
 
     environment_variable = os.environ.get(DEFAULT_AIIDA_PATH_VARIABLE, None)
 
@@ -105,6 +108,7 @@ def set_configuration_directory():
 
     DAEMON_DIR = os.path.join(AIIDA_CONFIG_FOLDER, DEFAULT_DAEMON_DIR_NAME)
     DAEMON_LOG_DIR = os.path.join(DAEMON_DIR, DEFAULT_DAEMON_LOG_DIR_NAME)
+    OBJECTSTORE_INDEX_DIR = os.path.join(AIIDA_CONFIG_FOLDER, DEFAULT_OBJECTSTORE_INDEX_DIR_NAME)
 
     create_instance_directories()
 
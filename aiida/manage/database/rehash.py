@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Functions to recompute the hashes of nodes in the database in batches, optionally using multiple processes."""
+import collections
+
+from aiida.common import exceptions
+
+__all__ = ('rehash_nodes', 'get_rehash_checkpoint', 'delete_rehash_checkpoint')
+
+REHASH_CHECKPOINT_KEY = 'rehash|checkpoint'
+REHASH_CHECKPOINT_DESCRIPTION = 'The primary key of the last node that was rehashed by an interrupted rehash'
+
+
+def get_rehash_checkpoint():
+    """Return the primary key of the last node that was processed by a previous, interrupted rehash.
+
+    :return: the primary key or None if there is no checkpoint
+    """
+    from aiida.manage.manager import get_manager
+
+    try:
+        return get_manager().get_backend_manager().get_settings_manager().get(REHASH_CHECKPOINT_KEY).value
+    except exceptions.NotExistent:
+        return None
+
+
+def set_rehash_checkpoint(pk):
+    """Store the primary key of the last node that was processed, such that the rehash can be resumed from there.
+
+    :param pk: the primary key of the last rehashed node
+    """
+    from aiida.manage.manager import get_manager
+    get_manager().get_backend_manager().get_settings_manager().set(
+        REHASH_CHECKPOINT_KEY, pk, REHASH_CHECKPOINT_DESCRIPTION
+    )
+
+
+def delete_rehash_checkpoint():
+    """Delete the rehash checkpoint, if it exists."""
+    from aiida.manage.manager import get_manager
+
+    try:
+        get_manager().get_backend_manager().get_settings_manager().delete(REHASH_CHECKPOINT_KEY)
+    except exceptions.NotExistent:
+        pass
+
+
+def iterate_pk_batches(entry_point, pks=None, start=None, batch_size=1000):
+    """Yield batches of primary keys of the nodes to rehash, in ascending order.
+
+    The batches are retrieved one at a time with keyset pagination, so the primary keys of all nodes never have to be
+    kept in memory at once.
+
+    :param entry_point: node class or tuple of node classes to which the nodes should belong
+    :param pks: optional list of primary keys to restrict the nodes to
+    :param start: optional primary key, only nodes with a primary key greater than this one are yielded
+    :param batch_size: the maximum number of primary keys per batch
+    :return: generator of lists of primary keys
+    """
+    from aiida.orm import QueryBuilder
+
+    last = start
+
+    while True:
+        filters = []
+
+        if pks is not None:
+            filters.append({'in': pks})
+
+        if last is not None:
+            filters.append({'>': last})
+
+        builder = QueryBuilder()
+        builder.append(entry_point, tag='node', project='id', filters={'id': {'and': filters}} if filters else None)
+        builder.order_by({'node': {'id': 'asc'}})
+        builder.limit(batch_size)
+
+        batch = [pk for pk, in builder.iterall()]
+
+        if not batch:
+            return
+
+        yield batch
+        last = batch[-1]
+
+
+def compute_hashes(pks):
+    """Compute the hashes of the nodes with the given primary keys.
+
+    :param pks: list of primary keys
+    :return: list of tuples of primary key and hash
+    """
+    from aiida.orm import Node, QueryBuilder
+
+    builder = QueryBuilder().append(Node, filters={'id': {'in': pks}})
+
+    return [(node.pk, node.get_hash()) for node, in builder.iterall()]
+
+
+def store_hashes(hashes):
+    """Store the given hashes in the extras of the corresponding nodes with a single bulk update.
+
+    :param hashes: list of tuples of primary key and hash, where the hash may be None if it could not be computed
+    """
+    from aiida.manage.manager import get_manager
+    from aiida.orm.nodes.node import _HASH_EXTRA_KEY
+
+    if not hashes:
+        return
+
+    values = []
+
+    for pk, hashkey in hashes:
+        if hashkey is not None and not hashkey.isalnum():
+            raise ValueError('invalid hash `{}` for node<{}>'.format(hashkey, pk))
+        values.append('({}, {})'.format(int(pk), 'NULL' if hashkey is None else "'{}'".format(hashkey)))
+
+    # The `RETURNING` clause is there because `execute_raw` always fetches the results of the query
+    query = """
+        UPDATE db_dbnode SET extras = COALESCE(extras, '{{}}') || jsonb_build_object('{key}', hashes.hashkey)
+        FROM (VALUES {values}) AS hashes (id, hashkey)
+        WHERE db_dbnode.id = hashes.id
+        RETURNING db_dbnode.id
+    """.format(key=_HASH_EXTRA_KEY, values=', '.join(values))
+
+    get_manager().get_backend().execute_raw(query)
+
+
+def _initialize_worker(config_folder, profile_name):
+    """Load the profile in a worker process of the pool.
+
+    :param config_folder: the configuration folder of the parent process
+    :param profile_name: the name of the profile that is loaded in the parent process
+    """
+    from aiida.manage.configuration import load_profile, settings
+
+    settings.AIIDA_CONFIG_FOLDER = config_folder
+    load_profile(profile_name)
+
+
+def rehash_nodes(entry_point, pks=None, processes=1, batch_size=1000, resume=False):
+    """Recompute and store the hashes of nodes in batches, while keeping a checkpoint to resume from when interrupted.
+
+    The nodes are processed in order of ascending primary key. After the hashes of a batch have been stored, the primary
+    key of the last node in the batch is stored as a checkpoint in the settings table. When `resume` is True, only the
+    nodes after the checkpoint are processed. The checkpoint is removed once all nodes have been rehashed.
+
+    When more than one process is requested, the hashes are computed by a pool of worker processes, while the bulk
+    updates of the extras and the checkpoint are written by the calling process, such that the checkpoint is always
+    consistent with the hashes that have actually been stored.
+
+    :param entry_point: node class or tuple of node classes to which the nodes should belong
+    :param pks: optional list of primary keys to restrict the nodes to
+    :param processes: the number of processes to use to compute the hashes
+    :param batch_size: the number of nodes per batch
+    :param resume: if True, resume from the checkpoint of a previous rehash, if any
+    :return: generator that yields the number of nodes rehashed in each batch
+    """
+    import multiprocessing
+
+    from aiida.manage.configuration import get_config, get_profile
+
+    start = get_rehash_checkpoint() if resume else None
+    batches = iterate_pk_batches(entry_point, pks=pks, start=start, batch_size=batch_size)
+
+    if processes > 1:
+        context = multiprocessing.get_context('spawn')
+        initargs = (get_config().dirpath, get_profile().name)
+        pool = context.Pool(processes, initializer=_initialize_worker, initargs=initargs)
+    else:
+        pool = None
+
+    try:
+        # Keep a bounded number of batches in flight, ordered by submission, to limit the memory usage
+        pending = collections.deque()
+
+        for batch in batches:
+            if pool is None:
+                hashes = compute_hashes(batch)
+            else:
+                pending.append((batch, pool.apply_async(compute_hashes, (batch,))))
+
+                if len(pending) < 2 * processes:
+                    continue
+
+                batch, result = pending.popleft()
+                hashes = result.get()
+
+            store_hashes(hashes)
+            set_rehash_checkpoint(batch[-1])
+            yield len(batch)
+
+        while pending:
+            batch, result = pending.popleft()
+            store_hashes(result.get())
+            set_rehash_checkpoint(batch[-1])
+            yield len(batch)
+
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    delete_rehash_checkpoint()
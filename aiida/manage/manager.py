@@ -241,6 +241,79 @@ class Manager:
 
         return self._process_controller
 
+    def get_entity_cache(self):
+        """Return the cache of stored entities that is used by the ORM loaders, if it has been enabled.
+
+        :return: the entity cache or None
+        :rtype: :class:`aiida.orm.utils.entity_cache.EntityCache`
+        """
+        return self._entity_cache
+
+    def set_entity_cache(self, entity_cache):
+        """Set the cache of stored entities that is used by the ORM loaders.
+
+        :param entity_cache: the entity cache, or None to disable it
+        :type entity_cache: :class:`aiida.orm.utils.entity_cache.EntityCache`
+        """
+        self._entity_cache = entity_cache
+
+    def get_query_cache(self):
+        """Return the cache of query results that is used by the `QueryBuilder`, if it has been enabled.
+
+        The cache is enabled by setting both the `db.query_cache_size` and `db.query_cache_ttl` options of the profile
+        to a positive value, in which case it is created on first use. The options are only read once for the loaded
+        profile.
+
+        :return: the query cache or None
+        :rtype: :class:`aiida.orm.utils.query_cache.QueryCache`
+        """
+        if self._query_cache is None and not self._query_cache_disabled:
+            from aiida.orm.utils.query_cache import QueryCache
+
+            profile = self.get_profile()
+
+            if profile is None:
+                return None
+
+            config = self.get_config()
+            query_cache_size = config.get_option('db.query_cache_size', profile.name)
+            query_cache_ttl = config.get_option('db.query_cache_ttl', profile.name)
+
+            if query_cache_size > 0 and query_cache_ttl > 0:
+                self._query_cache = QueryCache(query_cache_size, query_cache_ttl)
+            else:
+                self._query_cache_disabled = True
+
+        return self._query_cache
+
+    def get_compiled_query_cache_size(self):
+        """Return the maximum number of queries built by the `QueryBuilder` that are cached for reuse.
+
+        This is the value of the `db.compiled_query_cache_size` option, which is only read once for the loaded profile.
+
+        :return: the maximum size of the cache, where 0 means that queries are not cached
+        :rtype: int
+        """
+        if self._compiled_query_cache_size is None:
+            profile = self.get_profile()
+
+            if profile is None:
+                return 0
+
+            config = self.get_config()
+            self._compiled_query_cache_size = config.get_option('db.compiled_query_cache_size', profile.name)
+
+        return self._compiled_query_cache_size
+
+    def set_query_cache(self, query_cache):
+        """Set the cache of query results that is used by the `QueryBuilder`.
+
+        :param query_cache: the query cache, or None to use the cache as configured for the profile
+        :type query_cache: :class:`aiida.orm.utils.query_cache.QueryCache`
+        """
+        self._query_cache = query_cache
+        self._query_cache_disabled = False
+
     def get_runner(self):
         """Return a runner that is based on the current profile settings and can be used globally by the code.
 
@@ -276,8 +349,37 @@ class Manager:
         config = self.get_config()
         profile = self.get_profile()
         poll_interval = 0.0 if profile.is_test_profile else config.get_option('runner.poll.interval', profile.name)
+        submit_batch_window = 0. if profile.is_test_profile else config.get_option(
+            'runner.submit.batch_window', profile.name
+        )
+
+        transport_options = {
+            'max_connections': config.get_option('transport.pool.max_connections', profile.name),
+            'max_channels': config.get_option('transport.pool.max_channels', profile.name),
+            'idle_timeout': config.get_option('transport.pool.idle_timeout', profile.name),
+            'keepalive_interval': config.get_option('transport.pool.keepalive_interval', profile.name),
+            'max_workers': config.get_option('transport.executor.max_workers', profile.name),
+        }
+
+        job_manager_options = {
+            'shared': config.get_option('runner.job_poll.shared', profile.name),
+            'submit_batch_window': submit_batch_window,
+            'submit_batch_size': config.get_option('runner.submit.batch_size', profile.name),
+            'poll_max_backoff': config.get_option('runner.job_poll.max_backoff', profile.name),
+            'poll_load_budget': config.get_option('runner.job_poll.load_budget', profile.name),
+        }
+
+        state_change_interval = 0 if profile.is_test_profile else config.get_option(
+            'runner.state_change.interval', profile.name
+        )
 
-        settings = {'rmq_submit': False, 'poll_interval': poll_interval}
+        settings = {
+            'rmq_submit': False,
+            'poll_interval': poll_interval,
+            'transport_options': transport_options,
+            'job_manager_options': job_manager_options,
+            'state_change_interval': state_change_interval,
+        }
         settings.update(kwargs)
 
         if 'communicator' not in settings:
@@ -334,6 +436,10 @@ class Manager:
         self._process_controller = None
         self._persister = None
         self._runner = None
+        self._entity_cache = None
+        self._query_cache = None
+        self._query_cache_disabled = False
+        self._compiled_query_cache_size = None
 
     def __init__(self):
         super().__init__()
@@ -346,6 +452,10 @@ class Manager:
         self._process_controller = None  # type: plumpy.RemoteProcessThreadController
         self._persister = None  # type: aiida.engine.persistence.AiiDAPersister
         self._runner = None  # type: aiida.engine.runners.Runner
+        self._entity_cache = None  # type: aiida.orm.utils.entity_cache.EntityCache
+        self._query_cache = None  # type: aiida.orm.utils.query_cache.QueryCache
+        self._query_cache_disabled = False
+        self._compiled_query_cache_size = None  # type: int
 
 
 def get_manager():
@@ -564,7 +564,17 @@ class Computer(entities.Entity):
         """
         from . import authinfos
 
-        return authinfos.AuthInfo.objects(self.backend).get(dbcomputer_id=self.id, aiidauser_id=user.id)
+        cache = get_manager().get_entity_cache()
+        key = ('AuthInfo', (self.id, user.id))
+        authinfo = cache.get(key) if cache is not None else None
+
+        if authinfo is None:
+            authinfo = authinfos.AuthInfo.objects(self.backend).get(dbcomputer_id=self.id, aiidauser_id=user.id)
+
+            if cache is not None:
+                cache.add([key], authinfo, ttl=cache.ENTITY_TTL)
+
+        return authinfo
 
     def is_user_configured(self, user):
         """
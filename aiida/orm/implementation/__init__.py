@@ -12,6 +12,7 @@
 
 from .authinfos import *
 from .backends import *
+from .checkpoints import *
 from .comments import *
 from .computers import *
 from .groups import *
@@ -21,6 +22,6 @@ from .querybuilder import *
 from .users import *
 
 __all__ = (
-    authinfos.__all__ + backends.__all__ + comments.__all__ + computers.__all__ + groups.__all__ + logs.__all__ +
-    nodes.__all__ + querybuilder.__all__ + users.__all__
+    authinfos.__all__ + backends.__all__ + checkpoints.__all__ + comments.__all__ + computers.__all__ + groups.__all__ +
+    logs.__all__ + nodes.__all__ + querybuilder.__all__ + users.__all__
 )
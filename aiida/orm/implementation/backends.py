@@ -32,6 +32,15 @@ class Backend(abc.ABC):
         :rtype: :class:`aiida.orm.implementation.BackendAuthInfoCollection`
         """
 
+    @abc.abstractproperty
+    def checkpoint_manager(self):
+        """
+        Return the manager of the checkpoints of processes
+
+        :return: the checkpoint manager
+        :rtype: :class:`aiida.orm.implementation.BackendCheckpointManager`
+        """
+
     @abc.abstractproperty
     def comments(self):
         """
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Backend process checkpoint module"""
+
+import abc
+
+__all__ = ('BackendCheckpointManager',)
+
+
+class BackendCheckpointManager(abc.ABC):
+    """Storage of the checkpoints of processes in a dedicated table, keyed on the pk of their node.
+
+    The checkpoint of a process is stored as an ordered list of strings: a complete checkpoint followed by the
+    checkpoint deltas that were added since. Keeping them out of the attributes of the node means that saving a
+    checkpoint does not rewrite the attributes, and that deleting the checkpoint of a terminated process is a cheap
+    delete of rows.
+    """
+
+    def __init__(self, backend):
+        """
+        :param backend: the backend
+        :type backend: :class:`aiida.orm.implementation.Backend`
+        """
+        self._backend = backend
+
+    @abc.abstractmethod
+    def get(self, node_id):
+        """
+        Return the checkpoint of a process
+
+        :param node_id: the pk of the process node
+        :type node_id: int
+
+        :return: the complete checkpoint followed by the checkpoint deltas, or an empty list if there is no checkpoint
+        :rtype: list
+        """
+
+    @abc.abstractmethod
+    def set(self, node_id, checkpoint):
+        """
+        Set the complete checkpoint of a process, replacing its previous checkpoint and checkpoint deltas
+
+        :param node_id: the pk of the process node
+        :type node_id: int
+
+        :param checkpoint: the serialized checkpoint
+        :type checkpoint: str
+        """
+
+    @abc.abstractmethod
+    def add(self, node_id, delta):
+        """
+        Add a checkpoint delta to the checkpoint of a process
+
+        :param node_id: the pk of the process node
+        :type node_id: int
+
+        :param delta: the serialized checkpoint delta
+        :type delta: str
+        """
+
+    @abc.abstractmethod
+    def delete(self, node_id):
+        """
+        Delete the checkpoint of a process, where no error is raised if the process has no checkpoint
+
+        :param node_id: the pk of the process node
+        :type node_id: int
+        """
@@ -18,6 +18,7 @@ from aiida.backends.djsite.manager import DjangoBackendManager
 
 from ..sql import SqlBackend
 from . import authinfos
+from . import checkpoints
 from . import comments
 from . import computers
 from . import convert
@@ -36,6 +37,7 @@ class DjangoBackend(SqlBackend[models.Model]):
     def __init__(self):
         """Construct the backend instance by initializing all the collections."""
         self._authinfos = authinfos.DjangoAuthInfoCollection(self)
+        self._checkpoint_manager = checkpoints.DjangoCheckpointManager(self)
         self._comments = comments.DjangoCommentCollection(self)
         self._computers = computers.DjangoComputerCollection(self)
         self._groups = groups.DjangoGroupCollection(self)
@@ -52,6 +54,10 @@ class DjangoBackend(SqlBackend[models.Model]):
     def authinfos(self):
         return self._authinfos
 
+    @property
+    def checkpoint_manager(self):
+        return self._checkpoint_manager
+
     @property
     def comments(self):
         return self._comments
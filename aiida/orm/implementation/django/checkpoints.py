@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""The Django process checkpoint module"""
+# pylint: disable=import-error,no-name-in-module
+
+from django.db import transaction
+
+from aiida.backends.djsite.db import models
+
+from .. import BackendCheckpointManager
+
+
+class DjangoCheckpointManager(BackendCheckpointManager):
+    """Django implementation of the storage of the checkpoints of processes"""
+
+    def get(self, node_id):
+        queryset = models.DbCheckpoint.objects.filter(dbnode_id=node_id).order_by('id')
+        return list(queryset.values_list('checkpoint', flat=True))
+
+    def set(self, node_id, checkpoint):
+        with transaction.atomic():
+            models.DbCheckpoint.objects.filter(dbnode_id=node_id).delete()
+            models.DbCheckpoint.objects.create(dbnode_id=node_id, checkpoint=checkpoint)
+
+    def add(self, node_id, delta):
+        models.DbCheckpoint.objects.create(dbnode_id=node_id, checkpoint=delta)
+
+    def delete(self, node_id):
+        models.DbCheckpoint.objects.filter(dbnode_id=node_id).delete()
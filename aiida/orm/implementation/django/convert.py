@@ -15,6 +15,9 @@ try:  # Python3
 except ImportError:  # Python2
     from singledispatch import singledispatch
 
+from django.db.models.base import DEFERRED
+from sqlalchemy import inspect
+
 import aiida.backends.djsite.db.models as djmodels
 
 __all__ = ('get_backend_entity',)
@@ -151,7 +154,11 @@ def _(dbmodel, backend):
     """
     get_backend_entity for DummyModel DbNode.
     DummyModel instances are created when QueryBuilder queries the Django backend.
+
+    The `attributes` and `extras` that the query did not load are deferred on the Django model instance as well, such
+    that they are only loaded from the database when they are first accessed.
     """
+    unloaded = inspect(dbmodel).unloaded
     djnode_instance = djmodels.DbNode(
         id=dbmodel.id,
         node_type=dbmodel.node_type,
@@ -163,8 +170,8 @@ def _(dbmodel, backend):
         description=dbmodel.description,
         dbcomputer_id=dbmodel.dbcomputer_id,
         user_id=dbmodel.user_id,
-        attributes=dbmodel.attributes,
-        extras=dbmodel.extras
+        attributes=DEFERRED if 'attributes' in unloaded else dbmodel.attributes,
+        extras=DEFERRED if 'extras' in unloaded else dbmodel.extras
     )
 
     from . import nodes
@@ -534,3 +534,67 @@ class DjangoNodeCollection(BackendNodeCollection):
             models.DbNode.objects.filter(pk=pk).delete()  # pylint: disable=no-member
         except ObjectDoesNotExist:
             raise exceptions.NotExistent("Node with pk '{}' not found".format(pk))
+
+    def store_many(self, entries, with_transaction=True, clean=True):
+        """Store multiple nodes in the database, inserting the nodes and their links with batched statements.
+
+        :param entries: list of tuples of an unstored node and its links to add, where the source nodes of the links
+            have to be either stored or one of the other nodes that are being stored
+        :param with_transaction: if False, do not use a transaction because the caller will already have opened one.
+        :param clean: boolean, if True, will clean the attributes and extras before attempting to store
+        :return: list of the stored nodes
+        :raise aiida.common.ModificationNotAllowed: if one of the nodes is already stored
+        :raise aiida.common.UniquenessError: if one of the links cannot be created
+        """
+        import contextlib
+        from aiida.backends.djsite.db.models import suppress_auto_now
+        from aiida.manage.configuration import get_config_option
+
+        entries = list(entries)
+
+        for node, _ in entries:
+            type_check(node, DjangoNode)
+
+            if node.is_stored:
+                raise exceptions.ModificationNotAllowed('node<{}> is already stored'.format(node.pk))
+
+            if clean:
+                node.clean_values()
+
+        if not entries:
+            return []
+
+        dbnodes = [node.dbmodel for node, _ in entries]
+        batch_size = get_config_option('db.batch_size')
+
+        try:
+            with transaction.atomic() if with_transaction else contextlib.suppress():
+                # On PostgreSQL each batch of rows is inserted with one statement that also returns the primary keys.
+                # As in `DjangoNode.store`, a modification time that is already set is kept instead of the current time.
+                with suppress_auto_now([(models.DbNode, ['mtime'])]):
+                    preset = [dbnode for dbnode in dbnodes if dbnode.mtime]
+                    models.DbNode.objects.bulk_create(preset, batch_size=batch_size)
+
+                unset = [dbnode for dbnode in dbnodes if not dbnode.mtime]
+                models.DbNode.objects.bulk_create(unset, batch_size=batch_size)
+
+                dblinks = [
+                    models.DbLink(input_id=source.id, output_id=node.id, label=link_label, type=link_type.value)
+                    for node, links in entries
+                    for source, link_type, link_label in links or []
+                ]
+
+                try:
+                    with transaction.atomic():
+                        models.DbLink.objects.bulk_create(dblinks, batch_size=batch_size)
+                except IntegrityError as exception:
+                    raise exceptions.UniquenessError('failed to create the links: {}'.format(exception))
+        except Exception:
+            # The primary keys are set as soon as the nodes are inserted, so they have to be unset if the transaction
+            # is rolled back, or the nodes would be considered to be stored
+            if with_transaction:
+                for dbnode in dbnodes:
+                    dbnode.pk = None
+            raise
+
+        return [node for node, _ in entries]
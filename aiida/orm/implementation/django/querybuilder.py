@@ -287,6 +287,9 @@ class DjangoQueryBuilder(BackendQueryBuilder):
         if operator == '==':
             type_filter, casted_entity = cast_according_to_type(database_entity, value)
             expr = case([(type_filter, casted_entity == value)], else_=False)
+            if isinstance(value, str):
+                # The additional comparison does not change the result, but allows the use of an index on the value
+                expr = and_(casted_entity == value, expr)
         elif operator == '>':
             type_filter, casted_entity = cast_according_to_type(database_entity, value)
             expr = case([(type_filter, casted_entity > value)], else_=False)
@@ -400,3 +400,16 @@ class BackendNodeCollection(backends.BackendCollection[BackendNode]):
 
         :param pk: id of the node to delete
         """
+
+    @abc.abstractmethod
+    def store_many(self, entries, with_transaction=True, clean=True):
+        """Store multiple nodes in the database, inserting the nodes and their links with batched statements.
+
+        :param entries: list of tuples of an unstored node and its links to add, where the source nodes of the links
+            have to be either stored or one of the other nodes that are being stored
+        :param with_transaction: if False, do not use a transaction because the caller will already have opened one.
+        :param clean: boolean, if True, will clean the attributes and extras before attempting to store
+        :return: list of the stored nodes
+        :raise aiida.common.ModificationNotAllowed: if one of the nodes is already stored
+        :raise aiida.common.UniquenessError: if one of the links cannot be created
+        """
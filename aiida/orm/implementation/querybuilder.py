@@ -19,6 +19,8 @@ import abc
 import uuid
 
 # pylint: disable=no-name-in-module, import-error
+from sqlalchemy import inspect
+from sqlalchemy.orm import Load
 from sqlalchemy_utils.types.choice import Choice
 from sqlalchemy.types import Integer, Float, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import JSONB
@@ -38,6 +40,9 @@ class BackendQueryBuilder:
     outer_to_inner_schema = None
     inner_to_outer_schema = None
 
+    # The buffer of a server side cursor in SqlAlchemy 1.3 grows from a single row up to at most this many rows
+    MAX_FETCH_SIZE = 1000
+
     def __init__(self, backend):
         """
         :param backend: the backend
@@ -304,7 +309,32 @@ class BackendQueryBuilder:
             self.get_session().close()
             raise
 
-    def iterall(self, query, batch_size, tag_to_index_dict):
+    @staticmethod
+    def stream(query, batch_size, fetch_size=None):
+        """Return the query such that iterating over it streams the results if a batch size is specified.
+
+        The results are then read through a server side cursor, from which rows are fetched at most `fetch_size` at a
+        time and converted into ORM instances `batch_size` at a time, such that only a bounded number of results is ever
+        held in memory. Without a batch size, all results are fetched in a single round trip.
+
+        .. note:: SqlAlchemy starts by fetching a single row per round trip and gradually increases the number of rows
+            up to the fetch size, which is capped at `MAX_FETCH_SIZE`, since its buffer does not grow any further.
+
+        :param query: the SqlAlchemy query
+        :param int batch_size: the number of rows to convert into ORM instances at a time, if None, do not stream
+        :param int fetch_size: the maximum number of rows to fetch per round trip, by default the same as the batch
+            size, where values larger than `MAX_FETCH_SIZE` have no effect
+        :returns: the query
+        """
+        if batch_size is None:
+            return query
+
+        query = query.yield_per(batch_size)
+        fetch_size = min(fetch_size or batch_size, BackendQueryBuilder.MAX_FETCH_SIZE)
+
+        return query.execution_options(stream_results=True, max_row_buffer=fetch_size)
+
+    def iterall(self, query, batch_size, tag_to_index_dict, fetch_size=None):
         """
         :return: An iterator over all the results of a list of lists.
         """
@@ -312,7 +342,7 @@ class BackendQueryBuilder:
             if not tag_to_index_dict:
                 raise Exception('Got an empty dictionary: {}'.format(tag_to_index_dict))
 
-            results = query.yield_per(batch_size)
+            results = self.stream(query, batch_size, fetch_size)
 
             if len(tag_to_index_dict) == 1:
                 # Sqlalchemy, for some strange reason, does not return a list of lsits
@@ -333,17 +363,18 @@ class BackendQueryBuilder:
             self.get_session().close()
             raise
 
-    def iterdict(self, query, batch_size, tag_to_projected_properties_dict, tag_to_alias_map):
+    def iterdict(self, query, batch_size, tag_to_projected_properties_dict, tag_to_alias_map, fetch_size=None):
         """
         :returns: An iterator over all the results of a list of dictionaries.
         """
+        # pylint: disable=too-many-arguments
         try:
             nr_items = sum(len(v) for v in tag_to_projected_properties_dict.values())
 
             if not nr_items:
                 raise ValueError('Got an empty dictionary')
 
-            results = query.yield_per(batch_size)
+            results = self.stream(query, batch_size, fetch_size)
             if nr_items > 1:
                 for this_result in results:
                     yield {
@@ -409,3 +440,22 @@ class BackendQueryBuilder:
                     '\n'.join(alias._sa_class_manager.mapper.c.keys())  # pylint: disable=protected-access
                 )
             )
+
+    def add_entity(self, query, alias):
+        """Add the entity of the given alias to the entities returned by the query.
+
+        The `attributes` and `extras` of nodes are deferred: they can be very large and are only loaded from the
+        database when they are first accessed on a returned instance.
+
+        :param query: an instance of :class:`sqlalchemy.orm.Query`
+        :param alias: the aliased class of the entity
+        :returns: the query with the entity added
+        """
+        query = query.add_entity(alias)
+
+        mapper = getattr(inspect(alias, raiseerr=False), 'mapper', None)
+
+        if mapper is not None and issubclass(mapper.class_, self.Node):
+            query = query.options(Load(alias).defer('attributes'), Load(alias).defer('extras'))
+
+        return query
@@ -16,6 +16,7 @@ from aiida.backends.sqlalchemy.manager import SqlaBackendManager
 
 from ..sql import SqlBackend
 from . import authinfos
+from . import checkpoints
 from . import comments
 from . import computers
 from . import convert
@@ -34,6 +35,7 @@ class SqlaBackend(SqlBackend[base.Base]):
     def __init__(self):
         """Construct the backend instance by initializing all the collections."""
         self._authinfos = authinfos.SqlaAuthInfoCollection(self)
+        self._checkpoint_manager = checkpoints.SqlaCheckpointManager(self)
         self._comments = comments.SqlaCommentCollection(self)
         self._computers = computers.SqlaComputerCollection(self)
         self._groups = groups.SqlaGroupCollection(self)
@@ -50,6 +52,10 @@ class SqlaBackend(SqlBackend[base.Base]):
     def authinfos(self):
         return self._authinfos
 
+    @property
+    def checkpoint_manager(self):
+        return self._checkpoint_manager
+
     @property
     def comments(self):
         return self._comments
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""SQLA process checkpoint module"""
+# pylint: disable=import-error,no-name-in-module
+
+from aiida.backends.sqlalchemy import get_scoped_session
+from aiida.backends.sqlalchemy.models import checkpoint as models
+
+from .. import BackendCheckpointManager
+
+
+class SqlaCheckpointManager(BackendCheckpointManager):
+    """SQLA implementation of the storage of the checkpoints of processes"""
+
+    def get(self, node_id):
+        session = get_scoped_session()
+        query = session.query(models.DbCheckpoint.checkpoint).filter_by(dbnode_id=node_id)
+        return [checkpoint for checkpoint, in query.order_by(models.DbCheckpoint.id)]
+
+    def set(self, node_id, checkpoint):
+        session = get_scoped_session()
+
+        try:
+            session.query(models.DbCheckpoint).filter_by(dbnode_id=node_id).delete()
+            session.add(models.DbCheckpoint(node_id, checkpoint))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    def add(self, node_id, delta):
+        session = get_scoped_session()
+
+        try:
+            session.add(models.DbCheckpoint(node_id, delta))
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    def delete(self, node_id):
+        session = get_scoped_session()
+
+        try:
+            session.query(models.DbCheckpoint).filter_by(dbnode_id=node_id).delete()
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
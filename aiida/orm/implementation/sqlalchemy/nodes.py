@@ -550,3 +550,73 @@ class SqlaNodeCollection(BackendNodeCollection):
             session.commit()
         except NoResultFound:
             raise exceptions.NotExistent("Node with pk '{}' not found".format(pk))
+
+    def store_many(self, entries, with_transaction=True, clean=True):
+        """Store multiple nodes in the database, inserting the nodes and their links with batched statements.
+
+        :param entries: list of tuples of an unstored node and its links to add, where the source nodes of the links
+            have to be either stored or one of the other nodes that are being stored
+        :param with_transaction: if False, do not use a transaction because the caller will already have opened one.
+        :param clean: boolean, if True, will clean the attributes and extras before attempting to store
+        :return: list of the stored nodes
+        :raise aiida.common.ModificationNotAllowed: if one of the nodes is already stored
+        :raise aiida.common.UniquenessError: if one of the links cannot be created
+        """
+        session = get_scoped_session()
+        entries = list(entries)
+
+        for node, _ in entries:
+            type_check(node, SqlaNode)
+
+            if node.is_stored:
+                raise exceptions.ModificationNotAllowed('node<{}> is already stored'.format(node.pk))
+
+            if clean:
+                node.clean_values()
+
+        if not entries:
+            return []
+
+        dbnodes = [node.dbmodel for node, _ in entries]
+
+        try:
+            # Without a primary key, each row would be inserted with a separate statement that returns the generated
+            # key. Reserving all keys from the sequence in one query allows the session to batch the inserts instead.
+            sequence = '{}_id_seq'.format(models.DbNode.__tablename__)
+            pks = session.execute(
+                'SELECT nextval(:sequence) FROM generate_series(1, :count)', {
+                    'sequence': sequence,
+                    'count': len(dbnodes)
+                }
+            ).fetchall()
+
+            for dbnode, (pk,) in zip(dbnodes, pks):
+                dbnode.id = pk
+
+            session.add_all(dbnodes)
+            session.flush()
+
+            dblinks = [{
+                'input_id': source.id,
+                'output_id': node.id,
+                'label': link_label,
+                'type': link_type.value
+            } for node, links in entries for source, link_type, link_label in links or []]
+
+            if dblinks:
+                try:
+                    with session.begin_nested():
+                        session.execute(models.DbLink.__table__.insert(), dblinks)  # pylint: disable=no-member
+                except SQLAlchemyError as exception:
+                    raise exceptions.UniquenessError('failed to create the links: {}'.format(exception))
+
+            if with_transaction:
+                session.commit()
+        except Exception:
+            if with_transaction:
+                session.rollback()
+                for dbnode in dbnodes:
+                    dbnode.id = None
+            raise
+
+        return [node for node, _ in entries]
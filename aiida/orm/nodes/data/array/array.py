@@ -32,10 +32,12 @@ class ArrayData(Data):
     """
     array_prefix = 'array|'
     _cached_arrays = None
+    _cached_array_hashes = None
 
     def initialize(self):
         super().initialize()
         self._cached_arrays = {}
+        self._cached_array_hashes = {}
 
     def delete_array(self, name):
         """
@@ -49,6 +51,7 @@ class ArrayData(Data):
 
         # remove both file and attribute
         self.delete_object(fname)
+        self._cached_array_hashes.pop(name, None)
         try:
             self.delete_attribute('{}{}'.format(self.array_prefix, name))
         except (KeyError, AttributeError):
@@ -102,29 +105,67 @@ class ArrayData(Data):
         """
         Return an array stored in the node
 
+        :param name: The name of the array to return.
+        """
+        # Return with proper caching if the node is stored, otherwise always re-read from disk
+        if not self.is_stored:
+            return self._get_array_from_file(name)
+
+        if name not in self._cached_arrays:
+            self._cached_arrays[name] = self._get_array_from_file(name)
+
+        return self._cached_arrays[name]
+
+    def _get_array_from_file(self, name):
+        """Return the array stored in the .npy file of the repository, without caching it.
+
         :param name: The name of the array to return.
         """
         import numpy
 
-        def get_array_from_file(self, name):
-            """Return the array stored in a .npy file"""
-            filename = '{}.npy'.format(name)
+        filename = '{}.npy'.format(name)
 
-            if filename not in self.list_object_names():
-                raise KeyError('Array with name `{}` not found in ArrayData<{}>'.format(name, self.pk))
+        if filename not in self.list_object_names():
+            raise KeyError('Array with name `{}` not found in ArrayData<{}>'.format(name, self.pk))
 
-            # Open a handle in binary read mode as the arrays are written as binary files as well
-            with self.open(filename, mode='rb') as handle:
-                return numpy.load(handle, allow_pickle=False)  # pylint: disable=unexpected-keyword-arg
+        # Open a handle in binary read mode as the arrays are written as binary files as well
+        with self.open(filename, mode='rb') as handle:
+            return numpy.load(handle, allow_pickle=False)  # pylint: disable=unexpected-keyword-arg
 
-        # Return with proper caching if the node is stored, otherwise always re-read from disk
-        if not self.is_stored:
-            return get_array_from_file(self, name)
+    def _get_array_hash(self, name):
+        """Return the hash of an array stored in the node.
 
-        if name not in self._cached_arrays:
-            self._cached_arrays[name] = get_array_from_file(self, name)
+        The hash is computed when it is first needed and cached until the array is set again or deleted.
 
-        return self._cached_arrays[name]
+        :param name: The name of the array.
+        """
+        from aiida.common.hashing import make_hash
+
+        if name not in self._cached_array_hashes:
+            array = self._cached_arrays.get(name)
+            self._cached_array_hashes[name] = make_hash(array if array is not None else self._get_array_from_file(name))
+
+        return self._cached_array_hashes[name]
+
+    def _get_objects_to_hash(self):
+        """Return a list of objects which should be included in the hash.
+
+        The arrays are hashed directly from their data buffer instead of through the .npy files in the repository
+        folder, which are therefore ignored when hashing the folder.
+        """
+        from aiida.common.folders import Folder
+        from aiida.common.hashing import make_hash
+
+        arrays = {name: self._get_array_hash(name) for name in self.get_arraynames()}
+        ignored_folder_content = ['{}.npy'.format(name) for name in arrays]
+        objects = []
+
+        for obj in super()._get_objects_to_hash():
+            if isinstance(obj, Folder):
+                obj = [make_hash(obj, ignored_folder_content=ignored_folder_content), arrays]
+            objects.append(obj)
+
+        return objects
 
     def clear_internal_cache(self):
         """
@@ -173,6 +214,7 @@ class ArrayData(Data):
 
         # Store the array name and shape for querying purposes
         self.set_attribute('{}{}'.format(self.array_prefix, name), list(array.shape))
+        self._cached_array_hashes.pop(name, None)
 
     def _validate(self):
         """
@@ -82,6 +82,94 @@ class Node(Entity, metaclass=AbstractNodeMeta):
             self._backend.nodes.delete(node_id)
             repository.erase(force=True)
 
+        def store_many(self, nodes, with_transaction=True):
+            """Store multiple unstored nodes, including their incoming links, in bulk.
+
+            The nodes are validated and cleaned as by `Node.store`, but the nodes, their links and the manifests of
+            their repository contents are inserted with batched statements in a single transaction instead of one node
+            at a time. The incoming links of the nodes can come from stored nodes or from other nodes that are passed.
+
+            Nodes whose class customizes `Node.store` and nodes for which caching is enabled are stored one at a time
+            through `Node.store` instead, in the given order, after all other nodes have been stored.
+
+            :param nodes: list of unstored nodes
+            :param with_transaction: if False, do not use a transaction because the caller will already have opened one.
+            :return: list of the stored nodes
+            :raise aiida.common.ModificationNotAllowed: if a node is already stored or the source node of one of its
+                incoming links is neither stored nor one of the nodes that are stored in bulk
+            """
+            # pylint: disable=protected-access,too-many-branches
+            from aiida.manage.caching import get_use_cache
+
+            nodes = list(nodes)
+            bulk = []
+            single = []
+
+            for node in nodes:
+                if node.is_stored:
+                    raise exceptions.ModificationNotAllowed('Node<{}> is already stored'.format(node.pk))
+
+                # Call `validate_storability` directly and not in `_validate` in case a sub class forgets the super.
+                node.validate_storability()
+                node._validate()
+
+                if (
+                    type(node).store is not Node.store or type(node)._store is not Node._store or
+                    get_use_cache(identifier=node.process_type)
+                ):
+                    single.append(node)
+                else:
+                    bulk.append(node)
+
+            identifiers = {id(node) for node in bulk}
+
+            for node in bulk:
+                for link_triple in node._incoming_cache:
+                    if not link_triple.node.is_stored and id(link_triple.node) not in identifiers:
+                        raise exceptions.ModificationNotAllowed(
+                            'Cannot store because source node of link triple {} is not stored'.format(link_triple)
+                        )
+
+            # Setting the hash before storing saves an update for each node afterwards. This is not possible for a node
+            # whose hash depends on the hash of a source node that is not yet stored, as is the case for process nodes.
+            unhashed = []
+
+            for node in bulk:
+                node._backend_entity.clean_values()
+                node_hash = node._get_hash()
+
+                if node_hash is None:
+                    unhashed.append(node)
+                else:
+                    node._backend_entity.set_extra(_HASH_EXTRA_KEY, node_hash)
+
+            Repository.store_many([node._repository for node in bulk])
+
+            try:
+                entries = [(node.backend_entity, node._incoming_cache) for node in bulk]
+                self._backend.nodes.store_many(entries, with_transaction=with_transaction, clean=False)
+            except Exception:
+                # Put back the files in the sandbox folders since the transaction did not succeed
+                for node in bulk:
+                    node._repository.restore()
+                raise
+
+            for node in bulk:
+                node._incoming_cache = list()
+
+            for node in unhashed:
+                node._backend_entity.set_extra(_HASH_EXTRA_KEY, node.get_hash())
+
+            if autogroup.CURRENT_AUTOGROUP is not None:
+                grouped = [node for node in bulk if autogroup.CURRENT_AUTOGROUP.is_to_be_grouped(node)]
+                if grouped:
+                    autogroup.CURRENT_AUTOGROUP.get_or_create_group().add_nodes(grouped)
+
+            for node in single:
+                node.store(with_transaction=with_transaction)
+
+            return nodes
+
     # This will be set by the metaclass call
     _logger = None
 
@@ -981,7 +1069,7 @@ class Node(Entity, metaclass=AbstractNodeMeta):
     def store_all(self, with_transaction=True, use_cache=None):
         """Store the node, together with all input links.
 
-        Unstored nodes from cached incoming linkswill also be stored.
+        Unstored nodes from cached incoming links will also be stored, in bulk through `Node.Collection.store_many`.
 
         :parameter with_transaction: if False, do not use a transaction because the caller will already have opened one.
         """
@@ -997,9 +1085,13 @@ class Node(Entity, metaclass=AbstractNodeMeta):
         for link_triple in self._incoming_cache:
             link_triple.node.verify_are_parents_stored()
 
+        unstored = {}
+
         for link_triple in self._incoming_cache:
             if not link_triple.node.is_stored:
-                link_triple.node.store(with_transaction=with_transaction)
+                unstored.setdefault(id(link_triple.node), link_triple.node)
+
+        Node.objects.store_many(list(unstored.values()), with_transaction=with_transaction)  # pylint: disable=no-member
 
         return self.store(with_transaction)
 
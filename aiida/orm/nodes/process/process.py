@@ -13,6 +13,7 @@ import enum
 
 from plumpy import ProcessState
 
+from aiida.common import exceptions
 from aiida.common.links import LinkType
 from aiida.common.lang import classproperty
 from aiida.orm.utils.mixins import Sealable
@@ -34,7 +35,6 @@ class ProcessNode(Sealable, Node):
     """
     # pylint: disable=too-many-public-methods,abstract-method
 
-    CHECKPOINT_KEY = 'checkpoints'
     EXCEPTION_KEY = 'exception'
     EXIT_MESSAGE_KEY = 'exit_message'
     EXIT_STATUS_KEY = 'exit_status'
@@ -60,7 +60,6 @@ class ProcessNode(Sealable, Node):
         # pylint: disable=no-self-argument
         return super()._updatable_attributes + (
             cls.PROCESS_PAUSED_KEY,
-            cls.CHECKPOINT_KEY,
             cls.EXCEPTION_KEY,
             cls.EXIT_MESSAGE_KEY,
             cls.EXIT_STATUS_KEY,
@@ -101,7 +100,6 @@ class ProcessNode(Sealable, Node):
         :raises ValueError: if no process type is defined, it is an invalid process type string or cannot be resolved
             to load the corresponding class
         """
-        from aiida.common import exceptions
         from aiida.plugins.entry_point import load_entry_point_from_string
 
         if not self.process_type:
@@ -363,26 +361,59 @@ class ProcessNode(Sealable, Node):
         """
         Return the checkpoint bundle set for the process
 
+        .. note:: checkpoints are not stored in the attributes of the node but in a dedicated table
+
         :returns: checkpoint bundle if it exists, None otherwise
         """
-        return self.get_attribute(self.CHECKPOINT_KEY, None)
+        if not self.is_stored:
+            return None
+
+        checkpoints = self.backend.checkpoint_manager.get(self.pk)
+
+        return checkpoints[0] if checkpoints else None
 
     def set_checkpoint(self, checkpoint):
         """
-        Set the checkpoint bundle set for the process
+        Set the checkpoint bundle set for the process, which replaces the checkpoint deltas added since the last one
 
         :param state: string representation of the stepper state info
+        :raises `~aiida.common.exceptions.InvalidOperation`: if the node is not stored
+        """
+        if not self.is_stored:
+            raise exceptions.InvalidOperation('cannot set the checkpoint of an unstored process node')
+
+        self.backend.checkpoint_manager.set(self.pk, checkpoint)
+
+    @property
+    def checkpoint_deltas(self):
+        """
+        Return the checkpoint deltas that were added since the checkpoint bundle was last set
+
+        :returns: list of serialized checkpoint deltas, in the order in which they were added
         """
-        return self.set_attribute(self.CHECKPOINT_KEY, checkpoint)
+        if not self.is_stored:
+            return []
+
+        return self.backend.checkpoint_manager.get(self.pk)[1:]
+
+    def add_checkpoint_delta(self, delta):
+        """
+        Add a checkpoint delta, which describes the changes of the process since the previous checkpoint
+
+        :param delta: string representation of the checkpoint delta
+        :raises `~aiida.common.exceptions.InvalidOperation`: if the node is not stored
+        """
+        if not self.is_stored:
+            raise exceptions.InvalidOperation('cannot add a checkpoint delta to an unstored process node')
+
+        self.backend.checkpoint_manager.add(self.pk, delta)
 
     def delete_checkpoint(self):
         """
-        Delete the checkpoint bundle set for the process
+        Delete the checkpoint bundle set for the process and its checkpoint deltas
         """
-        try:
-            self.delete_attribute(self.CHECKPOINT_KEY)
-        except AttributeError:
-            pass
+        if self.is_stored:
+            self.backend.checkpoint_manager.delete(self.pk)
 
     @property
     def paused(self):
@@ -20,18 +20,24 @@ An instance of one of the implementation classes becomes a member of the :func:`
 when instantiated by the user.
 """
 from inspect import isclass as inspect_isclass
+import collections
 import copy
+import datetime
 import logging
+import threading
 import warnings
 
 from sqlalchemy import and_, or_, not_, func as sa_func, select, join
 from sqlalchemy.types import Integer
 from sqlalchemy.orm import aliased
-from sqlalchemy.sql.expression import cast as type_cast
+from sqlalchemy.sql.elements import BindParameter
+from sqlalchemy.sql.expression import bindparam, cast as type_cast
 from sqlalchemy.dialects.postgresql import array
 
+from aiida.common import json
 from aiida.common.exceptions import InputValidationError
 from aiida.common.links import LinkType
+from aiida.manage.configuration import get_config_option
 from aiida.manage.manager import get_manager
 from aiida.common.exceptions import ConfigurationError
 from aiida.common.warnings import AiidaDeprecationWarning
@@ -57,6 +63,71 @@ _LOGGER = logging.getLogger(__name__)
 # subclassing for any entity type. This workaround should then be able to be removed.
 GROUP_ENTITY_TYPE_PREFIX = 'group.'
 
+# The operators and types of the values of column filters that are bound as parameters of a query, such that queries
+# that only differ in these values share the same compiled query, see `QueryBuilder._build`.
+PARAMETERIZED_FILTER_OPERATORS = ('==', '>', '<', '>=', '<=')
+PARAMETERIZED_FILTER_TYPES = (int, float, str, datetime.datetime)
+
+# The values of all other filters are part of the key of the compiled query, so queries with a list or string value
+# that is longer than this, for example the list of an `in` filter on many ids, are not cached.
+MAX_COMPILED_QUERY_LITERAL_LENGTH = 64
+
+CompiledQuery = collections.namedtuple(
+    'CompiledQuery',
+    [
+        'query', 'tag_to_alias_map', 'aliased_path', 'tag_to_projected_property_dict', 'attrkeys_as_in_sql_result',
+        'nr_of_projections'
+    ]
+)
+
+
+class CompiledQueryCache:
+    """Least recently used cache of the queries built by the `QueryBuilder`, shared by all its instances.
+
+    The cached queries are detached from any session and can therefore be reused by any thread.
+    """
+
+    def __init__(self):
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the compiled query for the given key.
+
+        :param key: the key of the query, see `QueryBuilder._get_compiled_query_key`
+        :return: the :class:`CompiledQuery` or None if it is not in the cache
+        """
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self._entries[key]
+
+    def add(self, key, compiled_query, max_size):
+        """Add a compiled query to the cache, evicting the least recently used queries if the cache is full.
+
+        :param key: the key of the query, see `QueryBuilder._get_compiled_query_key`
+        :param compiled_query: the :class:`CompiledQuery`
+        :param max_size: the maximum number of queries in the cache
+        """
+        with self._lock:
+            self._entries[key] = compiled_query
+
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all queries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+COMPILED_QUERY_CACHE = CompiledQueryCache()
+
 
 def get_querybuilder_classifiers_from_cls(cls, query):  # pylint: disable=invalid-name
     """
@@ -414,6 +485,9 @@ class QueryBuilder:
         # Check QueryBuilder.inject_query
         self._injected = False
 
+        # Whether distinct rows were asked for, which is not part of the queryhelp
+        self._distinct = False
+
         # Setting debug levels:
         self.set_debug(kwargs.pop('debug', False))
 
@@ -1232,7 +1306,7 @@ class QueryBuilder:
                     'will not work!\n'
                     "I suggest you apply functions on a column, e.g. ('id')\n"
                 )
-            self._query = self._query.add_entity(alias)
+            self._query = self._impl.add_entity(self._query, alias)
         else:
             entity_to_project = self._get_projectable_entity(alias, column_name, attr_key, cast=cast)
             if func is None:
@@ -1902,6 +1976,123 @@ class QueryBuilder:
     def _build(self):
         """
         build the query and return a sqlalchemy.Query instance
+
+        Unless the ``db.compiled_query_cache_size`` option is 0, the values of simple column filters are bound as
+        parameters and the query is cached, such that structurally identical queries, which only differ in the values of
+        those filters, reuse it instead of being built again. The option is only read once for the loaded profile.
+        """
+        max_size = get_manager().get_compiled_query_cache_size()
+
+        if not max_size:
+            return self._build_query(self._filters)
+
+        filters, parameters = self._get_parameterized_filters()
+        key = self._get_compiled_query_key(filters)
+        compiled_query = COMPILED_QUERY_CACHE.get(key) if key is not None else None
+
+        if compiled_query is None:
+            query = self._build_query(filters)
+            if key is not None:
+                compiled_query = CompiledQuery(
+                    query.with_session(None), dict(self.tag_to_alias_map), list(self._aliased_path),
+                    {tag: dict(properties) for tag, properties in self.tag_to_projected_property_dict.items()},
+                    dict(self._attrkeys_as_in_sql_result), self.nr_of_projections
+                )
+                COMPILED_QUERY_CACHE.add(key, compiled_query, max_size)
+        else:
+            # The cached query refers to the aliases it was built with, which therefore replace those of this instance
+            self.tag_to_alias_map = dict(compiled_query.tag_to_alias_map)
+            self._aliased_path = list(compiled_query.aliased_path)
+            self.tag_to_projected_property_dict = {
+                tag: dict(properties) for tag, properties in compiled_query.tag_to_projected_property_dict.items()
+            }
+            self._attrkeys_as_in_sql_result = dict(compiled_query.attrkeys_as_in_sql_result)
+            self.nr_of_projections = compiled_query.nr_of_projections
+            query = compiled_query.query.with_session(self._impl.get_session())
+
+        if parameters:
+            query = query.params(**parameters)
+
+        self._query = query
+        return query
+
+    def _get_parameterized_filters(self):
+        """Return the filters in which the values of simple column filters are replaced by bind parameters.
+
+        :returns: a tuple of the parameterized filters and a dictionary with the values of the bind parameters
+        """
+        parameters = {}
+
+        def parameterize(filter_spec):
+            """Return a copy of the filter specification with its values replaced by bind parameters where possible."""
+            result = {}
+            for path_spec, filter_operation_dict in filter_spec.items():
+                if path_spec in ('and', 'or', '~or', '~and', '!and', '!or'):
+                    result[path_spec] = [parameterize(sub_filter_spec) for sub_filter_spec in filter_operation_dict]
+                    continue
+
+                if '.' in path_spec or path_spec in ('attributes', 'extras'):
+                    result[path_spec] = filter_operation_dict
+                    continue
+
+                if not isinstance(filter_operation_dict, dict):
+                    filter_operation_dict = {'==': filter_operation_dict}
+
+                result[path_spec] = {}
+                for operator, value in filter_operation_dict.items():
+                    if operator.lstrip('~!') in PARAMETERIZED_FILTER_OPERATORS and isinstance(
+                        value, PARAMETERIZED_FILTER_TYPES
+                    ):
+                        name = 'qb_param_{}'.format(len(parameters))
+                        parameters[name] = value
+                        value = bindparam(name)
+                    result[path_spec][operator] = value
+            return result
+
+        filters = {tag: parameterize(filter_spec) for tag, filter_spec in self._filters.items()}
+
+        return filters, parameters
+
+    def _get_compiled_query_key(self, filters):
+        """Return the key of the compiled query, which describes the structure of the query.
+
+        :param filters: the filters in which values are replaced by bind parameters, see `_get_parameterized_filters`
+        :returns: the key, or None if the query cannot be described by a key or its filters contain literal values that
+            are too long, in which case it is not cached
+        """
+
+        def serialize_parameter(value):
+            if isinstance(value, BindParameter):
+                return value.key
+            raise TypeError('{} is not JSON serializable'.format(value))
+
+        def has_long_literal(value):
+            """Return whether the value contains a list of values or a string that is too long to be part of a key."""
+            if isinstance(value, dict):
+                return any(has_long_literal(item) for item in value.values())
+            if isinstance(value, (list, tuple)):
+                if len(value) > MAX_COMPILED_QUERY_LITERAL_LENGTH and not all(isinstance(item, dict) for item in value):
+                    return True
+                return any(has_long_literal(item) for item in value)
+            return isinstance(value, str) and len(value) > MAX_COMPILED_QUERY_LITERAL_LENGTH
+
+        if has_long_literal(filters):
+            return None
+
+        structure = [self._path, filters, self._projections, self._order_by, self._limit, self._offset]
+
+        try:
+            structure = json.dumps(structure, sort_keys=True, default=serialize_parameter)
+        except TypeError:
+            return None
+
+        return type(self._impl), structure
+
+    def _build_query(self, filters):
+        """
+        build the query from scratch with the given filters and return a sqlalchemy.Query instance
+
+        :param filters: the filters of the query, possibly with values replaced by bind parameters
         """
         # pylint: disable=too-many-branches
 
@@ -1924,11 +2115,11 @@ class QueryBuilder:
                 # I treat those two cases in a special way.
                 # I give them a filter_dict, to help the recursive function find a good
                 # starting point. TODO: document this!
-                filter_dict = self._filters.get(verticespec['joining_value'], {})
+                filter_dict = filters.get(verticespec['joining_value'], {})
                 # I also find out whether the path is used in a filter or a project
                 # if so, I instruct the recursive function to build the path on the fly!
                 # The default is False, cause it's super expensive
-                expand_path = ((self._filters[edge_tag].get('path', None) is not None) or
+                expand_path = ((filters[edge_tag].get('path', None) is not None) or
                                any(['path' in d.keys() for d in self._projections[edge_tag]]))
                 aliased_edge = connection_func(
                     toconnectwith, alias, isouterjoin=isouterjoin, filter_dict=filter_dict, expand_path=expand_path
@@ -1940,7 +2131,7 @@ class QueryBuilder:
 
         ######################### FILTERS ##############################
 
-        for tag, filter_specs in self._filters.items():
+        for tag, filter_specs in filters.items():
             try:
                 alias = self.tag_to_alias_map[tag]
             except KeyError:
@@ -2154,6 +2345,7 @@ class QueryBuilder:
         :returns: self
         """
         self._query = self.get_query().distinct()
+        self._distinct = True
         return self
 
     def first(self):
@@ -2202,49 +2394,70 @@ class QueryBuilder:
 
         :returns: the number of rows as an integer
         """
-        query = self.get_query()
-        return self._impl.count(query)
+        return self._get_cached_result('count', lambda: self._impl.count(self.get_query()))
 
-    def iterall(self, batch_size=100):
+    def iterall(self, batch_size=100, fetch_size=None):
         """
         Same as :meth:`.all`, but returns a generator.
         Be aware that this is only safe if no commit will take place during this
         transaction. You might also want to read the SQLAlchemy documentation on
         http://docs.sqlalchemy.org/en/latest/orm/query.html#sqlalchemy.orm.query.Query.yield_per
 
+        If a batch size is specified, the results are streamed from the database through a server side cursor, such
+        that the memory usage does not depend on the number of results.
 
         :param int batch_size:
             The size of the batches to ask the backend to batch results in subcollections.
             You can optimize the speed of the query by tuning this parameter.
+        :param int fetch_size:
+            The maximum number of rows to fetch from the database per round trip when streaming the results, which
+            starts from a single row and is capped at 1000 rows by SqlAlchemy.
+            By default the value of the ``db.fetch_size`` configuration option is used.
 
         :returns: a generator of lists
         """
         query = self.get_query()
 
-        for item in self._impl.iterall(query, batch_size, self._attrkeys_as_in_sql_result):
+        if fetch_size is None and batch_size is not None:
+            fetch_size = get_config_option('db.fetch_size')
+
+        for item in self._impl.iterall(query, batch_size, self._attrkeys_as_in_sql_result, fetch_size):
             # Convert to AiiDA frontend entities (if they are such)
             for i, item_entry in enumerate(item):
                 item[i] = self.get_aiida_entity_res(item_entry)
 
             yield item
 
-    def iterdict(self, batch_size=100):
+    def iterdict(self, batch_size=100, fetch_size=None):
         """
         Same as :meth:`.dict`, but returns a generator.
         Be aware that this is only safe if no commit will take place during this
         transaction. You might also want to read the SQLAlchemy documentation on
         http://docs.sqlalchemy.org/en/latest/orm/query.html#sqlalchemy.orm.query.Query.yield_per
 
+        If a batch size is specified, the results are streamed from the database through a server side cursor, such
+        that the memory usage does not depend on the number of results.
 
         :param int batch_size:
             The size of the batches to ask the backend to batch results in subcollections.
             You can optimize the speed of the query by tuning this parameter.
+        :param int fetch_size:
+            The maximum number of rows to fetch from the database per round trip when streaming the results, which
+            starts from a single row and is capped at 1000 rows by SqlAlchemy.
+            By default the value of the ``db.fetch_size`` configuration option is used.
 
         :returns: a generator of dictionaries
         """
         query = self.get_query()
 
-        for item in self._impl.iterdict(query, batch_size, self.tag_to_projected_property_dict, self.tag_to_alias_map):
+        if fetch_size is None and batch_size is not None:
+            fetch_size = get_config_option('db.fetch_size')
+
+        results = self._impl.iterdict(
+            query, batch_size, self.tag_to_projected_property_dict, self.tag_to_alias_map, fetch_size
+        )
+
+        for item in results:
             for key, value in item.items():
                 item[key] = self.get_aiida_entity_res(value)
 
@@ -2262,7 +2475,7 @@ class QueryBuilder:
         :param bool flat: return the result as a flat list of projected entities without sub lists.
         :returns: a list of lists of all projected entities.
         """
-        matches = list(self.iterall(batch_size=batch_size))
+        matches = self._get_cached_result('all', lambda: list(self.iterall(batch_size=batch_size)))
 
         if not flat:
             return matches
@@ -2321,7 +2534,49 @@ class QueryBuilder:
                 }
 
         """
-        return list(self.iterdict(batch_size=batch_size))
+        return self._get_cached_result('dict', lambda: list(self.iterdict(batch_size=batch_size)))
+
+    def _projects_entities(self):
+        """Return whether the query projects entire entities, as it does for the last vertex if nothing is projected.
+
+        :returns: boolean
+        """
+        if not any(self._projections.values()):
+            return True
+
+        return any('*' in projection for projections in self._projections.values() for projection in projections)
+
+    def _get_cached_result(self, method, function):
+        """Return the result of a function that executes the query, from the query cache if it has not yet expired.
+
+        Queries that were injected or made distinct are never cached, since their queryhelp does not fully describe
+        them. Neither are the rows of queries that project entire entities, since their ORM instances are bound to the
+        database session of the current thread.
+
+        :param method: the name of the method that returns the result
+        :param function: a function without arguments that executes the query and returns the result
+        :returns: the result
+        """
+        cache = get_manager().get_query_cache()
+
+        if cache is None or self._injected or self._distinct:
+            return function()
+
+        if method != 'count' and self._projects_entities():
+            return function()
+
+        key = cache.get_key(self.queryhelp, method)
+
+        if key is None:
+            return function()
+
+        result = cache.get(key)
+
+        if result is None:
+            result = function()
+            cache.add(key, result)
+
+        return result
 
     def inputs(self, **kwargs):
         """
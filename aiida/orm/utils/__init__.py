@@ -131,8 +131,17 @@ def load_computer(identifier=None, pk=None, uuid=None, label=None, sub_classes=N
     :raise aiida.common.NotExistent: if no matching Computer is found
     :raise aiida.common.MultipleObjectsError: if more than one Computer was found
     """
+    from aiida.orm import Computer
     from aiida.orm.utils.loaders import ComputerEntityLoader
-    return load_entity(
+
+    cache = _get_entity_cache()
+    key = _get_entity_cache_key(cache, Computer, identifier, pk, uuid, label)
+    computer = cache.get(key) if cache is not None else None
+
+    if computer is not None and (sub_classes is None or isinstance(computer, sub_classes)):
+        return computer
+
+    computer = load_entity(
         ComputerEntityLoader,
         identifier=identifier,
         pk=pk,
@@ -142,6 +151,12 @@ def load_computer(identifier=None, pk=None, uuid=None, label=None, sub_classes=N
         query_with_dashes=query_with_dashes
     )
 
+    if cache is not None:
+        keys = [cache.get_key(Computer, computer.pk), cache.get_key(Computer, computer.uuid)]
+        cache.add(keys, computer, ttl=cache.ENTITY_TTL)
+
+    return computer
+
 
 def load_group(identifier=None, pk=None, uuid=None, label=None, sub_classes=None, query_with_dashes=True):
     """
@@ -193,8 +208,17 @@ def load_node(identifier=None, pk=None, uuid=None, label=None, sub_classes=None,
     :raise aiida.common.NotExistent: if no matching Node is found
     :raise aiida.common.MultipleObjectsError: if more than one Node was found
     """
+    from aiida.orm import Data, Node
     from aiida.orm.utils.loaders import NodeEntityLoader
-    return load_entity(
+
+    cache = _get_entity_cache()
+    key = _get_entity_cache_key(cache, Node, identifier, pk, uuid, label)
+    node = cache.get(key) if cache is not None else None
+
+    if node is not None and (sub_classes is None or isinstance(node, sub_classes)):
+        return node
+
+    node = load_entity(
         NodeEntityLoader,
         identifier=identifier,
         pk=pk,
@@ -203,3 +227,31 @@ def load_node(identifier=None, pk=None, uuid=None, label=None, sub_classes=None,
         sub_classes=sub_classes,
         query_with_dashes=query_with_dashes
     )
+
+    # Only data nodes are immutable once stored, but they can still be deleted by other processes
+    if cache is not None and isinstance(node, Data):
+        cache.add([cache.get_key(Node, node.pk), cache.get_key(Node, node.uuid)], node, ttl=cache.ENTITY_TTL)
+
+    return node
+
+
+def _get_entity_cache():
+    """Return the entity cache of the current manager, if it is enabled.
+
+    :return: the :py:class:`~aiida.orm.utils.entity_cache.EntityCache` or None
+    """
+    from aiida.manage.manager import get_manager
+    return get_manager().get_entity_cache()
+
+
+def _get_entity_cache_key(cache, cls, identifier, pk, uuid, label):  # pylint: disable=too-many-arguments
+    """Return the key in the entity cache for the given identifiers as passed to one of the `load_*` functions.
+
+    :return: the key, or None if there is no cache or the entity is not identified by exactly one pk or full UUID
+    """
+    identifiers = [value for value in (identifier, pk, uuid) if value is not None]
+
+    if cache is None or label is not None or len(identifiers) != 1:
+        return None
+
+    return cache.get_key(cls, identifiers[0])
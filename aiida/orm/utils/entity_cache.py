@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Module with the `EntityCache`, an identity map of stored entities that avoids loading them from the database."""
+import re
+import threading
+
+from aiida.orm.utils.lru_cache import LRUCache
+
+__all__ = ('EntityCache',)
+
+REGEX_FULL_UUID = re.compile(r'^[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}$')
+
+
+class EntityCache:
+    """Least recently used cache of stored entities, keyed on their class and identifier.
+
+    Only entities that do not change once stored should be cached, which is why the loaders only add stored `Data`
+    nodes, including codes, but no process nodes. Still, computers and authinfos can be reconfigured and nodes can be
+    deleted by other processes, so all entities are cached with a time to live, after which they are loaded from the
+    database again. Nodes that are deleted by the current process are dropped from the cache right away.
+
+    The ORM instances are bound to the database session of the thread that loaded them, so the cache only serves the
+    thread that created it, typically the thread of the event loop of a daemon runner. For all other threads it acts as
+    if it were empty. Entities that are no longer bound to the current session, for example because it was closed, are
+    dropped from the cache when they are looked up.
+    """
+
+    ENTITY_TTL = 60
+
+    def __init__(self, max_size):
+        """Construct a new cache.
+
+        :param max_size: the maximum number of entries, where an entity that is cached under both its pk and UUID
+            takes two entries
+        """
+        self._cache = LRUCache(max_size)
+        self._thread = threading.current_thread()
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def get_key(orm_class, identifier):
+        """Return the key of an entity of the given class with the given pk or full UUID.
+
+        :param orm_class: the base ORM class of the entity, for example `Node` for all nodes
+        :param identifier: pk (integer) or full UUID (string) of the entity
+        :return: the key, or None if the identifier is neither a pk nor a full UUID
+        """
+        if isinstance(identifier, int) and not isinstance(identifier, bool):
+            return orm_class.__name__, identifier
+
+        if isinstance(identifier, str) and REGEX_FULL_UUID.match(identifier.lower()):
+            return orm_class.__name__, identifier.lower().replace('-', '')
+
+        return None
+
+    def _is_active(self):
+        return threading.current_thread() is self._thread
+
+    @staticmethod
+    def _is_detached(entity):
+        """Return whether the database model of an entity is no longer bound to the current session.
+
+        :param entity: the cached entity
+        """
+        from sqlalchemy import inspect
+        from aiida.manage.manager import get_manager
+
+        try:
+            state = inspect(entity.backend_entity.dbmodel, raiseerr=False)
+        except AttributeError:
+            return False
+
+        # The models of the Django backend are not bound to a session
+        if state is None:
+            return False
+
+        return state.detached or state.session is not get_manager().get_backend().get_session()
+
+    def get(self, key):
+        """Return the cached entity for the given key.
+
+        :param key: the key as returned by `get_key`
+        :return: the entity, or None if it is not in the cache, its time to live has passed or it is detached
+        """
+        if key is None or not self._is_active():
+            return None
+
+        return self._cache.get(key, lambda entity: not self._is_detached(entity))
+
+    def add(self, keys, entity, ttl=None):
+        """Add an entity to the cache, evicting the least recently used entries if the cache is full.
+
+        :param keys: the keys under which to cache the entity, as returned by `get_key`
+        :param entity: the stored entity
+        :param ttl: optional time to live in seconds, after which the entity is no longer returned
+        """
+        if not self._is_active():
+            return
+
+        for key in keys:
+            if key is not None:
+                self._cache.add(key, entity, ttl)
+
+    def invalidate(self, key=None):
+        """Remove an entry from the cache, or all entries if no key is specified.
+
+        :param key: the key as returned by `get_key`
+        """
+        self._cache.invalidate(key)
+
+    def get_metrics(self):
+        """Return the metrics of the cache.
+
+        :return: dictionary with the number of `hits`, `misses` and `evictions`, the `hit_rate` and the current `size`
+        """
+        return self._cache.get_metrics()
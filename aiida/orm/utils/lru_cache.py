@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Module with the `LRUCache`, on which the caches of entities and of query results are based."""
+import collections
+import threading
+import time
+
+__all__ = ('LRUCache',)
+
+
+class LRUCache:
+    """Least recently used cache with an optional time to live per entry, that keeps metrics of its use.
+
+    The cache can be shared between threads, as each of its operations is performed while holding a lock.
+    """
+
+    def __init__(self, max_size):
+        """Construct a new cache.
+
+        :param max_size: the maximum number of entries, where a size of 0 disables the cache
+        """
+        self._max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, is_valid=None):
+        """Return the cached value for the given key.
+
+        :param key: the key of the entry
+        :param is_valid: optional function that takes the cached value and returns whether it can still be used, where
+            an entry whose value can no longer be used is removed
+        :return: the value, or None if it is not in the cache, its time to live has passed or it is no longer valid
+        """
+        with self._lock:
+            try:
+                value, expiry = self._entries[key]
+            except KeyError:
+                self._metrics['misses'] += 1
+                return None
+
+            if (expiry is not None and expiry < time.time()) or (is_valid is not None and not is_valid(value)):
+                del self._entries[key]
+                self._metrics['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._metrics['hits'] += 1
+
+            return value
+
+    def add(self, key, value, ttl=None):
+        """Add a value to the cache, evicting the least recently used entries if the cache is full.
+
+        :param key: the key of the entry
+        :param value: the value to cache
+        :param ttl: optional time to live in seconds, after which the value is no longer returned
+        """
+        if self._max_size <= 0:
+            return
+
+        expiry = None if ttl is None else time.time() + ttl
+
+        with self._lock:
+            self._entries[key] = (value, expiry)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._metrics['evictions'] += 1
+
+    def invalidate(self, key=None):
+        """Remove an entry from the cache, or all entries if no key is specified.
+
+        :param key: the key of the entry
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def get_metrics(self):
+        """Return the metrics of the cache.
+
+        :return: dictionary with the number of `hits`, `misses` and `evictions`, the `hit_rate` and the current `size`
+        """
+        with self._lock:
+            lookups = self._metrics['hits'] + self._metrics['misses']
+            hit_rate = self._metrics['hits'] / lookups if lookups else 0.
+            return dict(self._metrics, hit_rate=hit_rate, size=len(self._entries))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Module with the `QueryCache`, a cache of the results of queries of the `QueryBuilder`."""
+from aiida.common import json
+from aiida.orm.utils.lru_cache import LRUCache
+
+__all__ = ('QueryCache',)
+
+
+def copy_result(result):
+    """Return a copy of the lists and dictionaries of a query result, such that it can be modified independently.
+
+    Any other values are not copied.
+
+    :param result: the query result
+    :return: the copy
+    """
+    if isinstance(result, list):
+        return [copy_result(value) for value in result]
+
+    if isinstance(result, dict):
+        return {key: copy_result(value) for key, value in result.items()}
+
+    return result
+
+
+class QueryCache:
+    """Least recently used cache of query results, keyed on the query, that expire after a time to live.
+
+    A cached result is returned until its time to live has passed, regardless of any changes to the database in the
+    meantime, including those made by the current process, unless the cache is invalidated explicitly. The time to live
+    is therefore the maximum time for which a returned result may be out of date.
+
+    Only results that consist of plain values, i.e. no ORM instances that are bound to the database session of the
+    thread that loaded them, should be cached, such that the results can be shared between threads.
+    """
+
+    def __init__(self, max_size, ttl):
+        """Construct a new cache.
+
+        :param max_size: the maximum number of cached results
+        :param ttl: the time to live in seconds of a cached result
+        """
+        self._cache = LRUCache(max_size)
+        self._ttl = ttl
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def get_key(queryhelp, method, **kwargs):
+        """Return the key of the result of the given method for the query with the given queryhelp.
+
+        :param queryhelp: the queryhelp of the query, see `QueryBuilder.queryhelp`
+        :param method: the name of the method that returns the result, e.g. `all`
+        :param kwargs: the keyword arguments of the method that affect the result
+        :return: the key, or None if the queryhelp cannot be serialized, in which case the result cannot be cached
+        """
+        try:
+            return json.dumps([queryhelp, method, kwargs], sort_keys=True)
+        except TypeError:
+            return None
+
+    def get(self, key):
+        """Return a copy of the cached result for the given key.
+
+        :param key: the key as returned by `get_key`
+        :return: the result, or None if it is not in the cache or has expired
+        """
+        if key is None:
+            return None
+
+        result = self._cache.get(key)
+
+        return None if result is None else copy_result(result)
+
+    def add(self, key, result):
+        """Add a copy of a query result to the cache, evicting the least recently used results if the cache is full.
+
+        :param key: the key as returned by `get_key`
+        :param result: the query result
+        """
+        if key is None:
+            return
+
+        self._cache.add(key, copy_result(result), self._ttl)
+
+    def invalidate(self):
+        """Remove all results from the cache."""
+        self._cache.invalidate()
+
+    def get_metrics(self):
+        """Return the metrics of the cache.
+
+        :return: dictionary with the number of `hits`, `misses` and `evictions`, the `hit_rate` and the current `size`
+        """
+        return self._cache.get_metrics()
@@ -11,10 +11,12 @@
 
 import collections
 import enum
+import io
 import os
 
 from aiida.common import exceptions
 from aiida.common.folders import RepositoryFolder, SandboxFolder
+from aiida.common.objectstore import get_object_store
 
 
 class FileType(enum.Enum):
@@ -27,7 +29,14 @@ File = collections.namedtuple('File', ['name', 'type'])
 
 
 class Repository:
-    """Class that represents the repository of a `Node` instance."""
+    """Class that represents the repository of a `Node` instance.
+
+    The contents of a stored repository either live in a sharded folder that is unique to the node, or, if the
+    `repository.backend` option was set to `objectstore` when the node was stored, in the content-addressable object
+    store, in which case the repository is described by a manifest that maps the object keys onto hash keys. In the
+    latter case, the `_get_base_folder` method returns a temporary folder with a copy of the contents, for code that
+    needs to operate directly on the file system.
+    """
 
     # Name to be used for the Repository section
     _section_name = 'node'
@@ -37,6 +46,7 @@ class Repository:
         self._base_path = base_path
         self._temp_folder = None
         self._repo_folder = RepositoryFolder(section=self._section_name, uuid=uuid)
+        self._manifest = None
 
     def __del__(self):
         """Clean the sandboxfolder if it was instantiated."""
@@ -68,6 +78,11 @@ class Repository:
         :param key: fully qualified identifier for the object within the repository
         :return: a list of `File` named tuples representing the objects present in directory with the given key
         """
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            return self._list_manifest_objects(manifest, key)
+
         folder = self._get_base_folder()
 
         if key:
@@ -97,6 +112,21 @@ class Repository:
         :param key: fully qualified identifier for the object within the repository
         :param mode: the mode under which to open the handle
         """
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            if any(char in mode for char in 'wax+'):
+                raise exceptions.ModificationNotAllowed('cannot open an object of a stored repository for writing')
+
+            hashkey = manifest.get(self._get_manifest_key(key))
+
+            if hashkey is None:
+                raise IOError('object {} does not exist'.format(key))
+
+            handle = get_object_store().open_object(hashkey)
+
+            return handle if 'b' in mode else io.TextIOWrapper(handle, encoding='utf8')
+
         return open(self._get_base_folder().get_abs_path(key), mode=mode)
 
     def get_object(self, key):
@@ -113,6 +143,16 @@ class Repository:
         except ValueError:
             directory, filename = None, key
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            manifest_key = self._get_manifest_key(key)
+
+            if manifest_key not in manifest:
+                raise IOError('object {} does not exist'.format(key))
+
+            return File(filename, FileType.DIRECTORY if manifest[manifest_key] is None else FileType.FILE)
+
         folder = self._get_base_folder()
 
         if directory:
@@ -157,6 +197,28 @@ class Repository:
         if not os.path.isabs(path):
             raise ValueError('the `path` must be an absolute path')
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            prefix = key or ''
+
+            if not contents_only:
+                prefix = os.path.join(prefix, os.path.basename(path))
+
+            entries = {self._get_manifest_key(prefix): None}
+            store = get_object_store()
+
+            for dirpath, dirnames, filenames in os.walk(path):
+                relpath = os.path.relpath(dirpath, path)
+                for dirname in dirnames:
+                    entries[self._get_manifest_key(os.path.join(prefix, relpath, dirname))] = None
+                for filename in filenames:
+                    entry_key = self._get_manifest_key(os.path.join(prefix, relpath, filename))
+                    entries[entry_key] = store.add_object_from_file(os.path.join(dirpath, filename))
+
+            self._update_manifest(entries)
+            return
+
         folder = self._get_base_folder()
 
         if key:
@@ -205,7 +267,7 @@ class Repository:
         self.validate_object_key(key)
 
         with open(path, mode='rb') as handle:
-            self.put_object_from_filelike(handle, key, mode='wb', encoding=None)
+            self.put_object_from_filelike(handle, key, mode='wb', encoding=None, force=force)
 
     def put_object_from_filelike(self, handle, key, mode='w', encoding='utf8', force=False):
         """Store a new object under `key` with contents of filelike object `handle`.
@@ -225,6 +287,15 @@ class Repository:
 
         self.validate_object_key(key)
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            encoding = None if 'b' in mode else encoding or 'utf8'
+            entries = {self._get_manifest_key(os.path.dirname(key)): None}
+            entries[self._get_manifest_key(key)] = get_object_store().add_object(handle, encoding=encoding)
+            self._update_manifest(entries)
+            return
+
         folder = self._get_base_folder()
 
         while os.sep in key:
@@ -248,6 +319,17 @@ class Repository:
 
         self.validate_object_key(key)
 
+        manifest = self._get_manifest()
+
+        if manifest is not None:
+            manifest_key = self._get_manifest_key(key)
+            keys = [entry for entry in manifest if entry == manifest_key or entry.startswith(manifest_key + os.sep)]
+            get_object_store().delete_manifest_entries(self._repo_folder.uuid, keys)
+            for entry in keys:
+                manifest.pop(entry)
+            self._erase_temp_folder()
+            return
+
         self._get_base_folder().remove_path(key)
 
     def erase(self, force=False):
@@ -262,22 +344,84 @@ class Repository:
         if not force:
             self.validate_mutability()
 
+        if self._get_manifest() is not None:
+            get_object_store().delete_manifest(self._repo_folder.uuid)
+            self._manifest = None
+            self._erase_temp_folder()
+            return
+
         self._get_base_folder().erase()
 
     def store(self):
         """Store the contents of the sandbox folder into the repository folder."""
-        if self._is_stored:
-            raise exceptions.ModificationNotAllowed('repository is already stored')
+        self.store_many([self])
+
+    @staticmethod
+    def store_many(repositories):
+        """Store the contents of the sandbox folders of multiple repositories.
+
+        With the object store backend, the manifests of all repositories are written in a single transaction.
+
+        :param repositories: list of unstored repositories
+        """
+        # pylint: disable=protected-access
+        from aiida.manage.configuration import get_config_option
+
+        for repository in repositories:
+            if repository._is_stored:
+                raise exceptions.ModificationNotAllowed('repository is already stored')
+
+        if get_config_option('repository.backend') == 'objectstore':
+            store = get_object_store()
+            manifests = {}
+
+            # The sandbox folder is kept as a read-only copy of the contents, such that operations directly after
+            # storing, such as computing the hash of the node, do not have to read the objects back from the store.
+            for repository in repositories:
+                manifests[repository._repo_folder.uuid] = repository._add_objects(store)
+
+            store.set_manifests(manifests)
+
+            for repository in repositories:
+                repository._manifest = manifests[repository._repo_folder.uuid]
+                repository._is_stored = True
+        else:
+            for repository in repositories:
+                temp_folder = repository._get_temp_folder()
+                repository._repo_folder.replace_with_folder(temp_folder.abspath, move=True, overwrite=True)
+                repository._is_stored = True
+
+    def _add_objects(self, store):
+        """Add the files of the sandbox folder to the object store.
+
+        :param store: the object store
+        :return: the manifest of the sandbox folder
+        """
+        temp_folder = self._get_temp_folder()
+        manifest = {'': None}
 
-        self._repo_folder.replace_with_folder(self._get_temp_folder().abspath, move=True, overwrite=True)
-        self._is_stored = True
+        for dirpath, dirnames, filenames in os.walk(temp_folder.abspath):
+            relpath = os.path.relpath(dirpath, temp_folder.abspath)
+            for dirname in dirnames:
+                manifest[os.path.normpath(os.path.join(relpath, dirname))] = None
+            for filename in filenames:
+                filepath = os.path.join(dirpath, filename)
+                manifest[os.path.normpath(os.path.join(relpath, filename))] = store.add_object_from_file(filepath)
+
+        return manifest
 
     def restore(self):
         """Move the contents from the repository folder back into the sandbox folder."""
         if not self._is_stored:
             raise exceptions.ModificationNotAllowed('repository is not yet stored')
 
-        self._temp_folder.replace_with_folder(self._repo_folder.abspath, move=True, overwrite=True)
+        if self._get_manifest() is not None:
+            self._get_temp_folder()
+            get_object_store().delete_manifest(self._repo_folder.uuid)
+            self._manifest = None
+        else:
+            self._temp_folder.replace_with_folder(self._repo_folder.abspath, move=True, overwrite=True)
+
         self._is_stored = False
 
     def _get_base_folder(self):
@@ -285,7 +429,7 @@ class Repository:
 
         :return: a Folder object.
         """
-        if self._is_stored:
+        if self._is_stored and self._get_manifest() is None:
             folder = self._repo_folder
         else:
             folder = self._get_temp_folder()
@@ -304,4 +448,102 @@ class Repository:
         if self._temp_folder is None:
             self._temp_folder = SandboxFolder()
 
+            if self._get_manifest() is not None:
+                self._materialize_manifest()
+
         return self._temp_folder
+
+    def _erase_temp_folder(self):
+        """Erase the temporary sandbox folder, if it was instantiated."""
+        if self._temp_folder is not None:
+            self._temp_folder.erase()
+            self._temp_folder = None
+
+    def _get_manifest(self):
+        """Return the manifest of the repository if it is stored in the object store.
+
+        :return: dictionary mapping object keys onto hash keys, where directories are mapped onto `None`, or `None` if
+            the repository is not stored or is stored in a folder
+        """
+        if not self._is_stored:
+            return None
+
+        if self._manifest is None:
+            store = get_object_store(create=False)
+
+            if self._repo_folder.exists() or store is None:
+                self._manifest = {}
+            else:
+                self._manifest = store.get_manifest(self._repo_folder.uuid) or {}
+
+        return self._manifest or None
+
+    def _get_manifest_key(self, key=None):
+        """Return the key in the manifest for the given object key, which is relative to the base path.
+
+        :param key: fully qualified identifier for the object within the repository
+        """
+        path = os.path.normpath(os.path.join(self._base_path or '', key or ''))
+        return '' if path == os.curdir else path
+
+    def _list_manifest_objects(self, manifest, key=None):
+        """Return a list of the objects in the manifest that are contained in the directory with the given key.
+
+        :param manifest: the manifest of the repository
+        :param key: fully qualified identifier for the object within the repository
+        :return: a list of `File` named tuples
+        :raises IOError: if no directory with the given key exists
+        """
+        directory = self._get_manifest_key(key)
+
+        if directory and directory != self._get_manifest_key() and manifest.get(directory, '') is not None:
+            raise IOError('directory {} does not exist'.format(key))
+
+        prefix = directory + os.sep if directory else ''
+        objects = {}
+
+        for entry, hashkey in manifest.items():
+            if not entry or not entry.startswith(prefix) or entry == directory:
+                continue
+
+            name, _, remainder = entry[len(prefix):].partition(os.sep)
+
+            if remainder or hashkey is None:
+                objects[name] = File(name, FileType.DIRECTORY)
+            else:
+                objects[name] = File(name, FileType.FILE)
+
+        return sorted(objects.values(), key=lambda x: x.name)
+
+    def _update_manifest(self, entries):
+        """Add entries to the manifest of the stored repository, including any missing intermediate directories.
+
+        :param entries: dictionary mapping object keys onto hash keys, where directories are mapped onto `None`
+        """
+        for entry in list(entries):
+            parent = os.path.dirname(entry)
+            while parent and parent not in entries:
+                entries[parent] = None
+                parent = os.path.dirname(parent)
+
+        entries[''] = None
+
+        get_object_store().update_manifest(self._repo_folder.uuid, entries)
+        self._manifest.update(entries)
+        self._erase_temp_folder()
+
+    def _materialize_manifest(self):
+        """Write the contents described by the manifest to the temporary sandbox folder."""
+        store = get_object_store()
+        folder = self._temp_folder
+
+        for entry, hashkey in sorted(self._get_manifest().items()):
+            if not entry:
+                continue
+
+            if hashkey is None:
+                folder.get_subfolder(entry, create=True)
+            else:
+                folder.get_subfolder(os.path.dirname(entry), create=True)
+                with store.open_object(hashkey) as handle:
+                    folder.create_file_from_filelike(handle, entry, mode='wb')
@@ -15,6 +15,8 @@ checkpoints and messages in the RabbitMQ queue so do so with caution.  It is fin
 for new types though.
 """
 from functools import partial
+import json
+
 import yaml
 
 from plumpy import Bundle
@@ -30,6 +32,13 @@ _ATTRIBUTE_DICT_TAG = '!aiida_attributedict'
 _PLUMPY_ATTRIBUTES_FROZENDICT_TAG = '!plumpy:attributes_frozendict'
 _PLUMPY_BUNDLE = '!plumpy:bundle'
 
+CHECKPOINT_HEADER = 'aiida-checkpoint:'
+CHECKPOINT_DELTA_HEADER = 'aiida-checkpoint-delta:'
+CHECKPOINT_VERSION = 1
+
+# Key of the type tag of values that cannot be represented natively in JSON in the encoding of checkpoints
+_TAG = '!'
+
 
 def represent_node(dumper, node):
     """Represent a node in yaml.
@@ -228,3 +237,247 @@ def deserialize(serialized):
     :return: the deserialized data structure
     """
     return yaml.load(serialized, Loader=AiiDALoader)
+
+
+def _encode_checkpoint_value(value):
+    """Encode a value of a checkpoint into a structure that can be dumped to JSON.
+
+    Values that cannot be represented natively in JSON are encoded as a dictionary with the type tag under the `_TAG`
+    key and the encoded value under the `v` key. Types for which there is no specific encoding fall back to their yaml
+    serialization, such that any value that `serialize` supports can be encoded.
+
+    :param value: the value to encode
+    :return: the encoded value
+    """
+    # pylint: disable=too-many-return-statements,unidiomatic-typecheck
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+
+    if type(value) is list:
+        return [_encode_checkpoint_value(item) for item in value]
+
+    if type(value) is dict:
+        if _TAG not in value and all(type(key) is str for key in value):
+            return {key: _encode_checkpoint_value(item) for key, item in value.items()}
+        return {
+            _TAG: 'dict',
+            'v': [[_encode_checkpoint_value(key), _encode_checkpoint_value(item)] for key, item in value.items()]
+        }
+
+    if type(value) is tuple:
+        return {_TAG: 'tuple', 'v': [_encode_checkpoint_value(item) for item in value]}
+
+    if type(value) in (Bundle, AttributeDict, AttributesFrozendict):
+        tag = {Bundle: 'bundle', AttributeDict: 'attributedict', AttributesFrozendict: 'frozendict'}[type(value)]
+        return {_TAG: tag, 'v': _encode_checkpoint_value(dict(value))}
+
+    for tag, orm_class in (('node', orm.Node), ('group', orm.Group), ('computer', orm.Computer)):
+        if isinstance(value, orm_class):
+            if not value.is_stored:
+                raise ValueError('{} {} cannot be represented because it is not stored'.format(tag, value))
+            return {_TAG: tag, 'v': value.uuid}
+
+    return {_TAG: 'yaml', 'v': serialize(value)}
+
+
+def _decode_checkpoint_value(value):
+    """Decode a value of a checkpoint that was encoded with `_encode_checkpoint_value`.
+
+    :param value: the encoded value
+    :return: the decoded value
+    """
+    # pylint: disable=too-many-return-statements
+    if isinstance(value, list):
+        return [_decode_checkpoint_value(item) for item in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    tag = value.get(_TAG, None)
+
+    if tag is None:
+        return {key: _decode_checkpoint_value(item) for key, item in value.items()}
+
+    payload = value['v']
+
+    if tag == 'dict':
+        return {_decode_checkpoint_value(key): _decode_checkpoint_value(item) for key, item in payload}
+
+    if tag == 'tuple':
+        return tuple(_decode_checkpoint_value(item) for item in payload)
+
+    if tag == 'bundle':
+        bundle = Bundle.__new__(Bundle)
+        bundle.update(_decode_checkpoint_value(payload))
+        return bundle
+
+    if tag == 'attributedict':
+        return AttributeDict(_decode_checkpoint_value(payload))
+
+    if tag == 'frozendict':
+        return AttributesFrozendict(_decode_checkpoint_value(payload))
+
+    if tag == 'node':
+        return orm.load_node(uuid=payload)
+
+    if tag == 'group':
+        return orm.load_group(uuid=payload)
+
+    if tag == 'computer':
+        return orm.Computer.get(uuid=payload)
+
+    if tag == 'yaml':
+        return deserialize(payload)
+
+    raise ValueError('unknown type tag `{}` in checkpoint'.format(tag))
+
+
+def serialize_checkpoint(bundle):
+    """Serialize the bundle of a process checkpoint into a string.
+
+    The bundle is encoded as compact JSON, which is a lot faster to dump and to load than yaml, preceded by a header
+    with the version of the encoding.
+
+    :param bundle: the checkpoint bundle
+    :type bundle: :class:`plumpy.Bundle`
+    :return: the serialized checkpoint
+    """
+    encoded = json.dumps(_encode_checkpoint_value(bundle), separators=(',', ':'))
+    return '{}{}\n{}'.format(CHECKPOINT_HEADER, CHECKPOINT_VERSION, encoded)
+
+
+def encode_checkpoint_context(context):
+    """Encode the values of the context of a process checkpoint key by key, to compute the delta between checkpoints.
+
+    :param context: the context, a mapping with string keys
+    :return: dictionary with the encoded value of each key of the context
+    :raises ValueError: if not all keys of the context are strings
+    """
+    if any(not isinstance(key, str) for key in context):
+        raise ValueError('the context can only be encoded key by key if all its keys are strings')
+
+    return {key: _encode_checkpoint_value(value) for key, value in context.items()}
+
+
+def _is_encoded_value_equal(left, right):
+    """Return whether two encoded values are equal, including the types of the values they contain.
+
+    Comparing the values themselves would consider `True`, `1` and `1.0` equal, so their JSON representations with
+    sorted keys are compared instead.
+
+    :param left: an encoded value
+    :param right: an encoded value
+    :return: boolean, True if the values are equal
+    """
+    return json.dumps(left, sort_keys=True) == json.dumps(right, sort_keys=True)
+
+
+def get_checkpoint_context_delta(previous, current):
+    """Return the changes between two contexts encoded with `encode_checkpoint_context`.
+
+    Lists to which items were only appended, as is the case for results that are added to the context with `append_`,
+    are recorded by their new items only, such that a growing list does not have to be written again completely.
+
+    :param previous: the encoded context of the previous checkpoint
+    :param current: the encoded context of the current checkpoint
+    :return: dictionary with the encoded values of the keys that were `set`, the new items of the lists that were
+        `extended` and the keys that were `deleted`
+    """
+    delta = {'set': {}, 'extend': {}, 'delete': [key for key in previous if key not in current]}
+
+    for key, value in current.items():
+
+        if key not in previous:
+            delta['set'][key] = value
+            continue
+
+        old = previous[key]
+
+        if _is_encoded_value_equal(old, value):
+            continue
+
+        if (
+            isinstance(old, list) and isinstance(value, list) and len(value) > len(old) and
+            _is_encoded_value_equal(old, value[:len(old)])
+        ):
+            delta['extend'][key] = value[len(old):]
+        else:
+            delta['set'][key] = value
+
+    return delta
+
+
+def serialize_checkpoint_delta(bundle, context_key, delta):
+    """Serialize the bundle of a process checkpoint as a delta with respect to the previous checkpoint.
+
+    The delta contains the bundle without its context, which is typically small, and the changes of the context.
+
+    :param bundle: the checkpoint bundle
+    :type bundle: :class:`plumpy.Bundle`
+    :param context_key: the key of the context in the bundle
+    :param delta: the changes of the context as returned by `get_checkpoint_context_delta`
+    :return: the serialized checkpoint delta
+    """
+    state = {key: value for key, value in bundle.items() if key != context_key}
+    encoded = {'key': context_key, 'bundle': _encode_checkpoint_value(state), 'context': delta}
+    encoded = json.dumps(encoded, separators=(',', ':'))
+    return '{}{}\n{}'.format(CHECKPOINT_DELTA_HEADER, CHECKPOINT_VERSION, encoded)
+
+
+def _apply_checkpoint_delta(bundle, serialized):
+    """Return the checkpoint bundle that results from applying a serialized checkpoint delta to a bundle.
+
+    :param bundle: the checkpoint bundle of the previous checkpoint, whose context is updated in place
+    :param serialized: the checkpoint delta serialized by `serialize_checkpoint_delta`
+    :return: the checkpoint bundle
+    :raises ValueError: if the checkpoint delta was serialized with an unsupported version of the encoding
+    """
+    header, _, encoded = serialized.partition('\n')
+
+    if header != '{}{}'.format(CHECKPOINT_DELTA_HEADER, CHECKPOINT_VERSION):
+        raise ValueError('checkpoint delta with header `{}` is not supported'.format(header))
+
+    delta = json.loads(encoded)
+    context = bundle[delta['key']]
+
+    for key in delta['context']['delete']:
+        context.pop(key, None)
+
+    for key, value in delta['context']['set'].items():
+        context[key] = _decode_checkpoint_value(value)
+
+    for key, items in delta['context']['extend'].items():
+        context[key].extend(_decode_checkpoint_value(items))
+
+    result = Bundle.__new__(Bundle)
+    result.update(_decode_checkpoint_value(delta['bundle']))
+    result[delta['key']] = context
+
+    return result
+
+
+def deserialize_checkpoint(serialized, deltas=()):
+    """Deserialize a process checkpoint serialized by `serialize_checkpoint` or a legacy yaml checkpoint.
+
+    :param serialized: the serialized checkpoint
+    :param deltas: optional sequence of checkpoint deltas serialized by `serialize_checkpoint_delta` since the
+        checkpoint, which are applied in order
+    :return: the checkpoint bundle
+    :rtype: :class:`plumpy.Bundle`
+    :raises ValueError: if the checkpoint was serialized with an unsupported version of the encoding
+    """
+    if not serialized.startswith(CHECKPOINT_HEADER):
+        bundle = deserialize(serialized)
+    else:
+        header, _, encoded = serialized.partition('\n')
+        version = header[len(CHECKPOINT_HEADER):]
+
+        if version != str(CHECKPOINT_VERSION):
+            raise ValueError('checkpoint version `{}` is not supported'.format(version))
+
+        bundle = _decode_checkpoint_value(json.loads(encoded))
+
+    for delta in deltas:
+        bundle = _apply_checkpoint_delta(bundle, delta)
+
+    return bundle
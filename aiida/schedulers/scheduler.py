@@ -9,6 +9,8 @@
 ###########################################################################
 """Implementation of `Scheduler` base class."""
 import abc
+import re
+import uuid
 
 from aiida.common import exceptions, log
 from aiida.common.escaping import escape_for_bash
@@ -387,6 +389,54 @@ stderr:
         result = self.transport.exec_command_wait(self._get_submit_command(escape_for_bash(submit_script)))
         return self._parse_submit_output(*result)
 
+    def submit_from_scripts(self, submissions):
+        """Submit multiple submission scripts to the scheduler with a single remote command.
+
+        The submit commands of the scripts are executed one after the other, each in its own working directory, and
+        their outputs are separated with unique markers, such that each output can be parsed by `_parse_submit_output`.
+
+        :param submissions: list of tuples of the working directory and the submission script relative to it
+        :return: list with for each submission either the job ID or the `SchedulerError` raised while submitting it
+        """
+        marker = 'AIIDA_SUBMIT_{}'.format(uuid.uuid4().hex)
+        commands = []
+
+        for index, (working_directory, submit_script) in enumerate(submissions):
+            submit_command = self._get_submit_command(escape_for_bash(submit_script))
+            commands.append(
+                "printf '\\n%s\\n' '{marker} {index}' >&2; printf '%s\\n' '{marker} {index}'; "
+                "( cd {directory} && {command} ) < /dev/null; printf '\\n%s %s\\n' '{marker} {index}' \"$?\"".format(
+                    marker=marker, index=index, directory=escape_for_bash(working_directory), command=submit_command
+                )
+            )
+
+        retval, stdout, stderr = self.transport.exec_command_wait('\n'.join(commands))
+
+        stdouts = {}
+        for match in re.finditer(r'{0} (\d+)\n(.*?)\n{0} \1 (\d+)\n'.format(marker), stdout, re.DOTALL):
+            stdouts[int(match.group(1))] = (int(match.group(3)), match.group(2))
+
+        # The stderr is split in the sections following the marker of each submission
+        sections = re.split(r'\n{} (\d+)\n'.format(marker), stderr)
+        stderrs = dict(zip([int(index) for index in sections[1::2]], sections[2::2]))
+
+        results = []
+        for index, _ in enumerate(submissions):
+            if index not in stdouts:
+                results.append(
+                    SchedulerError(
+                        'submission did not complete, retval={}\nstdout={}\nstderr={}'.format(retval, stdout, stderr)
+                    )
+                )
+                continue
+
+            try:
+                results.append(self._parse_submit_output(stdouts[index][0], stdouts[index][1], stderrs.get(index, '')))
+            except SchedulerError as exception:
+                results.append(exception)
+
+        return results
+
     def kill(self, jobid):
         """Kill a remote job and parse the return value of the scheduler to check if the command succeeded.
 
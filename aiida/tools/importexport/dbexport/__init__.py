@@ -718,6 +718,13 @@ def export_tree(
 
             # Make sure the node's repository folder was not deleted
             src = RepositoryFolder(section=Repository._section_name, uuid=uuid)  # pylint: disable=protected-access
+
+            # If the repository of the node is kept in the object store, write its contents to a temporary folder
+            if not src.exists():
+                repository = Repository(uuid=uuid, is_stored=True)
+                if repository._get_manifest() is not None:  # pylint: disable=protected-access
+                    src = repository._get_base_folder()  # pylint: disable=protected-access
+
             if not src.exists():
                 raise exceptions.ArchiveExportError(
                     'Unable to find the repository folder for Node with UUID={} in the local repository'.format(uuid)
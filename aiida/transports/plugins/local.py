@@ -27,7 +27,7 @@ import subprocess
 import glob
 
 from aiida.transports import cli as transport_cli
-from aiida.transports.transport import Transport, TransportInternalError
+from aiida.transports.transport import STDIN_CHUNK_SIZE, Transport, TransportInternalError
 
 
 # refactor or raise the limit: issue #1784
@@ -763,6 +763,7 @@ class LocalTransport(Transport):
         Executes the specified command and waits for it to finish.
 
         :param command: the command to execute
+        :param stdin: (optional) a string or a file-like object, in text or binary mode
 
         :return: a tuple with (return_value, stdout, stderr) where stdout and
                  stderr are strings.
@@ -777,8 +778,10 @@ class LocalTransport(Transport):
                 filelike_stdin = stdin
 
             try:
-                for line in filelike_stdin.readlines():
-                    local_stdin.write(line.encode('utf-8'))  # the Popen.stdin/out/err are byte streams
+                # Read the input in chunks, such that large binary streams do not have to be loaded in memory at once
+                for chunk in iter(lambda: filelike_stdin.read(STDIN_CHUNK_SIZE), filelike_stdin.read(0)):
+                    # the Popen.stdin/out/err are byte streams
+                    local_stdin.write(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
             except AttributeError:
                 raise ValueError('stdin can only be either a string or a file-like object!')
         else:
@@ -9,17 +9,19 @@
 ###########################################################################
 """Plugin for transport over SSH (and SFTP for file transfer)."""
 # pylint: disable=too-many-lines
+import contextlib
+import fnmatch
 import glob
 import io
 import os
-from stat import S_ISDIR, S_ISREG
+from stat import S_ISDIR, S_ISLNK, S_ISREG
 
 import click
 
 from aiida.cmdline.params import options
 from aiida.cmdline.params.types.path import AbsolutePathOrEmptyParamType
 from aiida.common.escaping import escape_for_bash
-from ..transport import Transport, TransportInternalError
+from ..transport import STDIN_CHUNK_SIZE, Transport, TransportInternalError
 
 __all__ = ('parse_sshconfig', 'convert_to_bool', 'SshTransport')
 
@@ -376,6 +378,8 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
 
         self._sftp = None
         self._proxy = None
+        self._stat_cache = None
+        self._listdir_cache = None
 
         self._machine = kwargs.pop('machine')
 
@@ -462,6 +466,20 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         self._sftp.close()
         self._client.close()
         self._is_open = False
+        self._invalidate_metadata_cache()
+
+    def keep_alive(self):
+        """
+        Send a keep-alive packet over the SSH connection, such that it is not dropped while it is not being used.
+
+        :raise aiida.transports.transport.TransportInternalError: if the SSH connection is no longer active
+        """
+        transport = self.sshclient.get_transport()
+
+        if transport is None or not transport.is_active():
+            raise TransportInternalError('the SSH connection is no longer active')
+
+        transport.send_ignore()
 
     @property
     def sshclient(self):
@@ -493,6 +511,91 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
 
         return '{} [{}]'.format('OPEN' if self._is_open else 'CLOSED', conn_info)
 
+    @contextlib.contextmanager
+    def metadata_cache(self):
+        """
+        Return a context manager within which the results of the stat and listdir calls of this transport are cached.
+
+        The cache is invalidated by any operation of this transport that can modify the remote, such as `put`, `mkdir`,
+        `remove` or `exec_command_wait`, but changes made on the remote by other means are not seen within the context.
+        Listing a directory also caches the attributes of its entries, such that following calls like `isdir` or
+        `isfile` for those entries do not require a round trip. Nested contexts share the cache of the outermost one.
+        """
+        if self._stat_cache is not None:
+            yield self
+            return
+
+        self._stat_cache = {}
+        self._listdir_cache = {}
+
+        try:
+            yield self
+        finally:
+            self._stat_cache = None
+            self._listdir_cache = None
+
+    def _invalidate_metadata_cache(self):
+        """Clear the metadata cache, if enabled, after an operation that can modify the remote."""
+        if self._stat_cache is not None:
+            self._stat_cache.clear()
+            self._listdir_cache.clear()
+
+    def _get_metadata_cache_key(self, path):
+        """Return the normalized absolute path that is used as the key of a path in the metadata cache."""
+        return os.path.normpath(os.path.join(self.getcwd(), path))
+
+    def _stat(self, path):
+        """
+        Return the attributes of a path, following symbolic links, from the metadata cache if it is enabled.
+
+        :param path: the remote path
+        :return: a `paramiko.SFTPAttributes` instance
+        :raise IOError: if the path does not exist or cannot be accessed
+        """
+        if self._stat_cache is None:
+            return self.sftp.stat(path)
+
+        key = self._get_metadata_cache_key(path)
+
+        try:
+            result = self._stat_cache[key]
+        except KeyError:
+            try:
+                result = self.sftp.stat(path)
+            except IOError as exception:
+                result = exception
+            self._stat_cache[key] = result
+
+        if isinstance(result, IOError):
+            raise result
+
+        return result
+
+    def _listdir_attr(self, path):
+        """
+        Return the attributes of the entries of a directory, from the metadata cache if it is enabled.
+
+        The attributes are those of the entries themselves, i.e. symbolic links are not followed.
+
+        :param path: the remote path of the directory
+        :return: list of `paramiko.SFTPAttributes` instances
+        """
+        if self._listdir_cache is None:
+            return self.sftp.listdir_attr(path)
+
+        key = self._get_metadata_cache_key(path)
+
+        if key not in self._listdir_cache:
+            attributes = self.sftp.listdir_attr(path)
+            self._listdir_cache[key] = attributes
+
+            # The attributes of entries that are not symbolic links are the same as the ones returned by `stat`
+            for attribute in attributes:
+                if not S_ISLNK(attribute.st_mode):
+                    self._stat_cache.setdefault(os.path.join(key, attribute.filename), attribute)
+
+        return self._listdir_cache[key]
+
     def chdir(self, path):
         """
         Change directory of the SFTP session. Emulated internally by paramiko.
@@ -592,6 +695,8 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         if ignore_existing and self.isdir(path):
             return
 
+        self._invalidate_metadata_cache()
+
         try:
             self.sftp.mkdir(path)
         except IOError as exc:
@@ -643,6 +748,7 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         """
         Remove the folder named 'path' if empty.
         """
+        self._invalidate_metadata_cache()
         self.sftp.rmdir(path)
 
     def chown(self, path, uid, gid):
@@ -663,7 +769,7 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         if not path:
             return False
         try:
-            return S_ISDIR(self.sftp.stat(path).st_mode)
+            return S_ISDIR(self._stat(path).st_mode)
         except IOError as exc:
             if getattr(exc, 'errno', None) == 2:
                 # errno=2 means path does not exist: I return False
@@ -679,6 +785,7 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         """
         if not path:
             raise IOError('Input path is an empty argument.')
+        self._invalidate_metadata_cache()
         return self.sftp.chmod(path, mode)
 
     @staticmethod
@@ -789,6 +896,7 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         if self.isfile(remotepath) and not overwrite:
             raise OSError('Destination already exists: not overwriting it')
 
+        self._invalidate_metadata_cache()
         return self.sftp.put(localpath, remotepath, callback=callback)
 
     def puttree(self, localpath, remotepath, callback=None, dereference=True, overwrite=True):  # pylint: disable=too-many-branches,arguments-differ,unused-argument
@@ -1008,9 +1116,18 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         Returns the object Fileattribute, specified in aiida.transports
         Receives in input the path of a given file.
         """
+        return self._convert_attribute(self.sftp.lstat(path))
+
+    @staticmethod
+    def _convert_attribute(paramiko_attr):
+        """
+        Convert the attributes of a file returned by paramiko into a FileAttribute.
+
+        :param paramiko_attr: a `paramiko.SFTPAttributes` instance
+        :return: a :class:`aiida.transports.util.FileAttribute` instance
+        """
         from aiida.transports.util import FileAttribute
 
-        paramiko_attr = self.sftp.lstat(path)
         aiida_attr = FileAttribute()
         # map the paramiko class into the aiida one
         # note that paramiko object contains more informations than the aiida
@@ -1129,7 +1246,7 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
                              Unix only. (Use to emulate ``ls *`` for example)
         """
         if not pattern:
-            return self.sftp.listdir(path)
+            return [attribute.filename for attribute in self._listdir_attr(path)]
         import re
         if path.startswith('/'):
             base_dir = path
@@ -1141,10 +1258,40 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
             base_dir += '/'
         return [re.sub(base_dir, '', i) for i in filtered_list]
 
+    def listdir_withattributes(self, path='.', pattern=None):
+        """
+        Return a list of the entries in the given path together with their attributes.
+
+        Differently from the generic implementation, the attributes of all entries are retrieved with a single
+        `listdir_attr` call. Only for entries that are symbolic links an additional call is needed to determine whether
+        they point to a directory.
+
+        :param str path: path to list (default to '.')
+        :param str pattern: if used, only the entries whose name matches the Unix style pattern are returned
+        :return: a list of dictionaries, one per entry, see :py:meth:`Transport.listdir_withattributes`
+        """
+        retlist = []
+
+        for paramiko_attr in self._listdir_attr(path):
+            name = paramiko_attr.filename
+
+            if pattern and not fnmatch.fnmatch(name, pattern):
+                continue
+
+            if S_ISLNK(paramiko_attr.st_mode):
+                isdir = self.isdir(os.path.join(path, name))
+            else:
+                isdir = S_ISDIR(paramiko_attr.st_mode)
+
+            retlist.append({'name': name, 'attributes': self._convert_attribute(paramiko_attr), 'isdir': isdir})
+
+        return retlist
+
     def remove(self, path):
         """
         Remove a single file at 'path'
         """
+        self._invalidate_metadata_cache()
         return self.sftp.remove(path)
 
     def rename(self, oldpath, newpath):
@@ -1168,6 +1315,7 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
             if not self.isdir(newpath):
                 raise IOError('Destination {} does not exist'.format(newpath))
 
+        self._invalidate_metadata_cache()
         return self.sftp.rename(oldpath, newpath)
 
     def isfile(self, path):
@@ -1181,13 +1329,9 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         if not path:
             return False
         try:
-            self.logger.debug(
-                "stat for path '{}' ('{}'): {} [{}]".format(
-                    path, self.sftp.normalize(path), self.sftp.stat(path),
-                    self.sftp.stat(path).st_mode
-                )
-            )
-            return S_ISREG(self.sftp.stat(path).st_mode)
+            attributes = self._stat(path)
+            self.logger.debug("stat for path '{}': {} [{}]".format(path, attributes, attributes.st_mode))
+            return S_ISREG(attributes.st_mode)
         except IOError as exc:
             if getattr(exc, 'errno', None) == 2:
                 # errno=2 means path does not exist: I return False
@@ -1216,6 +1360,9 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
             plus the methods provided by paramiko, and channel is a
             paramiko.Channel object.
         """
+        # The command can modify anything on the remote
+        self._invalidate_metadata_cache()
+
         channel = self.sshclient.get_transport().open_session()
         channel.set_combine_stderr(combine_stderr)
 
@@ -1246,7 +1393,7 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
 
         :param command: the command to execute
         :param stdin: (optional,default=None) can be a string or a
-                   file-like object.
+                   file-like object, in text or binary mode.
         :param combine_stderr: (optional, default=False) see docstring of
                    self._exec_command_internal()
         :param bufsize: same meaning of paramiko.
@@ -1263,8 +1410,9 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
                 filelike_stdin = stdin
 
             try:
-                for line in filelike_stdin.readlines():
-                    ssh_stdin.write(line)
+                # Read the input in chunks, such that large binary streams do not have to be loaded in memory at once
+                for chunk in iter(lambda: filelike_stdin.read(STDIN_CHUNK_SIZE), filelike_stdin.read(0)):
+                    ssh_stdin.write(chunk)
             except AttributeError:
                 raise ValueError('stdin can only be either a string of a file-like object!')
 
@@ -1335,8 +1483,10 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
             for this_source in self.glob(source):
                 # create the name of the link: take the last part of the path
                 this_dest = os.path.join(remotedestination, os.path.split(this_source)[-1])
+                self._invalidate_metadata_cache()
                 self.sftp.symlink(this_source, this_dest)
         else:
+            self._invalidate_metadata_cache()
             self.sftp.symlink(source, dest)
 
     def path_exists(self, path):
@@ -1345,7 +1495,7 @@ class SshTransport(Transport):  # pylint: disable=too-many-public-methods
         """
         import errno
         try:
-            self.sftp.stat(path)
+            self._stat(path)
         except IOError as exc:
             if exc.errno == errno.ENOENT:
                 return False
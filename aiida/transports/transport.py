@@ -9,6 +9,7 @@
 ###########################################################################
 """Transport interface."""
 import abc
+import contextlib
 import os
 import re
 import fnmatch
@@ -20,6 +21,9 @@ from aiida.common.lang import classproperty
 
 __all__ = ('Transport',)
 
+# Size in bytes of the chunks in which file-like objects passed as the `stdin` of a command are written
+STDIN_CHUNK_SIZE = 2**16
+
 
 def validate_positive_number(ctx, param, value):  # pylint: disable=unused-argument
     """Validate that the number passed to this parameter is a positive number.
@@ -121,6 +125,14 @@ class Transport(abc.ABC):
         """
         raise NotImplementedError
 
+    def keep_alive(self):
+        """
+        Keep the connection of an open transport alive while it is not being used.
+
+        This is called periodically for transports that are kept open to be reused. The default implementation does
+        nothing, transports that can be dropped by the remote when idle should override it.
+        """
+
     def __repr__(self):
         return '<{}: {}>'.format(self.__class__.__name__, str(self))
 
@@ -228,6 +240,18 @@ class Transport(abc.ABC):
         """
         return self._safe_open_interval
 
+    @contextlib.contextmanager
+    def metadata_cache(self):
+        """
+        Return a context manager within which the transport may cache the metadata of remote paths.
+
+        Transports for which querying the metadata of paths is costly, for example because it requires a round trip to
+        a remote machine, can cache the results of calls like `isdir`, `isfile`, `path_exists` and `listdir` within the
+        context, until an operation of the transport modifies the remote. This is useful for sequences of operations
+        that inspect many paths, such as globbing. By default, nothing is cached.
+        """
+        yield self
+
     def chdir(self, path):
         """
         Change directory to 'path'
@@ -380,6 +404,7 @@ class Transport(abc.ABC):
         self.getcwd), if this is not None.
 
         :param str command: execute the command given as a string
+        :param stdin: (optional) a string or a file-like object, in text or binary mode, to pass as the input
         :return: a list: the retcode (int), stdout (str) and stderr (str).
         """
         raise NotImplementedError
@@ -487,7 +512,7 @@ class Transport(abc.ABC):
         """
         raise NotImplementedError
 
-    def listdir_withattributes(self, path='.', pattern=None):  # pylint: disable=unused-argument
+    def listdir_withattributes(self, path='.', pattern=None):
         """
         Return a list of the names of the entries in the given path.
         The list is in arbitrary order. It does not include the special
@@ -511,8 +536,8 @@ class Transport(abc.ABC):
             transport.get_attribute(); isdir is a boolean indicating if the object is a directory or not.
         """
         retlist = []
-        full_path = self.getcwd()
-        for file_name in self.listdir():
+        full_path = os.path.join(self.getcwd(), path)
+        for file_name in self.listdir(path, pattern):
             filepath = os.path.join(full_path, file_name)
             attributes = self.get_attribute(filepath)
             retlist.append({'name': file_name, 'attributes': attributes, 'isdir': self.isdir(filepath)})
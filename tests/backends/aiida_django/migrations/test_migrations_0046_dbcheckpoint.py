@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+# pylint: disable=import-error,no-name-in-module,invalid-name
+"""Test the migration that moves the checkpoints of processes out of the node attributes into a dedicated table."""
+
+from django.db import connection
+
+from .test_migrations_common import TestMigrations
+
+
+class TestCheckpointTableMigration(TestMigrations):
+    """Test the migration that moves the checkpoints of processes out of the node attributes into a dedicated table."""
+
+    migrate_from = '0045_dbnode_extras_hash_index'
+    migrate_to = '0046_dbcheckpoint'
+
+    def setUpBeforeMigration(self):
+        attributes = {'process_state': 'waiting', 'checkpoints': 'checkpoint', 'checkpoint_deltas': ['first', 'second']}
+        node_deltas = self.DbNode(node_type='process.workflow.workchain.WorkChainNode.', user_id=self.default_user.id)
+        node_deltas.attributes = attributes
+        node_deltas.save()
+
+        node = self.DbNode(node_type='process.workflow.workchain.WorkChainNode.', user_id=self.default_user.id)
+        node.attributes = {'checkpoints': 'other'}
+        node.save()
+
+        self.node_deltas_id = node_deltas.id
+        self.node_id = node.id
+
+    def test_checkpoints_moved(self):
+        """Verify that the checkpoints are moved to the new table, in order, and removed from the attributes."""
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT dbnode_id, checkpoint FROM db_dbcheckpoint ORDER BY id')
+            checkpoints = cursor.fetchall()
+
+        self.assertEqual([checkpoint for node_id, checkpoint in checkpoints if node_id == self.node_deltas_id],
+                         ['checkpoint', 'first', 'second'])
+        self.assertEqual([checkpoint for node_id, checkpoint in checkpoints if node_id == self.node_id], ['other'])
+        self.assertEqual(self.load_node(self.node_deltas_id).attributes, {'process_state': 'waiting'})
+        self.assertEqual(self.load_node(self.node_id).attributes, {})
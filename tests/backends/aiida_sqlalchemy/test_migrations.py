@@ -1708,3 +1708,86 @@ class TestGroupTypeStringMigration(TestMigrationsSQLA):
                 self.assertEqual(group_autorun.type_string, 'core.auto')
             finally:
                 session.close()
+
+
+class TestNodeExtrasHashIndexMigration(TestMigrationsSQLA):
+    """Test the migration that adds an index on the `_aiida_hash` extra of nodes."""
+
+    migrate_from = 'bf591f31dd12'  # bf591f31dd12_dbgroup_type_string.py
+    migrate_to = '126074a07c81'  # 126074a07c81_dbnode_extras_hash_index.py
+
+    def test_index_created(self):
+        """Verify that the index has been created."""
+        with self.get_session() as session:
+            result = session.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'db_dbnode'")
+            indexes = [row[0] for row in result]
+
+        self.assertIn('ix_db_dbnode_extras_aiida_hash', indexes)
+
+
+class TestCheckpointTableMigration(TestMigrationsSQLA):
+    """Test the migration that moves the checkpoints of processes out of the node attributes into a dedicated table."""
+
+    migrate_from = '126074a07c81'  # 126074a07c81_dbnode_extras_hash_index.py
+    migrate_to = '4357741816f4'  # 4357741816f4_dbcheckpoint.py
+
+    def setUpBeforeMigration(self):
+        from sqlalchemy.orm import Session  # pylint: disable=import-error,no-name-in-module
+
+        DbNode = self.get_auto_base().classes.db_dbnode  # pylint: disable=invalid-name
+        DbUser = self.get_auto_base().classes.db_dbuser  # pylint: disable=invalid-name
+
+        with sa.ENGINE.begin() as connection:
+            try:
+                session = Session(connection.engine)
+
+                user = DbUser(email='{}@aiida.net'.format(self.id()))
+                session.add(user)
+                session.commit()
+
+                node_deltas = DbNode(
+                    node_type='process.workflow.workchain.WorkChainNode.',
+                    user_id=user.id,
+                    attributes={
+                        'process_state': 'waiting',
+                        'checkpoints': 'checkpoint',
+                        'checkpoint_deltas': ['first', 'second']
+                    }
+                )
+                node = DbNode(
+                    node_type='process.workflow.workchain.WorkChainNode.',
+                    user_id=user.id,
+                    attributes={'checkpoints': 'other'}
+                )
+                session.add(node_deltas)
+                session.add(node)
+                session.commit()
+
+                self.node_deltas_id = node_deltas.id
+                self.node_id = node.id
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                session.close()
+
+    def test_checkpoints_moved(self):
+        """Verify that the checkpoints are moved to the new table, in order, and removed from the attributes."""
+        DbNode = self.get_current_table('db_dbnode')  # pylint: disable=invalid-name
+
+        with self.get_session() as session:
+            try:
+                result = session.execute('SELECT dbnode_id, checkpoint FROM db_dbcheckpoint ORDER BY id')
+                checkpoints = [tuple(row) for row in result]
+
+                self.assertEqual([checkpoint for node_id, checkpoint in checkpoints if node_id == self.node_deltas_id],
+                                 ['checkpoint', 'first', 'second'])
+                self.assertEqual([checkpoint for node_id, checkpoint in checkpoints if node_id == self.node_id],
+                                 ['other'])
+
+                node_deltas = session.query(DbNode).filter(DbNode.id == self.node_deltas_id).one()
+                node = session.query(DbNode).filter(DbNode.id == self.node_id).one()
+                self.assertEqual(node_deltas.attributes, {'process_state': 'waiting'})
+                self.assertEqual(node.attributes, {})
+            finally:
+                session.close()
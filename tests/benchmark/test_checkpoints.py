@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmarks for saving and loading process checkpoints with a large context.
+
+The size of the serialized checkpoint is recorded in the `extra_info` of each benchmark, to compare the compact
+checkpoint encoding with the legacy yaml serialization.
+"""
+# pylint: disable=redefined-outer-name
+import pytest
+from plumpy import Bundle
+
+from aiida.common.extendeddicts import AttributeDict
+from aiida.orm.utils import serialize
+
+pytest.importorskip('pytest_benchmark')
+
+NUMBER_OF_ITEMS = 2000
+
+FORMATS = {
+    'yaml': (serialize.serialize, serialize.deserialize),
+    'checkpoint': (serialize.serialize_checkpoint, serialize.deserialize_checkpoint),
+}
+
+
+@pytest.fixture(scope='module')
+def large_bundle():
+    """Return a checkpoint bundle of a process with a large context."""
+    ctx = AttributeDict()
+    ctx.iteration = NUMBER_OF_ITEMS
+    ctx.results = [{
+        'energy': -1.5 * index,
+        'forces': [[0.1, 0.2, 0.3]] * 4,
+        'label': 'item'
+    } for index in range(NUMBER_OF_ITEMS)]
+    ctx.mapping = {'key_{}'.format(index): (index, str(index)) for index in range(NUMBER_OF_ITEMS)}
+
+    bundle = Bundle.__new__(Bundle)
+    bundle.update({'CLASS_NAME': 'WorkChain', '_context': ctx, '_state': {'name': 'waiting'}})
+    return bundle
+
+
+@pytest.mark.parametrize('encoding', FORMATS)
+@pytest.mark.benchmark(group='checkpoint-save')
+def test_save_checkpoint(benchmark, large_bundle, encoding):
+    """Benchmark serializing a checkpoint with a large context."""
+    serializer, _ = FORMATS[encoding]
+    serialized = benchmark.pedantic(serializer, args=(large_bundle,), rounds=3)
+    benchmark.extra_info['size_bytes'] = len(serialized)
+
+
+@pytest.mark.parametrize('encoding', FORMATS)
+@pytest.mark.benchmark(group='checkpoint-load')
+def test_load_checkpoint(benchmark, large_bundle, encoding):
+    """Benchmark deserializing a checkpoint with a large context."""
+    serializer, deserializer = FORMATS[encoding]
+    serialized = serializer(large_bundle)
+    deserialized = benchmark.pedantic(deserializer, args=(serialized,), rounds=3)
+    assert deserialized['_context'] == large_bundle['_context']
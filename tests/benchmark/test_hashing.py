@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmarks for hashing the contents of a folder.
+
+The peak memory allocated while hashing is recorded in the `extra_info` of each benchmark, to compare the chunked
+hashing of file contents with reading the full content of the file into memory.
+"""
+import os
+import tracemalloc
+
+import pytest
+
+from aiida.common.folders import SandboxFolder
+from aiida.common.hashing import make_hash, _single_digest, _single_digest_from_filelike
+
+pytest.importorskip('pytest_benchmark')
+
+FILE_SIZE = 2**26
+
+
+@pytest.fixture(scope='module')
+def large_folder():
+    """Return a sandbox folder that contains a single large file."""
+    with SandboxFolder(sandbox_in_repo=False) as folder:
+        with folder.open('large', 'wb') as handle:
+            for _ in range(FILE_SIZE // 2**20):
+                handle.write(os.urandom(2**20))
+        yield folder
+
+
+def run_traced(benchmark, function, *args):
+    """Run the benchmark for the given function and record the peak of the traced memory allocations."""
+    tracemalloc.start()
+    try:
+        result = benchmark.pedantic(function, args=args, rounds=3)
+        benchmark.extra_info['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+@pytest.mark.benchmark(group='hashing')
+def test_hash_file_read_full(benchmark, large_folder):
+    """Benchmark hashing the file content by reading it into memory at once."""
+
+    def digest():
+        with large_folder.open('large', 'rb') as handle:
+            return _single_digest('fcontent', handle.read())
+
+    run_traced(benchmark, digest)
+    assert benchmark.extra_info['peak_memory_bytes'] >= FILE_SIZE
+
+
+@pytest.mark.benchmark(group='hashing')
+def test_hash_file_chunked(benchmark, large_folder):
+    """Benchmark hashing the file content by streaming it in chunks."""
+
+    def digest():
+        with large_folder.open('large', 'rb') as handle:
+            return _single_digest_from_filelike('fcontent', handle)
+
+    run_traced(benchmark, digest)
+    assert benchmark.extra_info['peak_memory_bytes'] < FILE_SIZE // 16
+
+
+@pytest.mark.benchmark(group='hashing')
+def test_hash_folder(benchmark, large_folder):
+    """Benchmark hashing a folder with a large file through `make_hash`."""
+    run_traced(benchmark, make_hash, large_folder)
+    assert benchmark.extra_info['peak_memory_bytes'] < FILE_SIZE // 16
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmarks for storing many small nodes.
+
+The time per node is recorded in the `extra_info` of each benchmark, to compare storing the nodes one at a time with
+storing them in bulk through `Node.objects.store_many`.
+"""
+import pytest
+
+from aiida.orm import Dict, Int, Node
+
+pytest.importorskip('pytest_benchmark')
+
+NUMBER_OF_NODES = 10000
+
+
+def create_nodes():
+    """Return the arguments for the benchmarked function: a list of unstored small `Int` and `Dict` nodes."""
+    nodes = []
+    for index in range(NUMBER_OF_NODES // 2):
+        nodes.append(Int(index))
+        nodes.append(Dict(dict={'index': index, 'label': 'node'}))
+    return (nodes,), {}
+
+
+def store_one_by_one(nodes):
+    """Store the nodes one at a time."""
+    for node in nodes:
+        node.store()
+
+
+def run_per_node(benchmark, function):
+    """Run the benchmark for the given function and record the mean time it took to store a single node."""
+    benchmark.pedantic(function, setup=create_nodes, rounds=1)
+    benchmark.extra_info['seconds_per_node'] = benchmark.stats.stats.mean / NUMBER_OF_NODES
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+@pytest.mark.benchmark(group='store-nodes')
+def test_store_one_by_one(benchmark):
+    """Benchmark storing many small nodes one at a time."""
+    run_per_node(benchmark, store_one_by_one)
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+@pytest.mark.benchmark(group='store-nodes')
+def test_store_many(benchmark):
+    """Benchmark storing many small nodes in bulk."""
+    run_per_node(benchmark, Node.objects.store_many)  # pylint: disable=no-member
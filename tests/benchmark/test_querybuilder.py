@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Benchmarks for building a small query with the `QueryBuilder` compared to executing it.
+
+The query is of the kind that is issued in tight loops, e.g. by `load_node`, to compare the time spent building the
+query from scratch and reusing the compiled query from the cache with the time spent executing it in the database.
+"""
+# pylint: disable=protected-access,redefined-outer-name
+import pytest
+
+from aiida.orm import Data, QueryBuilder
+from aiida.orm.querybuilder import COMPILED_QUERY_CACHE
+
+pytest.importorskip('pytest_benchmark')
+
+ROUNDS = 1000
+
+
+@pytest.fixture
+def node(clear_database_before_test):  # pylint: disable=unused-argument
+    """Return a stored node to query for."""
+    return Data().store()
+
+
+def create_builder(node):
+    """Return the setup function of the benchmarks, which returns a new builder that queries the given node."""
+
+    def setup():
+        builder = QueryBuilder().append(Data, filters={'id': node.pk}, project=['id', 'uuid'])
+        return (builder,), {}
+
+    return setup
+
+
+@pytest.mark.benchmark(group='querybuilder')
+def test_build_query(benchmark, node):
+    """Benchmark building the query from scratch."""
+
+    def build(builder):
+        return builder._build_query(builder._filters)
+
+    benchmark.pedantic(build, setup=create_builder(node), rounds=ROUNDS)
+
+
+@pytest.mark.benchmark(group='querybuilder')
+def test_build_query_cached(benchmark, node):
+    """Benchmark building the query when the compiled query is reused from the cache."""
+    COMPILED_QUERY_CACHE.clear()
+    benchmark.pedantic(lambda builder: builder._build(), setup=create_builder(node), rounds=ROUNDS)
+    assert len(COMPILED_QUERY_CACHE) == 1
+
+
+@pytest.mark.benchmark(group='querybuilder')
+def test_execute_query(benchmark, node):
+    """Benchmark executing the query that has already been built."""
+
+    def setup():
+        (builder,), _ = create_builder(node)()
+        return (builder.get_query(),), {}
+
+    result = benchmark.pedantic(lambda query: query.all(), setup=setup, rounds=ROUNDS)
+    assert [row[0] for row in result] == [node.pk]
@@ -579,6 +579,36 @@ class TestVerdiRehash(AiidaTestCase):
         self.assertClickResultNoException(result)
         self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
 
+    def test_rehash_batches_processes(self):
+        """Computing the hashes in multiple processes and batches should store the correct hash for all nodes."""
+        from aiida.orm import load_node
+
+        nodes = [self.node_base, self.node_bool_true, self.node_bool_false, self.node_float, self.node_int]
+
+        for node in nodes:
+            node.clear_hash()
+
+        options = ['-f', '--processes', '2', '--batch-size', '2']
+        result = self.cli_runner.invoke(cmd_node.rehash, options)
+        self.assertClickResultNoException(result)
+        self.assertTrue('{} nodes'.format(len(nodes)) in result.output)
+
+        for node in nodes:
+            self.assertEqual(load_node(node.pk).get_extra('_aiida_hash'), node.get_hash())
+
+    def test_rehash_resume(self):
+        """Resuming a rehash should only rehash the nodes after the checkpoint and then remove the checkpoint."""
+        from aiida.manage.database.rehash import get_rehash_checkpoint, set_rehash_checkpoint
+
+        expected_node_count = 2
+        set_rehash_checkpoint(self.node_bool_false.pk)
+
+        options = ['-f', '--resume']
+        result = self.cli_runner.invoke(cmd_node.rehash, options)
+        self.assertClickResultNoException(result)
+        self.assertTrue('{} nodes'.format(expected_node_count) in result.output)
+        self.assertIsNone(get_rehash_checkpoint())
+
     def test_rehash_entry_point_no_matches(self):
         """Limiting the queryset by defining explicit entry point, with no nodes should exit with non-zero status."""
         options = ['-f', '-e', 'aiida.data:structure']
@@ -24,7 +24,7 @@ try:
 except ImportError:
     import unittest
 
-from aiida.common.hashing import make_hash, float_to_text
+from aiida.common.hashing import make_hash, float_to_text, _single_digest, _single_digest_from_filelike
 from aiida.common.folders import SandboxFolder
 from aiida.backends.testbase import AiidaTestCase
 from aiida.orm import Dict
@@ -172,6 +172,27 @@ class MakeHashTest(unittest.TestCase):
         )  # pylint: disable=no-member
         self.assertEqual(make_hash(np.int64(42)), '9468692328de958d7a8039e8a2eb05cd6888b7911bbc3794d0dfebd8df3482cd')  # pylint: disable=no-member
 
+    def test_numpy_arrays(self):
+        """Test that arrays are hashed through their dtype, shape and data."""
+        array = np.arange(6, dtype='<i8').reshape(2, 3)
+        self.assertEqual(make_hash(array), '29a47aa52e490e320212fe71a7707e77e069ce6722966d7b2393b26dcce013f6')
+
+        # Non-contiguous views are hashed the same as a contiguous copy
+        self.assertEqual(make_hash(array.T), make_hash(np.ascontiguousarray(array.T)))
+
+        # Same data with a different shape or dtype should give a different hash
+        self.assertNotEqual(make_hash(array), make_hash(array.reshape(3, 2)))
+        self.assertNotEqual(make_hash(array), make_hash(array.astype('<i4')))
+
+        # Arrays whose dtype cannot be exported as a buffer are hashed through their bytes
+        dates = np.array(['2020-01-01', '2020-01-02'], dtype='datetime64[D]')
+        self.assertEqual(make_hash(dates), make_hash(dates.copy()))
+        self.assertNotEqual(make_hash(dates), make_hash(dates.astype('<i8')))
+        self.assertNotEqual(make_hash(np.array(1, dtype='m8[s]')), make_hash(np.array(2, dtype='m8[s]')))
+
+        # Object arrays are hashed through their elements
+        self.assertEqual(make_hash(np.array([1, 'a'], dtype=object)), make_hash(np.array([1, 'a'], dtype=object)))
+
     def test_unhashable_type(self):
 
         class MadeupClass:
@@ -210,6 +231,19 @@ class MakeHashTest(unittest.TestCase):
             self.assertNotEqual(make_hash(folder), folder_hash)
             self.assertEqual(make_hash(folder, ignored_folder_content=['file3.npy', 'some_subdir']), folder_hash)
 
+    def test_folder_large_file(self):
+        """Test that file contents that are hashed in chunks give the same digest as hashing the content at once."""
+        content = bytes(range(256)) * 1000
+
+        with SandboxFolder(sandbox_in_repo=False) as folder:
+            with folder.open('file', 'wb') as fhandle:
+                fhandle.write(content)
+
+            with folder.open('file', 'rb') as fhandle:
+                digest = _single_digest_from_filelike('fcontent', fhandle, chunk_size=1000)
+
+            self.assertEqual(digest, _single_digest('fcontent', content))
+
 
 class CheckDBRoundTrip(AiidaTestCase):
     """
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the :py:mod:`~aiida.common.objectstore` module."""
+import hashlib
+import io
+import os
+
+import pytest
+
+from aiida.common.objectstore import ObjectStore
+
+
+@pytest.fixture
+def object_store(tmp_path):
+    """Return an `ObjectStore` in a temporary directory."""
+    return ObjectStore(str(tmp_path / 'objectstore'))
+
+
+def count_loose_objects(store):
+    """Return the number of loose objects in the given object store."""
+    return sum(len(files) for _, _, files in os.walk(os.path.join(store.basepath, 'loose')))
+
+
+def test_add_object(object_store):
+    """Test that objects are keyed on the hash of their content and deduplicated."""
+    content = b'some content'
+    hashkey = object_store.add_object(io.BytesIO(content))
+
+    assert hashkey == hashlib.sha256(content).hexdigest()
+    assert object_store.has_object(hashkey)
+    assert object_store.add_object(io.BytesIO(content)) == hashkey
+    assert count_loose_objects(object_store) == 1
+
+    with object_store.open_object(hashkey) as handle:
+        assert handle.read() == content
+
+
+def test_add_object_text(object_store):
+    """Test that the content of a file-like object in text mode is encoded while it is streamed."""
+    content = 'ünïcode ' * 10000
+
+    for encoding in ['utf8', 'utf16']:
+        hashkey = object_store.add_object(io.StringIO(content), encoding=encoding)
+        assert hashkey == hashlib.sha256(content.encode(encoding)).hexdigest()
+
+        with object_store.open_object(hashkey) as handle:
+            assert handle.read().decode(encoding) == content
+
+
+def test_index(tmp_path):
+    """Test that the index is kept in the given folder and named after the UUID of the object store."""
+    basepath = str(tmp_path / 'objectstore')
+    object_store = ObjectStore(basepath, str(tmp_path / 'index'))
+
+    assert os.path.isfile(str(tmp_path / 'index' / '{}.sqlite'.format(object_store.uuid)))
+    assert not [filename for filename in os.listdir(basepath) if filename.endswith('.sqlite')]
+    assert ObjectStore(basepath, str(tmp_path / 'index')).uuid == object_store.uuid
+
+    object_store.set_manifest('uuid', {'': None})
+    assert ObjectStore(basepath, str(tmp_path / 'index')).get_manifest('uuid') == {'': None}
+
+
+def test_open_object_not_existing(object_store):
+    """Test that opening a non-existing object raises."""
+    with pytest.raises(IOError):
+        object_store.open_object('0' * 64)
+
+
+def test_pack_loose_objects(object_store):
+    """Test that packed objects are still accessible and that the loose objects are removed."""
+    contents = [b'first', b'second', b'third' * 1000]
+    hashkeys = [object_store.add_object(io.BytesIO(content)) for content in contents]
+
+    assert object_store.pack_loose_objects() == len(contents)
+    assert count_loose_objects(object_store) == 0
+
+    for hashkey, content in zip(hashkeys, contents):
+        assert object_store.has_object(hashkey)
+        with object_store.open_object(hashkey) as handle:
+            assert handle.read() == content
+
+        with io.TextIOWrapper(object_store.open_object(hashkey), encoding='utf8') as handle:
+            assert handle.read() == content.decode('utf8')
+
+    # Adding an object that already has been packed creates a loose duplicate, which is removed when packing again
+    pack_size = os.path.getsize(os.path.join(object_store.basepath, 'packs', '0.pack'))
+    object_store.add_object(io.BytesIO(contents[0]))
+    assert count_loose_objects(object_store) == 1
+    assert object_store.pack_loose_objects() == 1
+    assert count_loose_objects(object_store) == 0
+    assert os.path.getsize(os.path.join(object_store.basepath, 'packs', '0.pack')) == pack_size
+
+
+def test_manifest(object_store):
+    """Test setting, updating and deleting the manifest of a node."""
+    uuid = 'a6f7b7a8-5ed1-4f8c-8d7a-3b2a1ad15e4f'
+    hashkey = object_store.add_object(io.BytesIO(b'content'))
+
+    assert object_store.get_manifest(uuid) is None
+
+    object_store.set_manifest(uuid, {'': None, 'file.txt': hashkey})
+    assert object_store.get_manifest(uuid) == {'': None, 'file.txt': hashkey}
+
+    object_store.update_manifest(uuid, {'sub': None, os.path.join('sub', 'file.txt'): hashkey})
+    assert len(object_store.get_manifest(uuid)) == 4
+
+    object_store.delete_manifest_entries(uuid, ['sub', os.path.join('sub', 'file.txt')])
+    assert object_store.get_manifest(uuid) == {'': None, 'file.txt': hashkey}
+
+    object_store.delete_manifest(uuid)
+    assert object_store.get_manifest(uuid) is None
+
+
+def test_delete_unreferenced_objects(object_store):
+    """Test that only objects that are not referenced by any manifest are deleted."""
+    referenced = object_store.add_object(io.BytesIO(b'referenced'))
+    unreferenced = object_store.add_object(io.BytesIO(b'unreferenced'))
+    object_store.set_manifest('uuid', {'': None, 'file.txt': referenced})
+
+    # Recently written objects may belong to a node that is being stored and are therefore kept
+    assert object_store.delete_unreferenced_objects() == 0
+    assert object_store.has_object(unreferenced)
+
+    assert object_store.delete_unreferenced_objects(grace_period=-1) == 1
+    assert object_store.has_object(referenced)
+    assert not object_store.has_object(unreferenced)
@@ -120,3 +120,113 @@ class TestSerialize(AiidaTestCase):
         deserialized = serialize.deserialize(serialized)
 
         self.assertEqual(attribute_dict, deserialized)
+
+    def test_checkpoint_round_trip(self):
+        """Test the round trip of a checkpoint bundle through the compact checkpoint encoding."""
+        import datetime
+        from plumpy import Bundle
+        from plumpy.utils import AttributesFrozendict
+        from aiida.common.extendeddicts import AttributeDict
+
+        node = orm.Data().store()
+        group = orm.Group(label='checkpoint').store()
+
+        ctx = AttributeDict()
+        ctx.node = node
+        ctx.nodes = [node, {'group': group, 'computer': self.computer}]
+        ctx.tuple = (1, 'two', None)
+        ctx.mapping = {('Si',): 1, 2: 'b'}
+        ctx.tagged = {'!': 'node', 'v': 'not a uuid'}
+        ctx.time = datetime.datetime(2020, 1, 1, 12, 0)
+        ctx.set = {1, 2}
+
+        bundle = Bundle.__new__(Bundle)
+        bundle.update({'ctx': ctx, 'inputs': AttributesFrozendict({'x': 1.5, 'flag': True})})
+
+        serialized = serialize.serialize_checkpoint(bundle)
+        self.assertTrue(serialized.startswith(serialize.CHECKPOINT_HEADER))
+
+        deserialized = serialize.deserialize_checkpoint(serialized)
+        ctx = deserialized['ctx']
+
+        self.assertIsInstance(deserialized, Bundle)
+        self.assertIsInstance(ctx, AttributeDict)
+        self.assertIsInstance(deserialized['inputs'], AttributesFrozendict)
+        self.assertEqual(deserialized['inputs'], bundle['inputs'])
+        self.assertEqual(ctx.node.uuid, node.uuid)
+        self.assertEqual(ctx.nodes[1]['group'].uuid, group.uuid)
+        self.assertEqual(ctx.nodes[1]['computer'].uuid, self.computer.uuid)  # pylint: disable=no-member
+        self.assertEqual(ctx.tuple, (1, 'two', None))
+        self.assertEqual(ctx.mapping, {('Si',): 1, 2: 'b'})
+        self.assertEqual(ctx.tagged, {'!': 'node', 'v': 'not a uuid'})
+        self.assertEqual(ctx.time, datetime.datetime(2020, 1, 1, 12, 0))
+        self.assertEqual(ctx.set, {1, 2})
+
+    def test_checkpoint_legacy(self):
+        """Test that checkpoints that were serialized to yaml can still be deserialized."""
+        from plumpy import Bundle
+
+        node = orm.Data().store()
+        bundle = Bundle.__new__(Bundle)
+        bundle.update({'ctx': {'node': node, 'value': 1}})
+
+        deserialized = serialize.deserialize_checkpoint(serialize.serialize(bundle))
+        self.assertIsInstance(deserialized, Bundle)
+        self.assertEqual(deserialized['ctx']['node'].uuid, node.uuid)
+        self.assertEqual(deserialized['ctx']['value'], 1)
+
+        with self.assertRaises(ValueError):
+            serialize.deserialize_checkpoint('{}{}\n{{}}'.format(serialize.CHECKPOINT_HEADER, 0))
+
+    def test_checkpoint_delta(self):
+        """Test that a checkpoint with deltas deserializes to the last checkpoint bundle."""
+        from plumpy import Bundle
+        from aiida.common.extendeddicts import AttributeDict
+
+        node = orm.Data().store()
+
+        def get_bundle(ctx, step):
+            bundle = Bundle.__new__(Bundle)
+            bundle.update({'ctx': AttributeDict(ctx), 'step': step})
+            return bundle
+
+        first = get_bundle({'results': [node], 'removed': 1, 'value': 'a'}, 0)
+        second = get_bundle({'results': [node, 2, {'x': 3}], 'value': (1, 2), 'added': {4: node}}, 1)
+
+        delta = serialize.get_checkpoint_context_delta(
+            serialize.encode_checkpoint_context(first['ctx']), serialize.encode_checkpoint_context(second['ctx'])
+        )
+        self.assertEqual(delta['delete'], ['removed'])
+        self.assertEqual(sorted(delta['set']), ['added', 'value'])
+        self.assertEqual(delta['extend'], {'results': [2, {'x': 3}]})
+
+        serialized = serialize.serialize_checkpoint(first)
+        deltas = [serialize.serialize_checkpoint_delta(second, 'ctx', delta)]
+        self.assertTrue(deltas[0].startswith(serialize.CHECKPOINT_DELTA_HEADER))
+
+        deserialized = serialize.deserialize_checkpoint(serialized, deltas)
+        self.assertIsInstance(deserialized, Bundle)
+        self.assertIsInstance(deserialized['ctx'], AttributeDict)
+        self.assertEqual(deserialized['step'], 1)
+        self.assertEqual(deserialized['ctx']['results'][0].uuid, node.uuid)
+        self.assertEqual(deserialized['ctx']['results'][1:], [2, {'x': 3}])
+        self.assertEqual(deserialized['ctx']['value'], (1, 2))
+        self.assertEqual(deserialized['ctx']['added'][4].uuid, node.uuid)
+        self.assertNotIn('removed', deserialized['ctx'])
+
+        with self.assertRaises(ValueError):
+            serialize.encode_checkpoint_context({1: 'a'})
+
+    def test_checkpoint_delta_types(self):
+        """Test that values that compare equal but differ in type, such as `True`, `1` and `1.0`, are recorded."""
+        first = {'flag': 1, 'value': 1, 'results': [1, {'a': True}], 'same': {'a': 1, 'b': [1.5]}}
+        second = {'flag': True, 'value': 1.0, 'results': [True, {'a': 1}, 2], 'same': {'b': [1.5], 'a': 1}}
+
+        delta = serialize.get_checkpoint_context_delta(
+            serialize.encode_checkpoint_context(first), serialize.encode_checkpoint_context(second)
+        )
+        self.assertEqual(delta['delete'], [])
+        self.assertEqual(sorted(delta['set']), ['flag', 'results', 'value'])
+        self.assertEqual(delta['extend'], {})
+        self.assertIs(delta['set']['flag'], True)
+        self.assertIsInstance(delta['set']['value'], float)
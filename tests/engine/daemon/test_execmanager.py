@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the :mod:`aiida.engine.daemon.execmanager` module."""
+# pylint: disable=redefined-outer-name
+import os
+from unittest import mock
+
+import pytest
+
+from aiida.engine.daemon import execmanager
+from aiida.orm import CalcJobNode
+from aiida.schedulers import SchedulerError
+from aiida.schedulers.plugins.direct import DirectScheduler
+from aiida.transports.plugins.local import LocalTransport
+
+
+@pytest.fixture
+def remote_workdir(tmp_path):
+    """Return a remote working directory with some files and a nested folder."""
+    workdir = tmp_path / 'remote'
+    (workdir / 'folder' / 'nested').mkdir(parents=True)
+    (workdir / 'file_a.txt').write_text('file_a')
+    (workdir / 'file_b.txt').write_text('file_b')
+    (workdir / 'folder' / 'file_c.txt').write_text('file_c')
+    (workdir / 'folder' / 'nested' / 'file_d.txt').write_text('file_d')
+    return workdir
+
+
+def get_tree(dirpath):
+    """Return the relative paths and contents of all the files in a directory."""
+    tree = {}
+
+    for root, _, filenames in os.walk(str(dirpath)):
+        for filename in filenames:
+            filepath = os.path.join(root, filename)
+            with open(filepath) as handle:
+                tree[os.path.relpath(filepath, str(dirpath))] = handle.read()
+
+    return tree
+
+
+RETRIEVE_LIST = [
+    'file_a.txt',
+    'non_existing.txt',
+    'folder',
+    '*_b.txt',
+    ['folder/nested/*.txt', 'nested', 2],
+    ['folder/file_c.txt', '.', 0],
+]
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+@pytest.mark.parametrize('archive_format', ('tar', 'gzip'))
+def test_retrieve_archive(tmp_path, remote_workdir, archive_format):
+    """Test that retrieving the files through an archive gives the same result as retrieving them one by one."""
+    calculation = CalcJobNode()
+    reference = tmp_path / 'reference'
+    retrieved = tmp_path / 'retrieved'
+    reference.mkdir()
+    retrieved.mkdir()
+
+    with LocalTransport() as transport:
+        transport.chdir(str(remote_workdir))
+        execmanager.retrieve_files_from_list(calculation, transport, str(reference), RETRIEVE_LIST, 'none')
+
+        with mock.patch.object(transport, 'get') as mock_get:
+            execmanager.retrieve_files_from_list(calculation, transport, str(retrieved), RETRIEVE_LIST, archive_format)
+
+        assert not mock_get.called
+        assert sorted(os.listdir(str(remote_workdir))) == ['file_a.txt', 'file_b.txt', 'folder']
+
+    assert get_tree(retrieved) == get_tree(reference)
+    assert get_tree(retrieved) == {
+        'file_a.txt': 'file_a',
+        'file_b.txt': 'file_b',
+        'file_c.txt': 'file_c',
+        os.path.join('folder', 'file_c.txt'): 'file_c',
+        os.path.join('folder', 'nested', 'file_d.txt'): 'file_d',
+        os.path.join('nested', 'nested', 'file_d.txt'): 'file_d',
+    }
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+def test_retrieve_archive_fallback(tmp_path, remote_workdir):
+    """Test that the files are retrieved one by one if the archive cannot be created on the remote."""
+    calculation = CalcJobNode()
+    retrieved = tmp_path / 'retrieved'
+    retrieved.mkdir()
+
+    with LocalTransport() as transport:
+        transport.chdir(str(remote_workdir))
+
+        with mock.patch.object(transport, 'exec_command_wait', return_value=(127, '', 'tar: command not found')):
+            execmanager.retrieve_files_from_list(
+                calculation, transport, str(retrieved), ['file_a.txt', 'folder'], 'tar'
+            )
+
+    assert get_tree(retrieved) == {
+        'file_a.txt': 'file_a',
+        os.path.join('folder', 'file_c.txt'): 'file_c',
+        os.path.join('folder', 'nested', 'file_d.txt'): 'file_d',
+    }
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+@pytest.mark.parametrize('retval, stderr', ((0, ''), (2, 'tar: write error: No space left on device')))
+def test_retrieve_archive_truncated(tmp_path, remote_workdir, retval, stderr):
+    """Test that the files are retrieved one by one if the archive created on the remote is truncated."""
+    calculation = CalcJobNode()
+    retrieved = tmp_path / 'retrieved'
+    retrieved.mkdir()
+
+    with LocalTransport() as transport:
+        transport.chdir(str(remote_workdir))
+        exec_command_wait = transport.exec_command_wait
+
+        def exec_command_truncated(command, stdin=None):
+            exec_command_wait(command, stdin=stdin)
+            for archive in remote_workdir.glob('.aiida_retrieve_*'):
+                content = archive.read_bytes()
+                archive.write_bytes(content[:len(content) // 2])
+            return retval, '', stderr
+
+        with mock.patch.object(transport, 'exec_command_wait', exec_command_truncated):
+            execmanager.retrieve_files_from_list(
+                calculation, transport, str(retrieved), ['file_a.txt', 'folder'], 'gzip'
+            )
+
+    assert get_tree(retrieved) == {
+        'file_a.txt': 'file_a',
+        os.path.join('folder', 'file_c.txt'): 'file_c',
+        os.path.join('folder', 'nested', 'file_d.txt'): 'file_d',
+    }
+    assert not list(remote_workdir.glob('.aiida_retrieve_*'))
+
+
+@pytest.fixture
+def upload_inputs(tmp_path):
+    """Return a local code, a sandbox folder and a local copy list to upload."""
+    from aiida.common.folders import Folder
+    from aiida.orm import Code, SinglefileData
+
+    (tmp_path / 'run.sh').write_text('#!/bin/bash')
+    (tmp_path / 'single.txt').write_text('single')
+
+    sandbox = tmp_path / 'sandbox'
+    (sandbox / 'sub').mkdir(parents=True)
+    (sandbox / 'input.txt').write_text('input')
+    (sandbox / 'sub' / 'nested.txt').write_text('nested')
+
+    code = Code(local_executable='run.sh', files=[str(tmp_path / 'run.sh')])
+    single = SinglefileData(file=str(tmp_path / 'single.txt'))
+    local_copy_objects = [(single, 'single.txt', 'copied.txt'), (single, 'single.txt', 'sub/input.txt')]
+
+    return [code], Folder(str(sandbox)), local_copy_objects
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+@pytest.mark.parametrize('archive_format', ('tar', 'gzip'))
+def test_upload_archive(tmp_path, upload_inputs, archive_format):
+    """Test that uploading the files through an archive gives the same result as uploading them one by one."""
+    import logging
+
+    input_codes, folder, local_copy_objects = upload_inputs
+    reference = tmp_path / 'reference'
+    uploaded = tmp_path / 'uploaded'
+    reference.mkdir()
+    uploaded.mkdir()
+
+    with LocalTransport() as transport:
+        transport.chdir(str(reference))
+        execmanager._upload_files(  # pylint: disable=protected-access
+            CalcJobNode(), transport, folder, input_codes, local_copy_objects, False, logging.getLogger()
+        )
+
+        transport.chdir(str(uploaded))
+
+        with mock.patch.object(transport, 'put') as mock_put:
+            assert execmanager._upload_files_as_archive(  # pylint: disable=protected-access
+                transport, folder, input_codes, local_copy_objects, archive_format
+            )
+
+        assert not mock_put.called
+
+    assert get_tree(uploaded) == get_tree(reference)
+    assert get_tree(uploaded) == {
+        'run.sh': '#!/bin/bash',
+        'input.txt': 'input',
+        'copied.txt': 'single',
+        os.path.join('sub', 'input.txt'): 'single',
+        os.path.join('sub', 'nested.txt'): 'nested',
+    }
+    assert os.access(str(uploaded / 'run.sh'), os.X_OK)
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+def test_upload_archive_closed_channel(upload_inputs):
+    """Test that the archive is not used if the remote command fails while the archive is still being streamed."""
+    input_codes, folder, local_copy_objects = upload_inputs
+
+    with open(folder.get_abs_path('large.bin'), 'wb') as handle:
+        handle.write(os.urandom(4 * 1024 * 1024))
+
+    def exec_command_wait(command, stdin=None):  # pylint: disable=unused-argument
+        stdin.read(1024)
+        raise OSError('Socket is closed')
+
+    with LocalTransport() as transport:
+        with mock.patch.object(transport, 'exec_command_wait', exec_command_wait):
+            assert not execmanager._upload_files_as_archive(  # pylint: disable=protected-access
+                transport, folder, input_codes, local_copy_objects, 'tar'
+            )
+
+
+class CustomSubmitScheduler(DirectScheduler):
+    """Scheduler that overrides the submission of a single script."""
+
+    def submit_from_script(self, working_directory, submit_script):
+        if working_directory == 'failing':
+            raise SchedulerError('submission failed')
+        return 'job-{}'.format(working_directory)
+
+    def submit_from_scripts(self, submissions):
+        raise AssertionError('a scheduler that overrides `submit_from_script` should not submit in a batch')
+
+
+def test_submit_calculations_custom_scheduler():
+    """Test that jobs are submitted one after the other if the scheduler overrides `submit_from_script`."""
+    scheduler = CustomSubmitScheduler()
+    calculations = []
+
+    for pk, workdir in enumerate(['first', 'failing', 'last']):
+        calculation = mock.Mock(pk=pk)
+        calculation.get_job_id.return_value = None
+        calculation.get_remote_workdir.return_value = workdir
+        calculation.get_option.return_value = '_aiidasubmit.sh'
+        calculation.computer.get_scheduler.return_value = scheduler
+        calculations.append(calculation)
+
+    results = execmanager.submit_calculations(calculations, mock.Mock())
+
+    assert results[0] == 'job-first'
+    assert isinstance(results[1], SchedulerError)
+    assert results[2] == 'job-last'
+    calculations[0].set_job_id.assert_called_once_with('job-first')
+    assert not calculations[1].set_job_id.called
@@ -9,12 +9,16 @@
 ###########################################################################
 """Module to test process futures."""
 import datetime
+import functools
+from unittest import mock
 
-from tornado import gen
+from tornado import gen, ioloop
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.engine import processes, run
+from aiida.engine import processes, run, ProcessState
+from aiida.engine.processes.futures import ProcessPoller
 from aiida.manage.manager import get_manager
+from aiida.orm import WorkflowNode
 
 from tests.utils import processes as test_processes
 
@@ -52,3 +56,81 @@ class TestWf(AiidaTestCase):
         calc_node = runner.run_until_complete(gen.with_timeout(self.TIMEOUT, future))
 
         self.assertEqual(process.node.pk, calc_node.pk)
+
+
+class TestProcessPoller(AiidaTestCase):
+    """Test the poller that checks for the termination of processes."""
+
+    def test_single_query_per_poll(self):
+        """Test that the termination of all awaited processes is checked with a single query per poll."""
+        loop = ioloop.IOLoop()
+        poller = ProcessPoller(loop, poll_interval=0)
+        nodes = [WorkflowNode().store() for _ in range(3)]
+        terminated = []
+
+        for node in nodes:
+            poller.add_callback(node.pk, functools.partial(terminated.append, node.pk))
+
+        # A removed callback should no longer be called, nor its process be queried for
+        poller.add_callback(nodes[2].pk, self.fail)
+        poller.remove_callback(nodes[2].pk, self.fail)
+
+        nodes[0].set_process_state(ProcessState.FINISHED)
+
+        with mock.patch.object(poller, '_get_terminated', wraps=poller._get_terminated) as get_terminated:  # pylint: disable=protected-access
+            loop.run_sync(lambda: gen.sleep(0.1))
+            self.assertEqual(terminated, [nodes[0].pk])
+            self.assertGreater(get_terminated.call_count, 1)
+            queried = [sorted(args[0]) for args, _ in get_terminated.call_args_list]
+            self.assertEqual(queried[0], sorted([node.pk for node in nodes]))
+            self.assertTrue(all(pks == sorted([nodes[1].pk, nodes[2].pk]) for pks in queried[1:]))
+
+            nodes[1].set_process_state(ProcessState.KILLED)
+            nodes[2].set_process_state(ProcessState.EXCEPTED)
+            loop.run_sync(lambda: gen.sleep(0.1))
+            call_count = get_terminated.call_count
+
+            # Once there are no more processes to wait for, polling should stop
+            loop.run_sync(lambda: gen.sleep(0.1))
+            self.assertEqual(get_terminated.call_count, call_count)
+
+        self.assertEqual(terminated, [nodes[0].pk, nodes[1].pk, nodes[2].pk])
+        loop.close()
+
+    def test_poll_after_exception(self):
+        """Test that polling continues after a query for the terminated processes fails."""
+        loop = ioloop.IOLoop()
+        poller = ProcessPoller(loop, poll_interval=0)
+        node = WorkflowNode().store()
+        terminated = []
+
+        poller.add_callback(node.pk, functools.partial(terminated.append, node.pk))
+        node.set_process_state(ProcessState.FINISHED)
+
+        get_terminated = poller._get_terminated  # pylint: disable=protected-access
+        side_effect = [RuntimeError('connection lost'), get_terminated([node.pk])]
+
+        with mock.patch.object(poller, '_get_terminated', side_effect=side_effect):
+            loop.run_sync(lambda: gen.sleep(0.1))
+
+        self.assertEqual(terminated, [node.pk])
+        loop.close()
+
+    def test_failing_callback(self):
+        """Test that all callbacks of a terminated process are called, even if one of them raises."""
+        loop = ioloop.IOLoop()
+        poller = ProcessPoller(loop, poll_interval=0)
+        node = WorkflowNode().store()
+        terminated = []
+
+        def failing_callback():
+            raise RuntimeError('callback failed')
+
+        poller.add_callback(node.pk, failing_callback)
+        poller.add_callback(node.pk, functools.partial(terminated.append, node.pk))
+        node.set_process_state(ProcessState.FINISHED)
+
+        loop.run_sync(lambda: gen.sleep(0.1))
+
+        self.assertEqual(terminated, [node.pk])
+        loop.close()
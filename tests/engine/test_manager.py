@@ -9,13 +9,15 @@
 ###########################################################################
 """Tests for the classes in `aiida.engine.processes.calcjobs.manager`."""
 
+import contextlib
 import time
+from unittest import mock
 
 import tornado
 
 from aiida.orm import AuthInfo, User
 from aiida.backends.testbase import AiidaTestCase
-from aiida.engine.processes.calcjobs.manager import JobManager, JobsList
+from aiida.engine.processes.calcjobs.manager import JobManager, JobsList, SharedJobStates
 from aiida.engine.transports import TransportQueue
 
 
@@ -47,6 +49,83 @@ class TestJobManager(AiidaTestCase):
         with self.manager.request_job_info_update(self.auth_info, job_id=1) as request:
             self.assertIsInstance(request, tornado.concurrent.Future)
 
+    def test_coalesced_job_info_update(self):
+        """Test that the jobs of different authinfos of the same computer are updated with a single scheduler call."""
+        from aiida.schedulers.datastructures import JobInfo, JobState
+        from aiida.schedulers.plugins.pbspro import PbsproScheduler
+
+        other_user = User(email='other@localhost').store()
+        other_auth_info = AuthInfo(self.computer, other_user).store()
+        requested_authinfos = []
+
+        @contextlib.contextmanager
+        def request_transport(authinfo):
+            requested_authinfos.append(authinfo.pk)
+            future = tornado.concurrent.Future()
+            future.set_result(mock.Mock())
+            yield future
+
+        job_infos = {}
+        for job_id in ['1', '2', '3']:
+            job_infos[job_id] = JobInfo()
+            job_infos[job_id].job_id = job_id
+            job_infos[job_id].job_state = JobState.RUNNING
+
+        try:
+            self.assertIs(self.manager.get_jobs_list(self.auth_info), self.manager.get_jobs_list(other_auth_info))
+
+            with mock.patch.object(self.transport_queue, 'request_transport', request_transport), \
+                mock.patch.object(PbsproScheduler, 'get_feature', return_value=True), \
+                mock.patch.object(PbsproScheduler, 'get_jobs', return_value=job_infos) as mock_get_jobs:
+
+                with self.manager.request_job_info_update(self.auth_info, '1') as request_one, \
+                    self.manager.request_job_info_update(other_auth_info, '2') as request_two:
+                    results = self.loop.run_sync(lambda: tornado.gen.multi([request_one, request_two]))
+
+                self.assertEqual(results, [job_infos['1'], job_infos['2']])
+                self.assertEqual(requested_authinfos, [self.auth_info.pk])
+                mock_get_jobs.assert_called_once_with(as_dict=True, jobs=['1', '2'])
+
+                # With pending jobs of a single authinfo, the jobs of its user are queried through its own transport
+                with self.manager.request_job_info_update(other_auth_info, '3') as request_three:
+                    self.assertEqual(self.loop.run_sync(lambda: request_three), job_infos['3'])
+
+                self.assertEqual(requested_authinfos, [self.auth_info.pk, other_auth_info.pk])
+                mock_get_jobs.assert_called_with(as_dict=True, user='$USER')
+        finally:
+            AuthInfo.objects.delete(other_auth_info.pk)
+
+    def test_request_job_submission(self):
+        """Test that the jobs that are ready to be submitted are submitted in batches."""
+        manager = JobManager(self.transport_queue, submit_batch_window=0.1, submit_batch_size=2)
+        nodes = [mock.Mock(pk=pk) for pk in [1, 2, 3]]
+        batches = []
+
+        @contextlib.contextmanager
+        def request_transport(_):
+            future = tornado.concurrent.Future()
+            future.set_result(mock.Mock())
+            yield future
+
+        def submit_calculations(batch, _):
+            batches.append([node.pk for node in batch])
+            return [RuntimeError() if node.pk == 2 else str(node.pk * 10) for node in batch]
+
+        # Without an executor the nodes are submitted as they are, on the event loop
+        with mock.patch.object(self.transport_queue, 'request_transport', request_transport), \
+            mock.patch('aiida.engine.daemon.execmanager.submit_calculations', submit_calculations):
+
+            with manager.request_job_submission(self.auth_info, nodes[0]) as request_one, \
+                manager.request_job_submission(self.auth_info, nodes[1]) as request_two, \
+                manager.request_job_submission(self.auth_info, nodes[2]) as request_three:
+                self.assertEqual(self.loop.run_sync(lambda: request_one), '10')
+                self.assertEqual(self.loop.run_sync(lambda: request_three), '30')
+                self.assertIsInstance(request_two.exception(), RuntimeError)
+
+        # The first batch is submitted as soon as it is full, the remaining job after the batch window
+        self.assertEqual(batches, [[1, 2], [3]])
+        self.assertIs(manager.get_job_submitter(self.auth_info), manager.get_job_submitter(self.auth_info))
+
 
 class TestJobsList(AiidaTestCase):
     """Test the `aiida.engine.processes.calcjobs.manager.JobsList` class."""
@@ -76,3 +155,197 @@ class TestJobsList(AiidaTestCase):
         last_updated = time.time()
         jobs_list = JobsList(self.auth_info, self.transport_queue, last_updated=last_updated)
         self.assertEqual(jobs_list.last_updated, last_updated)
+
+    @contextlib.contextmanager
+    def _shared_job_states(self, job_infos):
+        """Patch the transport queue and scheduler and yield a shared jobs list and its mock of `get_jobs`."""
+        from aiida.manage.manager import get_manager
+        from aiida.schedulers.plugins.pbspro import PbsproScheduler
+
+        @contextlib.contextmanager
+        def request_transport(_):
+            future = tornado.concurrent.Future()
+            future.set_result(mock.Mock())
+            yield future
+
+        minimum_poll_interval = self.auth_info.computer.get_minimum_job_poll_interval()
+        jobs_list = JobsList(self.auth_info, self.transport_queue, shared=True)
+        self.auth_info.computer.set_minimum_job_poll_interval(60.)
+
+        try:
+            with mock.patch.object(self.transport_queue, 'request_transport', request_transport), \
+                mock.patch.object(PbsproScheduler, 'get_feature', return_value=True), \
+                mock.patch.object(PbsproScheduler, 'get_jobs', return_value=job_infos) as mock_get_jobs:
+                yield jobs_list, mock_get_jobs
+        finally:
+            self.auth_info.computer.set_minimum_job_poll_interval(minimum_poll_interval)
+            get_manager().get_backend_manager().get_settings_manager().delete(
+                SharedJobStates.KEY_TEMPLATE.format(self.auth_info.computer.uuid)
+            )
+
+    def test_shared_job_states(self):
+        """Test that the job states retrieved by one runner are used by the other runners that share them."""
+        from aiida.schedulers.datastructures import JobInfo, JobState
+
+        job_info = JobInfo()
+        job_info.job_id = '1'
+        job_info.job_state = JobState.RUNNING
+
+        with self._shared_job_states({'1': job_info}) as (jobs_list, mock_get_jobs):
+            with jobs_list.request_job_info_update('1') as request:
+                self.assertEqual(self.loop.run_sync(lambda: request).job_state, JobState.RUNNING)
+
+            mock_get_jobs.assert_called_once_with(as_dict=True, user='$USER')
+            self.assertEqual(jobs_list.get_metrics()['polls'], 1)
+
+            # Another runner, with its own jobs list, uses the stored job states instead of polling the scheduler
+            other_jobs_list = JobsList(self.auth_info, self.transport_queue, shared=True)
+            other_jobs_list._shared_states._poller = 'other:1'  # pylint: disable=protected-access
+
+            with other_jobs_list.request_job_info_update('1') as request:
+                self.assertEqual(self.loop.run_sync(lambda: request).job_state, JobState.RUNNING)
+
+            mock_get_jobs.assert_called_once()
+            self.assertEqual(other_jobs_list.get_metrics()['polls'], 0)
+            self.assertEqual(other_jobs_list.get_metrics()['shared_hits'], 1)
+            self.assertEqual(other_jobs_list.last_updated, jobs_list.last_updated)
+
+    def test_shared_job_states_lease(self):
+        """Test that a runner waits for outdated shared job states to be updated while another runner has the lease."""
+        from aiida.schedulers.datastructures import JobInfo, JobState
+
+        job_info = JobInfo()
+        job_info.job_id = '1'
+        job_info.job_state = JobState.QUEUED
+
+        with self._shared_job_states({}) as (jobs_list, mock_get_jobs):
+            other_states = SharedJobStates(self.auth_info.computer.uuid)
+            other_states._poller = 'other:1'  # pylint: disable=protected-access
+            other_states.set({}, [], [], time.time() - 120., 0., 60.)
+
+            def update_other_states():
+                other_states.set({'1': job_info}, [self.auth_info.id], [], time.time(), 0., 60.)
+
+            with mock.patch.object(SharedJobStates, 'RETRY_INTERVAL', 0.01):
+                # The job is not covered by the current shared states, so wait for the other runner to poll again
+                self.loop.call_later(0.1, update_other_states)
+
+                with jobs_list.request_job_info_update('1') as request:
+                    self.assertEqual(self.loop.run_sync(lambda: request).job_state, JobState.QUEUED)
+
+            self.assertFalse(mock_get_jobs.called)
+            self.assertGreater(jobs_list.get_metrics()['shared_waits'], 0)
+            self.assertEqual(jobs_list.get_metrics()['shared_hits'], 1)
+
+    def test_shared_job_states_acquire_lease(self):
+        """Test that the lease on the shared job states can only be taken by a single runner at a time."""
+        with self._shared_job_states({}):
+            states = SharedJobStates(self.auth_info.computer.uuid)
+            other_states = SharedJobStates(self.auth_info.computer.uuid)
+            other_states._poller = 'other:1'  # pylint: disable=protected-access
+
+            self.assertTrue(states.acquire_lease(60.))
+            self.assertFalse(other_states.acquire_lease(60.))
+            self.assertFalse(other_states.set({}, [], [], time.time(), 0., 60.))
+            self.assertTrue(states.set({}, [], [], time.time(), 0., 60.))
+            self.assertTrue(other_states.is_leased_by_other(other_states.get()))
+
+            # Once the lease has expired, another runner can take it over
+            self.assertTrue(states.set({}, [], [], time.time() - 240., 0., 60.))
+            self.assertTrue(other_states.acquire_lease(60.))
+            self.assertFalse(states.acquire_lease(60.))
+
+    def test_effective_update_interval(self):
+        """Test that the effective update interval adapts to the changes of the job states and the load budget."""
+        # pylint: disable=protected-access
+        from aiida.schedulers.datastructures import JobInfo, JobState
+
+        # The maximum backoff is capped at `JobsList.MAX_BACKOFF`
+        jobs_list = JobsList(self.auth_info, self.transport_queue, max_backoff=3, load_budget=10)
+        minimum_poll_interval = self.auth_info.computer.get_minimum_job_poll_interval()
+        self.auth_info.computer.set_minimum_job_poll_interval(10.)
+
+        def update(job_state, **kwargs):
+            """Update the jobs list with the given state of a single job and return the effective update interval."""
+            job_info = JobInfo(dict(job_id='1', job_state=job_state, **kwargs))
+
+            @tornado.gen.coroutine
+            def get_jobs_from_scheduler():
+                jobs_list._last_updated = time.time()
+                return {'1': job_info}
+
+            with mock.patch.object(jobs_list, '_get_jobs_from_scheduler', get_jobs_from_scheduler):
+                with jobs_list.request_job_info_update('1'):
+                    self.loop.run_sync(jobs_list._update_job_info)
+
+            return jobs_list.get_effective_update_interval()
+
+        try:
+            self.assertEqual(jobs_list.get_effective_update_interval(), 10.)
+
+            # Back off while the job state does not change, up to the maximum backoff, and reset when it does, where
+            # the job appearing in the list for the first time counts as a change
+            self.assertEqual(update(JobState.QUEUED), 10.)
+            self.assertEqual(update(JobState.QUEUED), 15.)
+            self.assertEqual(update(JobState.QUEUED), 20.)
+            self.assertEqual(update(JobState.QUEUED), 20.)
+            self.assertEqual(update(JobState.RUNNING), 10.)
+            self.assertEqual(jobs_list.get_metrics()['update_interval'], 10.)
+
+            # Poll when a running job is expected to reach its requested wallclock time, but not before the minimum
+            self.assertEqual(
+                update(JobState.RUNNING, requested_wallclock_time_seconds=100, wallclock_time_seconds=88), 12.
+            )
+            self.assertEqual(
+                update(JobState.RUNNING, requested_wallclock_time_seconds=100, wallclock_time_seconds=95), 10.
+            )
+
+            # Keep the duration of the scheduler polls within the load budget
+            jobs_list._metrics['poll_latency'] = 4.
+            self.assertEqual(jobs_list.get_effective_update_interval(), 40.)
+        finally:
+            self.auth_info.computer.set_minimum_job_poll_interval(minimum_poll_interval)
+
+    def test_update_interval_early_finish(self):
+        """Test that the jobs of a list are not polled less often unless the backoff is enabled and nothing changes.
+
+        Jobs that finish early should be noticed within the minimum interval: by default the interval never backs off,
+        and with the backoff enabled it is reset as soon as any job in the list changes state, not just the requested.
+        """
+        # pylint: disable=protected-access
+        from aiida.schedulers.datastructures import JobInfo, JobState
+
+        minimum_poll_interval = self.auth_info.computer.get_minimum_job_poll_interval()
+        self.auth_info.computer.set_minimum_job_poll_interval(10.)
+
+        def update(jobs_list, job_states):
+            """Update the jobs list with the given job states and return the effective update interval."""
+
+            @tornado.gen.coroutine
+            def get_jobs_from_scheduler():
+                jobs_list._last_updated = time.time()
+                return {
+                    job_id: JobInfo(dict(job_id=job_id, job_state=job_state))
+                    for job_id, job_state in job_states.items()
+                }
+
+            with mock.patch.object(jobs_list, '_get_jobs_from_scheduler', get_jobs_from_scheduler):
+                with jobs_list.request_job_info_update('1'):
+                    self.loop.run_sync(jobs_list._update_job_info)
+
+            return jobs_list.get_effective_update_interval()
+
+        try:
+            jobs_list = JobsList(self.auth_info, self.transport_queue)
+            for _ in range(5):
+                self.assertEqual(update(jobs_list, {'1': JobState.QUEUED}), 10.)
+
+            jobs_list = JobsList(self.auth_info, self.transport_queue, max_backoff=2)
+            self.assertEqual(update(jobs_list, {'1': JobState.QUEUED, '2': JobState.QUEUED}), 10.)
+            self.assertEqual(update(jobs_list, {'1': JobState.QUEUED, '2': JobState.QUEUED}), 15.)
+            self.assertEqual(update(jobs_list, {'1': JobState.QUEUED, '2': JobState.QUEUED}), 20.)
+
+            # Another job in the list finishing resets the backoff, even though the requested job did not change
+            self.assertEqual(update(jobs_list, {'1': JobState.QUEUED}), 10.)
+        finally:
+            self.auth_info.computer.set_minimum_job_poll_interval(minimum_poll_interval)
@@ -12,11 +12,24 @@ import plumpy
 
 from aiida.backends.testbase import AiidaTestCase
 from aiida.engine.persistence import AiiDAPersister
-from aiida.engine import Process, run
+from aiida.engine import Process, WorkChain, run
+from aiida.orm import load_node
 
 from tests.utils.processes import DummyProcess
 
 
+class ContextWorkChain(WorkChain):
+    """Work chain whose context is filled by the tests."""
+
+    @classmethod
+    def define(cls, spec):
+        super().define(spec)
+        spec.outline(cls.step)
+
+    def step(self):
+        pass
+
+
 class TestProcess(AiidaTestCase):
     """Test the basic saving and loading of process states."""
 
@@ -65,3 +78,39 @@ class TestAiiDAPersister(AiidaTestCase):
 
         self.persister.delete_checkpoint(process.pid)
         self.assertEqual(process.node.checkpoint, None)
+
+    def test_checkpoint_deltas(self):
+        """Test that the checkpoints of a work chain are stored as deltas that are periodically compacted."""
+        process = ContextWorkChain()
+        process.ctx.results = []
+        process.ctx.data = ['data'] * 10000  # Large enough for the deltas not to be compacted because of their size
+
+        self.persister.save_checkpoint(process)
+        self.assertEqual(process.node.checkpoint_deltas, [])
+
+        for index in range(AiiDAPersister.COMPACTION_INTERVAL):
+            process.ctx.results.append(index)
+            process.ctx.index = index
+            bundle_saved = self.persister.save_checkpoint(process)
+
+            self.assertEqual(len(process.node.checkpoint_deltas), index + 1)
+            self.assertEqual(self.persister.load_checkpoint(process.node.pk), bundle_saved)
+
+        # After the maximum number of deltas the checkpoint is compacted
+        process.ctx.results.append(-1)
+        bundle_saved = self.persister.save_checkpoint(process)
+        self.assertEqual(process.node.checkpoint_deltas, [])
+        self.assertEqual(self.persister.load_checkpoint(process.node.pk), bundle_saved)
+
+        # A new instance of the process, for example loaded by another daemon worker, starts with a full checkpoint
+        process.ctx.results.append(-2)
+        self.persister.save_checkpoint(process)
+        self.assertEqual(len(process.node.checkpoint_deltas), 1)
+
+        loaded = self.persister.load_checkpoint(process.node.pk).unbundle()
+        self.persister.save_checkpoint(loaded)
+        self.assertEqual(loaded.node.checkpoint_deltas, [])
+
+        self.persister.delete_checkpoint(process.pid)
+        self.assertEqual(load_node(process.pid).checkpoint, None)
+        self.assertEqual(load_node(process.pid).checkpoint_deltas, [])
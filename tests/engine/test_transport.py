@@ -8,7 +8,11 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 """Module to test transport."""
-from tornado.gen import coroutine, Return
+import threading
+import time
+from unittest import mock
+
+from tornado.gen import coroutine, multi, sleep, Return
 
 from aiida.backends.testbase import AiidaTestCase
 from aiida.engine.transports import TransportQueue
@@ -139,3 +143,130 @@ class TestTransportQueue(AiidaTestCase):
 
         finally:
             transport_class._DEFAULT_SAFE_OPEN_INTERVAL = original_interval  # pylint: disable=protected-access
+
+    def test_idle_timeout(self):
+        """Verify that an unused transport is kept open for reuse until the idle timeout expires."""
+        queue = TransportQueue(idle_timeout=0.5)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans1 = yield request
+
+            self.assertTrue(trans1.is_open)
+
+            with queue.request_transport(self.authinfo) as request:
+                trans2 = yield request
+
+            self.assertIs(trans1, trans2)
+            raise Return(trans1)
+
+        trans = loop.run_sync(lambda: test())  # pylint: disable=unnecessary-lambda
+        self.assertTrue(trans.is_open)
+        self.assertEqual(queue.get_metrics(self.authinfo)['opened'], 1)
+        self.assertEqual(queue.get_metrics(self.authinfo)['reused'], 1)
+
+        loop.run_sync(lambda: sleep(0.75))
+        self.assertFalse(trans.is_open)
+        self.assertEqual(queue.get_metrics()['closed'], 1)
+        self.assertEqual(queue.get_metrics()['open'], 0)
+
+    def test_close(self):
+        """Verify that closing the queue closes the transports that are kept open while unused."""
+        queue = TransportQueue(idle_timeout=60)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+            raise Return(trans)
+
+        trans = loop.run_sync(lambda: test())  # pylint: disable=unnecessary-lambda
+        self.assertTrue(trans.is_open)
+
+        queue.close()
+        self.assertFalse(trans.is_open)
+        self.assertEqual(queue.get_metrics(self.authinfo)['open'], 0)
+
+    def test_max_connections(self):
+        """Verify that concurrent requests are spread over multiple transports up to the maximum number."""
+        queue = TransportQueue(max_connections=2, max_channels=1)
+        loop = queue.loop()
+        transports = []
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+                transports.append(trans)
+                yield sleep(0.1)
+
+        loop.run_sync(lambda: multi([test(), test(), test()]))
+
+        self.assertEqual(len(set(transports)), 2)
+        self.assertEqual(queue.get_metrics(self.authinfo)['opened'], 2)
+        self.assertEqual(queue.get_metrics(self.authinfo)['reused'], 1)
+        self.assertFalse(any(trans.is_open for trans in transports))
+
+    def test_keep_alive_failure(self):
+        """Verify that a transport whose keep-alive fails is closed and not reused."""
+        queue = TransportQueue(idle_timeout=60, keepalive_interval=0.1)
+        loop = queue.loop()
+
+        @coroutine
+        def test():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+            raise Return(trans)
+
+        trans = loop.run_sync(lambda: test())  # pylint: disable=unnecessary-lambda
+
+        with mock.patch.object(trans, 'keep_alive', side_effect=RuntimeError('connection dropped')):
+            loop.run_sync(lambda: sleep(0.25))
+
+        self.assertFalse(trans.is_open)
+        self.assertEqual(queue.get_metrics(self.authinfo)['failed'], 1)
+
+        new_trans = loop.run_sync(lambda: test())  # pylint: disable=unnecessary-lambda
+        self.assertIsNot(trans, new_trans)
+        queue.close()
+
+    def test_run_in_executor(self):
+        """Verify that blocking operations are run in a thread, serialized per transport, without blocking the loop."""
+        queue = TransportQueue(max_workers=2)
+        loop = queue.loop()
+        threads = []
+        running = []
+
+        def blocking(duration):
+            running.append(threading.current_thread())
+            self.assertEqual(len(running), 1, 'the transport was used concurrently')
+            threads.append(threading.current_thread())
+            time.sleep(duration)
+            running.pop()
+            return duration
+
+        @coroutine
+        def task():
+            with queue.request_transport(self.authinfo) as request:
+                trans = yield request
+                result = yield queue.run_in_executor(trans, blocking, 0.1)
+            raise Return(result)
+
+        @coroutine
+        def ticker():
+            """Count the iterations of the loop while the blocking operations are running."""
+            ticks = 0
+            while running or not threads:
+                yield sleep(0.01)
+                ticks += 1
+            raise Return(ticks)
+
+        results = loop.run_sync(lambda: multi([task(), task(), ticker()]))
+
+        self.assertEqual(results[:2], [0.1, 0.1])
+        self.assertGreater(results[2], 1)
+        self.assertNotIn(threading.current_thread(), threads)
+        queue.close()
@@ -9,13 +9,19 @@
 ###########################################################################
 # pylint: disable=global-statement
 """Test engine utilities such as the exponential backoff mechanism."""
+import datetime
+from unittest import mock
+
 from tornado.ioloop import IOLoop
 from tornado.gen import coroutine
 
 from aiida import orm
 from aiida.backends.testbase import AiidaTestCase
 from aiida.engine import calcfunction, workfunction
-from aiida.engine.utils import exponential_backoff_retry, is_process_function
+from aiida.common import timezone
+from aiida.engine.utils import (
+    exponential_backoff_retry, get_process_state_change_timestamp, is_process_function, ProcessStateChangeTimestamps
+)
 
 ITERATION = 0
 MAX_ITERATIONS = 3
@@ -84,3 +90,39 @@ class TestExponentialBackoffRetry(AiidaTestCase):
         self.assertEqual(is_process_function(normal_function), False)
         self.assertEqual(is_process_function(calc_function), True)
         self.assertEqual(is_process_function(work_function), True)
+
+
+class TestProcessStateChangeTimestamps(AiidaTestCase):
+    """Tests for the throttled writes of the last time a process changed state."""
+
+    def test_throttled_writes(self):
+        """Test that state changes within the interval since the last write are written at the end of the interval."""
+        loop = mock.Mock()
+        loop.time.return_value = 100.
+        timestamps = ProcessStateChangeTimestamps(loop, interval=10)
+        first = timezone.now()
+
+        timestamps.set('work', first)
+        self.assertEqual(get_process_state_change_timestamp('work'), first)
+
+        for seconds in [1, 2]:
+            loop.time.return_value += 1
+            timestamps.set('work', first + datetime.timedelta(seconds=seconds))
+
+        # Only the first write happened, while a single delayed write was scheduled at the end of the interval
+        self.assertEqual(get_process_state_change_timestamp('work'), first)
+        loop.call_at.assert_called_once_with(110., mock.ANY, 'work')
+
+        loop.time.return_value = 110.
+        callback, process_type = loop.call_at.call_args[0][1:]
+        callback(process_type)
+        self.assertEqual(get_process_state_change_timestamp('work'), first + datetime.timedelta(seconds=2))
+
+        # The write of another process type is independent, and pending writes are written on flush
+        timestamps.set('calculation', first)
+        loop.time.return_value += 1
+        timestamps.set('calculation', first + datetime.timedelta(seconds=3))
+        self.assertEqual(get_process_state_change_timestamp('calculation'), first)
+
+        timestamps.flush()
+        self.assertEqual(get_process_state_change_timestamp('calculation'), first + datetime.timedelta(seconds=3))
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the :class:`aiida.orm.nodes.data.array.array.ArrayData` class."""
+import numpy
+import pytest
+
+from aiida.orm import ArrayData, load_node
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+def test_hash_arrays():
+    """Test that the hash of the arrays computed before storing is the same as when read back from the repository."""
+    node = ArrayData()
+    node.set_array('first', numpy.arange(10.))
+    node.set_array('second', numpy.eye(3))
+    node.store()
+
+    loaded = load_node(node.pk)
+    assert not loaded._cached_array_hashes  # pylint: disable=protected-access
+    assert loaded.get_hash() == node.get_hash()
+    assert loaded.get_hash() == node.get_extra('_aiida_hash')
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+def test_hash_arrays_content():
+    """Test that the hash of the node depends on the content of the arrays."""
+    first = ArrayData()
+    first.set_array('array', numpy.arange(10.))
+    first.store()
+
+    second = ArrayData()
+    second.set_array('array', numpy.arange(10.))
+    second.store()
+
+    third = ArrayData()
+    third.set_array('array', numpy.arange(1., 11.))
+    third.store()
+
+    assert first.get_hash() == second.get_hash()
+    assert first.get_hash() != third.get_hash()
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+def test_hash_delete_array():
+    """Test that deleting an array invalidates its cached hash."""
+    node = ArrayData()
+    node.set_array('array', numpy.arange(10.))
+    node.set_array('other', numpy.arange(5.))
+    node.delete_array('other')
+    node.store()
+
+    reference = ArrayData()
+    reference.set_array('array', numpy.arange(10.))
+    reference.store()
+
+    assert node.get_hash() == reference.get_hash()
+
+
+@pytest.mark.usefixtures('clear_database_before_test')
+def test_hash_datetime_array():
+    """Test that arrays with a dtype that cannot be exported as a buffer, like `datetime64`, can be stored."""
+    node = ArrayData()
+    node.set_array('dates', numpy.array(['2020-01-01', '2020-01-02'], dtype='datetime64[D]'))
+    node.store()
+
+    loaded = load_node(node.pk)
+    assert loaded.get_hash() == node.get_extra('_aiida_hash')
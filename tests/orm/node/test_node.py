@@ -9,14 +9,15 @@
 ###########################################################################
 # pylint: disable=too-many-public-methods
 """Tests for the Node ORM class."""
+import datetime
 import os
 import tempfile
 
 import pytest
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.common import exceptions, LinkType
-from aiida.orm import Data, Log, Node, User, CalculationNode, WorkflowNode, load_node
+from aiida.common import exceptions, timezone, LinkType
+from aiida.orm import Data, Dict, Int, Log, Node, User, CalculationNode, WorkflowNode, load_node
 from aiida.orm.utils.links import LinkTriple
 
 
@@ -46,6 +47,111 @@ class TestNode(AiidaTestCase):
         with self.assertRaises(exceptions.ModificationNotAllowed):
             node.user = self.user
 
+    def test_process_checkpoint(self):
+        """Test that the checkpoint of a process node is stored outside of its attributes."""
+        node = WorkflowNode()
+
+        with self.assertRaises(exceptions.InvalidOperation):
+            node.set_checkpoint('checkpoint')
+
+        node.store()
+        self.assertIsNone(node.checkpoint)
+        self.assertEqual(node.checkpoint_deltas, [])
+
+        node.set_checkpoint('checkpoint')
+        node.add_checkpoint_delta('first')
+        node.add_checkpoint_delta('second')
+        self.assertEqual(load_node(node.pk).checkpoint, 'checkpoint')
+        self.assertEqual(load_node(node.pk).checkpoint_deltas, ['first', 'second'])
+        self.assertEqual(node.attributes, {})
+
+        node.set_checkpoint('compacted')
+        self.assertEqual(node.checkpoint, 'compacted')
+        self.assertEqual(node.checkpoint_deltas, [])
+
+        node.delete_checkpoint()
+        self.assertIsNone(node.checkpoint)
+
+
+class TestNodeStoreMany(AiidaTestCase):
+    """Tests for storing nodes in bulk through `Node.objects.store_many`."""
+
+    def test_store_many(self):
+        """Test that nodes are stored with their links, repository contents and hash."""
+        stored = Int(1).store()
+        data = Dict(dict={'key': 'value'})
+        data.put_object_from_filelike(tempfile.TemporaryFile(), 'file')  # pylint: disable=consider-using-with
+        calculation = CalculationNode()
+        calculation.add_incoming(stored, LinkType.INPUT_CALC, 'stored')
+        calculation.add_incoming(data, LinkType.INPUT_CALC, 'unstored')
+        nodes = [calculation, Int(2), data]
+
+        self.assertEqual(Node.objects.store_many(nodes), nodes)
+
+        for node in nodes:
+            self.assertTrue(node.is_stored)
+            self.assertEqual(node.get_extra('_aiida_hash'), node.get_hash())
+
+        self.assertEqual(load_node(data.pk).get_dict(), {'key': 'value'})
+        self.assertEqual(load_node(data.pk).list_object_names(), ['file'])
+        self.assertEqual(load_node(nodes[1].pk).value, 2)
+
+        incoming = {entry.link_label: entry.node.pk for entry in load_node(calculation.pk).get_incoming().all()}
+        self.assertEqual(incoming, {'stored': stored.pk, 'unstored': data.pk})
+
+        with self.assertRaises(exceptions.ModificationNotAllowed):
+            Node.objects.store_many([stored])
+
+    def test_store_many_custom_store(self):
+        """Test that nodes whose class overrides `_store` are stored one by one through their own `_store`."""
+        stored = []
+
+        class CustomStoreData(Data):
+            """Data node class that overrides `_store`."""
+
+            def _store(self, with_transaction=True, clean=True):
+                stored.append(self)
+                return super()._store(with_transaction=with_transaction, clean=clean)
+
+        custom = CustomStoreData()
+        nodes = Node.objects.store_many([Int(1), custom])
+
+        self.assertTrue(all(node.is_stored for node in nodes))
+        self.assertEqual(stored, [custom])
+
+    def test_store_many_mtime(self):
+        """Test that a modification time that is set before storing is kept."""
+        mtime = timezone.now() - datetime.timedelta(days=1)
+        node = Int(1)
+        node.backend_entity.dbmodel.mtime = mtime
+
+        Node.objects.store_many([node, Int(2)])
+
+        self.assertEqual(load_node(node.pk).mtime, mtime)
+
+    def test_store_many_unstored_source(self):
+        """Test that nothing is stored if the source of an incoming link is neither stored nor being stored."""
+        calculation = CalculationNode()
+        calculation.add_incoming(Int(1), LinkType.INPUT_CALC, 'unstored')
+        data = Int(2)
+
+        with self.assertRaises(exceptions.ModificationNotAllowed):
+            Node.objects.store_many([data, calculation])
+
+        self.assertFalse(data.is_stored)
+        self.assertFalse(calculation.is_stored)
+
+    def test_store_all(self):
+        """Test that `store_all` stores the unstored source nodes of the incoming links."""
+        data = Int(1)
+        calculation = CalculationNode()
+        calculation.add_incoming(data, LinkType.INPUT_CALC, 'first')
+        calculation.add_incoming(data, LinkType.INPUT_CALC, 'second')
+        calculation.store_all()
+
+        self.assertTrue(data.is_stored)
+        self.assertEqual(len(load_node(calculation.pk).get_incoming().all()), 2)
+
 
 class TestNodeAttributesExtras(AiidaTestCase):
     """Test for node attributes and extras."""
@@ -786,6 +892,26 @@ class TestNodeDelete:
         assert Log.objects.get_logs_for(data_one)[0].pk == log_one.pk
         assert len(Log.objects.get_logs_for(data_two)) == 0
 
+    @pytest.mark.usefixtures('clear_database_before_test')
+    def test_delete_checkpoints(self):
+        """Test that the checkpoint of a process node is deleted with the node."""
+        from aiida.backends.utils import delete_nodes_and_connections
+        from aiida.manage.manager import get_manager
+
+        checkpoint_manager = get_manager().get_backend().checkpoint_manager
+
+        workflow = WorkflowNode().store()
+        workflow.set_checkpoint('checkpoint')
+        workflow.add_checkpoint_delta('delta')
+
+        other = WorkflowNode().store()
+        other.set_checkpoint('other')
+
+        delete_nodes_and_connections([workflow.pk])
+
+        assert checkpoint_manager.get(workflow.pk) == []
+        assert checkpoint_manager.get(other.pk) == ['other']
+
     @pytest.mark.usefixtures('clear_database_before_test')
     def test_delete_collection_incoming_link(self):
         """Test deletion through objects collection raises when there are incoming links."""
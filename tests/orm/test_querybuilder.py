@@ -505,6 +505,105 @@ class TestQueryBuilder(AiidaTestCase):
         self.assertEqual(len(list(orm.QueryBuilder().append(orm.Node, project=['*', 'id']).iterdict())), 4)
         self.assertEqual(len(list(orm.QueryBuilder().append(orm.Node, project=['id']).iterdict())), 4)
 
+    def test_iterall_stream(self):
+        """Test that `iterall` and `iterdict` stream the results through a server side cursor if batched."""
+        pks = sorted(orm.Data().store().pk for _ in range(10))
+        builder = orm.QueryBuilder().append(orm.Data, project=['id'])
+        session = builder._impl.get_session()  # pylint: disable=protected-access
+
+        def get_cursors():
+            return session.execute('SELECT name FROM pg_cursors').fetchall()
+
+        for batch_size, fetch_size in [(2, 3), (5, 1), (100, None)]:
+            results = builder.iterall(batch_size=batch_size, fetch_size=fetch_size)
+            first = next(results)
+            self.assertEqual(len(get_cursors()), 1)
+            self.assertEqual(sorted(pk for pk, in [first] + list(results)), pks)
+
+            results = builder.iterdict(batch_size=batch_size, fetch_size=fetch_size)
+            next(results)
+            self.assertEqual(len(get_cursors()), 1)
+            self.assertEqual(len(list(results)), len(pks) - 1)
+
+        results = builder.iterall(batch_size=None)
+        next(results)
+        self.assertEqual(get_cursors(), [])
+
+    def test_stream_fetch_size(self):
+        """Test that the fetch size defaults to the batch size and is capped at the maximum buffer of SqlAlchemy."""
+        from unittest import mock
+        from aiida.orm.implementation.querybuilder import BackendQueryBuilder
+
+        for fetch_size, max_row_buffer in [(None, 100), (10, 10), (5000, BackendQueryBuilder.MAX_FETCH_SIZE)]:
+            query = mock.Mock()
+            BackendQueryBuilder.stream(query, 100, fetch_size)
+            query.yield_per.assert_called_once_with(100)
+            query.yield_per.return_value.execution_options.assert_called_once_with(
+                stream_results=True, max_row_buffer=max_row_buffer
+            )
+
+    def test_compiled_query_cache(self):
+        """Test that structurally identical queries reuse the same compiled query, with their own filter values."""
+        from aiida.orm.querybuilder import COMPILED_QUERY_CACHE, MAX_COMPILED_QUERY_LITERAL_LENGTH
+
+        nodes = [orm.Data().store() for _ in range(2)]
+        COMPILED_QUERY_CACHE.clear()
+
+        aliases = []
+        for node in nodes:
+            builder = orm.QueryBuilder().append(orm.Data, filters={'id': node.pk}, project='uuid')
+            self.assertEqual(builder.all(flat=True), [node.uuid])
+            self.assertEqual(builder.dict(), [{'Data_1': {'uuid': node.uuid}}])
+            self.assertIn(str(node.pk), str(builder))
+            aliases.append((builder.get_alias('Data_1'), builder.get_aliases()))
+
+        # The aliases of a query that reuses a compiled query are replaced by those the compiled query refers to
+        self.assertIs(aliases[0][0], aliases[1][0])
+        self.assertEqual(aliases[0][1], aliases[1][1])
+        self.assertEqual(len(COMPILED_QUERY_CACHE), 1)
+
+        builder = orm.QueryBuilder().append(orm.Data, filters={'id': {'in': [node.pk for node in nodes]}})
+        self.assertEqual(builder.count(), 2)
+        self.assertEqual(len(COMPILED_QUERY_CACHE), 2)
+
+        # Queries with long literal values, which are part of the key, are not cached
+        pks = [node.pk for node in nodes] + [-pk for pk in range(1, MAX_COMPILED_QUERY_LITERAL_LENGTH)]
+        builder = orm.QueryBuilder().append(orm.Data, filters={'or': [{'id': {'in': pks}}, {'label': 'label'}]})
+        self.assertEqual(builder.count(), 2)
+        self.assertEqual(len(COMPILED_QUERY_CACHE), 2)
+
+    def test_compiled_query_cache_size(self):
+        """Test that the size of the compiled query cache is only read once for the loaded profile."""
+        from unittest import mock
+        from aiida.manage.manager import get_manager
+
+        manager = get_manager()
+        manager._compiled_query_cache_size = None  # pylint: disable=protected-access
+
+        with mock.patch.object(manager.get_config(), 'get_option', wraps=manager.get_config().get_option) as get_option:
+            for _ in range(3):
+                orm.QueryBuilder().append(orm.Data, filters={'id': 1}).count()
+
+        calls = [call for call in get_option.call_args_list if call[0][0] == 'db.compiled_query_cache_size']
+        self.assertEqual(len(calls), 1)
+
+    def test_deferred_attributes(self):
+        """Test that the attributes and extras of projected nodes are only loaded when they are first accessed."""
+        node = orm.Dict(dict={'key': 'value'}).store()
+        node.set_extra('extra', 1)
+
+        for project in ['*', ['*', 'id']]:
+            sql = str(orm.QueryBuilder().append(orm.Dict, filters={'id': node.pk}, project=project))
+            self.assertNotIn('.attributes', sql)
+            self.assertNotIn('.extras', sql)
+
+        sql = str(orm.QueryBuilder().append(orm.Dict, filters={'id': node.pk}, project=['*', 'attributes']))
+        self.assertIn('.attributes', sql)
+
+        loaded = orm.QueryBuilder().append(orm.Dict, filters={'id': node.pk}).one()[0]
+        self.assertEqual(loaded.get_dict(), {'key': 'value'})
+        self.assertEqual(loaded.get_extra('extra'), 1)
+
     def test_append_validation(self):
         from aiida.common.exceptions import InputValidationError
 
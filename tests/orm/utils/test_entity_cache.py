@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the :mod:`aiida.orm.utils.entity_cache` module."""
+import threading
+import time
+from unittest import mock
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.manage.manager import get_manager
+from aiida.orm import AuthInfo, CalcJobNode, Int, Node, User, load_computer, load_node
+from aiida.orm.utils.entity_cache import EntityCache
+
+
+class TestEntityCache(AiidaTestCase):
+    """Tests for the `EntityCache` class and its use by the ORM loaders."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = EntityCache(max_size=4)
+        get_manager().set_entity_cache(self.cache)
+
+    def tearDown(self):
+        get_manager().set_entity_cache(None)
+        super().tearDown()
+
+    def test_get_key(self):
+        """Test that only pks and full UUIDs result in a key."""
+        node = Int(1).store()
+        self.assertEqual(EntityCache.get_key(Node, node.pk), ('Node', node.pk))
+        self.assertEqual(EntityCache.get_key(Node, node.uuid), ('Node', node.uuid.replace('-', '')))
+        self.assertEqual(EntityCache.get_key(Node, node.uuid.upper()), EntityCache.get_key(Node, node.uuid))
+        self.assertIsNone(EntityCache.get_key(Node, node.uuid[:8]))
+        self.assertIsNone(EntityCache.get_key(Node, 'label'))
+
+    def test_other_thread(self):
+        """Test that the cache acts as if it were empty for other threads than the one that created it."""
+        self.cache.add([('Node', 1)], 'node')
+        results = []
+
+        thread = threading.Thread(target=lambda: results.append(self.cache.get(('Node', 1))))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(results, [None])
+        self.assertEqual(self.cache.get(('Node', 1)), 'node')
+
+        thread = threading.Thread(target=lambda: self.cache.add([('Node', 2)], 'node'))
+        thread.start()
+        thread.join()
+
+        self.assertIsNone(self.cache.get(('Node', 2)))
+
+    def test_detached(self):
+        """Test that entities that are no longer bound to the current session are dropped from the cache."""
+        from sqlalchemy import inspect
+
+        node = Int(1).store()
+        self.cache.add([('Node', node.pk)], node)
+        self.assertIs(self.cache.get(('Node', node.pk)), node)
+
+        get_manager().get_backend().get_session().close()
+
+        # Only the models of the SqlAlchemy backend are bound to the session
+        if inspect(node.backend_entity.dbmodel, raiseerr=False) is None:
+            self.assertIs(self.cache.get(('Node', node.pk)), node)
+        else:
+            self.assertIsNone(self.cache.get(('Node', node.pk)))
+            self.assertEqual(len(self.cache), 0)
+
+    def test_load_node(self):
+        """Test that stored data nodes are loaded from the cache, by pk as well as UUID."""
+        node = Int(1).store()
+        process = CalcJobNode(computer=self.computer).store()
+
+        loaded = load_node(node.pk)
+        self.assertIs(load_node(pk=node.pk), loaded)
+        self.assertIs(load_node(node.uuid), loaded)
+        self.assertIs(load_node(uuid=node.uuid, sub_classes=(Int,)), loaded)
+
+        # Process nodes are mutable and so are never cached
+        self.assertIsNot(load_node(process.pk), load_node(process.pk))
+
+        self.assertEqual(self.cache.get_metrics()['hits'], 3)
+        self.assertEqual(self.cache.get_metrics()['size'], 2)
+
+    def test_load_deleted_node(self):
+        """Test that deleted nodes are no longer loaded from the cache."""
+        from aiida.backends.utils import delete_nodes_and_connections
+        from aiida.common.exceptions import NotExistent
+
+        node = Int(1).store()
+        other = Int(2).store()
+        load_node(node.pk)
+
+        delete_nodes_and_connections([node.pk])
+
+        with self.assertRaises(NotExistent):
+            load_node(node.pk)
+
+        self.assertIs(load_node(other.pk), load_node(other.pk))
+
+        # Nodes deleted by other processes are dropped once their time to live has passed
+        with mock.patch('time.time', return_value=time.time() + EntityCache.ENTITY_TTL + 1):
+            self.assertIsNone(self.cache.get(EntityCache.get_key(Node, other.pk)))
+
+    def test_load_computer_and_authinfo(self):
+        """Test that computers and authinfos are loaded from the cache."""
+        computer = load_computer(self.computer.pk)  # pylint: disable=no-member
+        self.assertIs(load_computer(uuid=self.computer.uuid), computer)  # pylint: disable=no-member
+
+        user = User.objects.get_default()
+        stored = AuthInfo(self.computer, user).store()
+
+        try:
+            authinfo = computer.get_authinfo(user)
+            self.assertIs(computer.get_authinfo(user), authinfo)
+        finally:
+            AuthInfo.objects.delete(stored.pk)
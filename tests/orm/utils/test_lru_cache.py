@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the :mod:`aiida.orm.utils.lru_cache` module."""
+import threading
+import unittest
+from unittest import mock
+
+from aiida.orm.utils.lru_cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Tests for the `LRUCache` class."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = LRUCache(max_size=2)
+
+    def test_lru(self):
+        """Test that the least recently used entries are evicted."""
+        self.cache.add('zero', 0)
+        self.cache.add('one', 1)
+
+        self.assertEqual(self.cache.get('zero'), 0)
+        self.cache.add('two', 2)
+
+        self.assertIsNone(self.cache.get('one'))
+        self.assertEqual(self.cache.get('zero'), 0)
+        metrics = self.cache.get_metrics()
+        self.assertEqual(metrics, {'hits': 2, 'misses': 1, 'evictions': 1, 'hit_rate': 2 / 3, 'size': 2})
+
+    def test_ttl(self):
+        """Test that entries are no longer returned after their time to live."""
+        with mock.patch('time.time', return_value=1000.):
+            self.cache.add('key', 'value', ttl=10)
+            self.cache.add('other', 'value')
+
+        with mock.patch('time.time', return_value=1005.):
+            self.assertEqual(self.cache.get('key'), 'value')
+
+        with mock.patch('time.time', return_value=1011.):
+            self.assertIsNone(self.cache.get('key'))
+            self.assertEqual(self.cache.get('other'), 'value')
+
+        self.assertEqual(len(self.cache), 1)
+
+    def test_is_valid(self):
+        """Test that entries whose value is no longer valid are removed."""
+        self.cache.add('key', 'value')
+
+        self.assertEqual(self.cache.get('key', lambda value: value == 'value'), 'value')
+        self.assertIsNone(self.cache.get('key', lambda value: value == 'other'))
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_other_thread(self):
+        """Test that the entries added by one thread are returned to the other threads."""
+        self.cache.add('key', 'value')
+        results = []
+
+        thread = threading.Thread(target=lambda: results.append(self.cache.get('key')))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(results, ['value'])
+
+    def test_disabled(self):
+        """Test that nothing is cached with a maximum size of zero."""
+        cache = LRUCache(max_size=0)
+        cache.add('key', 'value')
+
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(len(cache), 0)
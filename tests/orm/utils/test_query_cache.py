@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida-core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""Tests for the :mod:`aiida.orm.utils.query_cache` module."""
+import threading
+from unittest import mock
+
+from aiida.backends.testbase import AiidaTestCase
+from aiida.manage.manager import get_manager
+from aiida.orm import Int, QueryBuilder
+from aiida.orm.utils.query_cache import QueryCache
+
+
+class TestQueryCache(AiidaTestCase):
+    """Tests for the `QueryCache` class and its use by the `QueryBuilder`."""
+
+    def setUp(self):
+        super().setUp()
+        self.cache = QueryCache(max_size=2, ttl=10)
+        get_manager().set_query_cache(self.cache)
+
+    def tearDown(self):
+        get_manager().set_query_cache(None)
+        super().tearDown()
+
+    def test_ttl(self):
+        """Test that results are returned as copies until their time to live has passed."""
+        key = self.cache.get_key({'limit': 1}, 'all')
+
+        with mock.patch('time.time', return_value=1000.):
+            self.cache.add(key, [[1]])
+
+        with mock.patch('time.time', return_value=1005.):
+            result = self.cache.get(key)
+            self.assertEqual(result, [[1]])
+            result[0].append(2)
+            self.assertEqual(self.cache.get(key), [[1]])
+
+        with mock.patch('time.time', return_value=1011.):
+            self.assertIsNone(self.cache.get(key))
+
+    def test_get_key(self):
+        """Test that the key does not depend on the thread and that only serializable queries have a key."""
+        keys = []
+
+        thread = threading.Thread(target=lambda: keys.append(self.cache.get_key({'limit': 1}, 'all')))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(keys, [self.cache.get_key({'limit': 1}, 'all')])
+        self.assertNotEqual(self.cache.get_key({'limit': 1}, 'all'), self.cache.get_key({'limit': 1}, 'dict'))
+        self.assertIsNone(self.cache.get_key({'filters': object()}, 'all'))
+
+    def test_querybuilder(self):
+        """Test that query results are cached until they expire or the cache is invalidated."""
+        node = Int(1, label='cached').store()
+        builder = QueryBuilder().append(Int, filters={'label': 'cached'}, project=['id'])
+
+        with mock.patch.object(builder, 'iterall', wraps=builder.iterall) as iterall:
+            self.assertEqual(builder.all(flat=True), [node.pk])
+            self.assertEqual(builder.all(flat=True), [node.pk])
+            self.assertEqual(QueryBuilder(**builder.queryhelp).all(flat=True), [node.pk])
+            self.assertEqual(iterall.call_count, 1)
+
+            # Changes to the database are not seen until the cached result expires or the cache is invalidated
+            other = Int(2, label='cached').store()
+            self.assertEqual(builder.all(flat=True), [node.pk])
+            self.cache.invalidate()
+            self.assertEqual(sorted(builder.all(flat=True)), sorted([node.pk, other.pk]))
+            self.assertEqual(iterall.call_count, 2)
+
+        self.assertEqual(builder.count(), 2)
+        self.assertEqual(builder.count(), 2)
+        self.assertEqual(self.cache.get_metrics()['hits'], 4)
+
+    def test_querybuilder_entities(self):
+        """Test that the rows of queries that project entities are not cached, but their count is."""
+        node = Int(1, label='entities').store()
+        builder = QueryBuilder().append(Int, filters={'label': 'entities'})
+
+        self.assertEqual(builder.all(flat=True)[0].pk, node.pk)
+        self.assertEqual(builder.all(flat=True)[0].pk, node.pk)
+        self.assertEqual([row['*'].pk for row in builder.dict()[0].values()], [node.pk])
+        self.assertEqual(self.cache.get_metrics()['size'], 0)
+
+        self.assertEqual(builder.count(), 1)
+        self.assertEqual(builder.count(), 1)
+        self.assertEqual(self.cache.get_metrics()['hits'], 1)
+
+    def test_querybuilder_distinct(self):
+        """Test that distinct queries are not cached, as the queryhelp does not describe them."""
+        Int(1).store()
+        count = QueryBuilder().append(Int).count()
+        metrics = self.cache.get_metrics()
+
+        self.assertEqual(QueryBuilder().append(Int).distinct().count(), count)
+        self.assertEqual(self.cache.get_metrics(), metrics)
@@ -14,7 +14,7 @@ import shutil
 import tempfile
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.orm import Node, Data
+from aiida.orm import Node, Data, load_node
 from aiida.orm.utils.repository import File, FileType
 from aiida.common.exceptions import ModificationNotAllowed
 
@@ -191,3 +191,39 @@ class TestRepository(AiidaTestCase):
         self.assertEqual(sorted(node.list_object_names('subdir')), ['a.txt', 'b.txt', 'nested'])
 
         self.assertRaises(ModificationNotAllowed, node._repository.erase)  # pylint: disable=protected-access
+
+    def test_object_store_backend(self):
+        """Test storing the repository of a node in the object store."""
+        from unittest.mock import patch
+
+        with patch('aiida.manage.configuration.get_config_option', return_value='objectstore'):
+            node = Data()
+            node.put_object_from_tree(self.tempdir, '')
+            node.store()
+
+        node = load_node(node.pk)
+
+        self.assertIsNotNone(node._repository._get_manifest())  # pylint: disable=protected-access
+        self.assertEqual(sorted(node.list_object_names()), ['c.txt', 'subdir'])
+        self.assertEqual(sorted(node.list_object_names('subdir')), ['a.txt', 'b.txt', 'nested'])
+        self.assertEqual(node.get_object('subdir/nested'), File('nested', FileType.DIRECTORY))
+
+        key = os.path.join('subdir', 'a.txt')
+        self.assertEqual(node.get_object_content(key), self.get_file_content(key))
+        self.assertEqual(node.get_object_content(key, mode='rb'), self.get_file_content(key).encode('utf8'))
+
+        with self.assertRaises(IOError):
+            node.get_object('subdir/not_existant')
+
+        with self.assertRaises(ModificationNotAllowed):
+            node.put_object_from_file(os.path.join(self.tempdir, 'c.txt'), 'd.txt')
+
+        node.put_object_from_file(os.path.join(self.tempdir, 'c.txt'), 'new/d.txt', force=True)
+        self.assertEqual(node.get_object_content('new/d.txt'), self.get_file_content('c.txt'))
+
+        # The temporary folder for code that needs direct file system access should reflect the same content
+        folder = node._repository._get_base_folder()  # pylint: disable=protected-access
+        self.assertEqual(sorted(folder.get_content_list()), ['c.txt', 'new', 'subdir'])
+
+        node._repository.erase(force=True)  # pylint: disable=protected-access
+        self.assertEqual(node.list_object_names(), [])
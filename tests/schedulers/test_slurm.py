@@ -332,3 +332,42 @@ class TestSubmitScript(unittest.TestCase):
             job_tmpl.job_resource = scheduler.create_job_resource(
                 num_machines=1, num_mpiprocs_per_machine=1, num_cores_per_machine=24, num_cores_per_mpiproc=23
             )
+
+    def test_submit_from_scripts(self):
+        """Test that multiple scripts are submitted with a single command and that the outputs are parsed separately."""
+        import os
+        import subprocess
+        import tempfile
+        from unittest import mock
+        from aiida.schedulers import SchedulerError
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            # A fake `sbatch` that fails for scripts whose name starts with `fail`
+            with open(os.path.join(dirpath, 'sbatch'), 'w') as handle:
+                handle.write('#!/bin/sh\ncase "$1" in fail*) echo "sbatch: error" >&2; exit 1;; esac\n')
+                handle.write('echo "Submitted batch job $(basename "$PWD")"\necho "warning" >&2\n')
+            os.chmod(os.path.join(dirpath, 'sbatch'), 0o755)
+
+            for workdir in ['101', '102', '103']:
+                os.mkdir(os.path.join(dirpath, workdir))
+
+            def exec_command_wait(command):
+                env = dict(os.environ, PATH='{}:{}'.format(dirpath, os.environ['PATH']))
+                pipes = {'stdout': subprocess.PIPE, 'stderr': subprocess.PIPE}
+                process = subprocess.run(['sh', '-c', command], env=env, check=False, **pipes)
+                return process.returncode, process.stdout.decode('utf-8'), process.stderr.decode('utf-8')
+
+            transport = mock.Mock(exec_command_wait=mock.Mock(side_effect=exec_command_wait))
+            scheduler = SlurmScheduler()
+            scheduler.set_transport(transport)
+
+            submissions = [(os.path.join(dirpath, workdir), script)
+                           for workdir, script in [('101', 'job.sh'), ('102', 'fail.sh'), ('103', 'job.sh')]]
+            results = scheduler.submit_from_scripts(submissions)
+
+        self.assertEqual(transport.exec_command_wait.call_count, 1)
+        self.assertEqual(results[0], '101')
+        self.assertIsInstance(results[1], SchedulerError)
+        self.assertIn('sbatch: error', str(results[1]))
+        self.assertNotIn('warning', str(results[1]))
+        self.assertEqual(results[2], '103')
@@ -55,3 +55,105 @@ class TestBasicConnection(unittest.TestCase):
 
         # Reset logging level
         logging.disable(logging.NOTSET)
+
+
+class TestMetadataCache(unittest.TestCase):
+    """
+    Test the caching of the metadata of remote paths, with a mocked SFTP client such that no connection is needed.
+    """
+
+    @staticmethod
+    def get_attributes(filename, mode):
+        """Return a `paramiko.SFTPAttributes` for an entry with the given name and mode."""
+        attributes = paramiko.SFTPAttributes()
+        attributes.filename = filename
+        attributes.st_mode = mode
+        attributes.st_size = 0
+        attributes.st_uid = 1000
+        attributes.st_gid = 1000
+        attributes.st_atime = 0
+        attributes.st_mtime = 0
+        return attributes
+
+    def setUp(self):
+        """Create a transport whose SFTP client lists a directory with a file, a folder and a link to a folder."""
+        import stat
+        from unittest import mock
+
+        entries = {
+            'file.txt': self.get_attributes('file.txt', stat.S_IFREG | 0o644),
+            'folder': self.get_attributes('folder', stat.S_IFDIR | 0o755),
+            'link': self.get_attributes('link', stat.S_IFLNK | 0o777),
+        }
+
+        def stat_side_effect(path):
+            name = path.rsplit('/', 1)[-1]
+            if name == 'link':
+                return entries['folder']
+            if name not in entries:
+                exception = IOError('No such file')
+                exception.errno = 2
+                raise exception
+            return entries[name]
+
+        self.sftp = mock.Mock()
+        self.sftp.getcwd.return_value = '/remote'
+        self.sftp.stat.side_effect = stat_side_effect
+        self.sftp.listdir_attr.return_value = list(entries.values())
+
+        self.transport = SshTransport(machine='localhost')
+        self.transport._sftp = self.sftp  # pylint: disable=protected-access
+        self.transport._is_open = True  # pylint: disable=protected-access
+
+    def test_listdir_withattributes(self):
+        """Test that `listdir_withattributes` lists the attributes of all entries with a single `listdir_attr`."""
+        entries = {entry['name']: entry for entry in self.transport.listdir_withattributes()}
+
+        self.assertEqual(self.sftp.listdir_attr.call_count, 1)
+        self.assertEqual(self.sftp.stat.call_count, 1)  # Only for the symbolic link
+        self.assertEqual(set(entries), {'file.txt', 'folder', 'link'})
+        self.assertFalse(entries['file.txt']['isdir'])
+        self.assertTrue(entries['folder']['isdir'])
+        self.assertTrue(entries['link']['isdir'])
+        self.assertEqual(entries['folder']['attributes']['st_mode'], self.sftp.listdir_attr.return_value[1].st_mode)
+
+        entries = self.transport.listdir_withattributes(pattern='*.txt')
+        self.assertEqual([entry['name'] for entry in entries], ['file.txt'])
+
+    def test_no_cache(self):
+        """Test that nothing is cached outside of the `metadata_cache` context."""
+        self.transport.isdir('folder')
+        self.transport.isdir('folder')
+        self.transport.listdir()
+        self.transport.listdir()
+
+        self.assertEqual(self.sftp.stat.call_count, 2)
+        self.assertEqual(self.sftp.listdir_attr.call_count, 2)
+
+    def test_cache(self):
+        """Test that stat and listdir calls are cached and that the entries of listed directories are reused."""
+        with self.transport.metadata_cache():
+            self.assertEqual(self.transport.glob('*'), ['file.txt', 'folder', 'link'])
+            self.assertEqual(self.transport.listdir('.'), ['file.txt', 'folder', 'link'])
+            self.assertTrue(self.transport.isfile('file.txt'))
+            self.assertTrue(self.transport.isdir('/remote/folder'))
+            self.assertFalse(self.transport.path_exists('missing'))
+            self.assertFalse(self.transport.path_exists('missing'))
+            self.assertTrue(self.transport.isdir('link'))
+            self.assertTrue(self.transport.isdir('link'))
+
+            self.assertEqual(self.sftp.listdir_attr.call_count, 1)
+            # Only for the missing path and the symbolic link, which are not in the listed entries
+            self.assertEqual(self.sftp.stat.call_count, 2)
+
+            # Operations that modify the remote invalidate the cache
+            self.transport.mkdir('new')
+            self.transport.listdir()
+            self.transport.isdir('folder')
+
+            self.assertEqual(self.sftp.listdir_attr.call_count, 2)
+            self.sftp.mkdir.assert_called_once_with('new')
+
+        # The cache is dropped when leaving the context
+        self.transport.isdir('folder')
+        self.assertEqual(self.sftp.stat.call_count, 3)